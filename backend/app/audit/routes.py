@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import base64
+import itertools
 import json
-from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session, joinedload, load_only, undefer
 
+from .. import payloads
 from ..auth import get_owner_id
 from ..db import get_db
-from ..models import Project, Submission
+from ..models import PayloadBlob, Project, Submission
 from .schemas import (
     AuditError,
     AuditEvaluateRequestSnapshot,
@@ -135,9 +140,104 @@ def _state_after_from_result(result_obj: Dict[str, Any]) -> Optional[str]:
     return str(ns) if ns is not None else None
 
 
+def _detail(s: Any, artifacts_text: Optional[str], result_text: Optional[str]) -> AuditSubmissionDetail:
+    """
+    AuditSubmissionDetail из строки submissions (ORM объект или Row с теми же
+    именами колонок) и текстов payload.
+    """
+    artifacts_obj = _parse_json_object(artifacts_text, what="artifacts_payload")
+    result_obj = _parse_json_object(result_text, what="result_payload")
+
+    # request snapshot
+    req = AuditEvaluateRequestSnapshot(artifacts=artifacts_obj)
+
+    # result snapshot (decision/errors required)
+    decision_raw = result_obj.get("decision")
+    decision = str(decision_raw) if decision_raw is not None else str(s.decision)
+
+    errors_norm = _normalize_audit_errors(result_obj.get("errors", []))
+
+    res = AuditEvaluateResultSnapshot(
+        decision=decision,
+        project_state=(str(result_obj["project_state"]) if "project_state" in result_obj and result_obj["project_state"] is not None else None),
+        next_state=(str(result_obj["next_state"]) if "next_state" in result_obj and result_obj["next_state"] is not None else None),
+        current_gate_id=(str(result_obj["current_gate_id"]) if "current_gate_id" in result_obj and result_obj["current_gate_id"] is not None else None),
+        current_gate_version=(str(result_obj["current_gate_version"]) if "current_gate_version" in result_obj and result_obj["current_gate_version"] is not None else None),
+        errors=errors_norm,
+    )
+
+    imm = AuditImmutability(is_immutable=True, stored_at=s.created_at)
+
+    return AuditSubmissionDetail(
+        submission_id=s.id,
+        project_id=s.project_id,
+        created_at=s.created_at,
+        gate_id=s.gate_id,
+        gate_version=s.gate_version,
+        state_before=s.state_at_submit,
+        state_after=_state_after_from_result(result_obj),
+        request=req,
+        result=res,
+        immutability=imm,
+    )
+
+
 # -----------------------------
 # LIST: /projects/{project_id}/submissions
 # -----------------------------
+_SUMMARY_COLUMNS = (
+    Submission.id,
+    Submission.project_id,
+    Submission.created_at,
+    Submission.decision,
+    Submission.gate_id,
+    Submission.gate_version,
+    Submission.state_at_submit,
+    Submission.state_after,
+)
+
+
+def _owns_project(db: Session, project_id: str, owner_id: str) -> bool:
+    return db.query(Project.id).filter(Project.id == project_id, Project.owner_id == owner_id).first() is not None
+
+
+def _submissions_page_query(
+    db: Session,
+    project_id: str,
+    *,
+    order: str,
+    cursor: Optional[Tuple[datetime, str]],
+    owner_id: Optional[str] = None,
+):
+    """
+    Keyset page over (created_at, id): a row-value comparison on the same key
+    as ORDER BY, so ix_submissions_project_created_id serves any page depth
+    with a range scan (no OFFSET, no sort).
+
+    owner_id: owner scoping joined into the same query (projects PK lookup).
+    """
+    q = (
+        db.query(Submission)
+        # summary columns only: payload text is neither transferred nor decoded
+        # (raiseload: touching any other column here is a bug, not a lazy load)
+        .options(load_only(*_SUMMARY_COLUMNS, raiseload=True))
+        .filter(Submission.project_id == project_id)
+    )
+    if owner_id is not None:
+        q = q.join(Project, (Project.id == Submission.project_id) & (Project.owner_id == owner_id))
+    key = tuple_(Submission.created_at, Submission.id)
+
+    if order == "asc":
+        q = q.order_by(Submission.created_at.asc(), Submission.id.asc())
+        if cursor:
+            q = q.filter(key > cursor)
+    else:
+        q = q.order_by(Submission.created_at.desc(), Submission.id.desc())
+        if cursor:
+            q = q.filter(key < cursor)
+    return q
+
+
 @router.get(
     "/projects/{project_id}/submissions",
     response_model=AuditSubmissionListResponse,
@@ -151,43 +251,19 @@ def list_project_submissions(
     owner_id: str = Depends(get_owner_id),
     db: Session = Depends(get_db),
 ) -> AuditSubmissionListResponse:
-    # owner scoping: проект должен принадлежать owner
-    p = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.owner_id == owner_id)
-        .first()
+    # owner scoping в том же запросе (join projects); отдельная проверка — только для пустой страницы
+    q = _submissions_page_query(
+        db, project_id, order=order, cursor=_decode_cursor(cursor) if cursor else None, owner_id=owner_id
     )
-    if not p:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    q = db.query(Submission).filter(Submission.project_id == project_id)
-
-    if order == "asc":
-        q = q.order_by(Submission.created_at.asc(), Submission.id.asc())
-    else:
-        q = q.order_by(Submission.created_at.desc(), Submission.id.desc())
-
-    if cursor:
-        c_created_at, c_id = _decode_cursor(cursor)
-        if order == "asc":
-            q = q.filter(
-                (Submission.created_at > c_created_at)
-                | ((Submission.created_at == c_created_at) & (Submission.id > c_id))
-            )
-        else:
-            q = q.filter(
-                (Submission.created_at < c_created_at)
-                | ((Submission.created_at == c_created_at) & (Submission.id < c_id))
-            )
 
     rows = q.limit(limit + 1).all()
+    if not rows and not _owns_project(db, project_id, owner_id):
+        raise HTTPException(status_code=404, detail="Project not found")
     has_next = len(rows) > limit
     page = rows[:limit]
 
     items: list[AuditSubmissionSummary] = []
     for s in page:
-        result_obj = _parse_json_object(s.result_payload, what="result_payload")
-
         items.append(
             AuditSubmissionSummary(
                 submission_id=s.id,
@@ -197,7 +273,7 @@ def list_project_submissions(
                 gate_id=s.gate_id,
                 gate_version=s.gate_version,
                 state_before=s.state_at_submit,
-                state_after=_state_after_from_result(result_obj),
+                state_after=s.state_after,
             )
         )
 
@@ -209,6 +285,147 @@ def list_project_submissions(
     return AuditSubmissionListResponse(items=items, next_cursor=next_cursor)
 
 
+# -----------------------------
+# EXPORT (NDJSON): /projects/{project_id}/submissions/export, /submissions/export
+# -----------------------------
+_EXPORT_BATCH = 500
+_NDJSON = "application/x-ndjson"
+
+
+def _settled_before() -> datetime:
+    """
+    Выгрузка отдаёт только строки старше DG_AUDIT_EXPORT_SETTLE_SECONDS (5).
+    created_at ставится до commit: при параллельных evaluate строка с более
+    ранним created_at может закоммититься позже строки, которую клиент уже
+    получил, и продолжение по since её бы пропустило. Окно больше, чем
+    flush -> commit одной записи, так что курсор since всегда позади
+    незакоммиченных строк; свежие строки придут в следующей выгрузке.
+    """
+    raw = os.getenv("DG_AUDIT_EXPORT_SETTLE_SECONDS", "")
+    return datetime.now(timezone.utc) - timedelta(seconds=float(raw) if raw.strip() else 5.0)
+
+
+def _export_query(*, project_id: Optional[str] = None, owner_id: Optional[str] = None,
+                  since: Optional[Tuple[datetime, str]] = None, until: Optional[Tuple[datetime, str]] = None,
+                  before: Optional[datetime] = None):
+    """
+    Все submissions проекта (или всех проектов owner) в порядке (created_at, id)
+    — Core select: строки не попадают в identity map, payload блобы
+    раскодируются по одной строке, память не растёт с размером выгрузки.
+    """
+    t = Submission.__table__
+    a = PayloadBlob.__table__.alias("artifacts_blob")
+    r = PayloadBlob.__table__.alias("result_blob")
+    q = (
+        select(
+            t.c.id, t.c.project_id, t.c.created_at, t.c.gate_id, t.c.gate_version,
+            t.c.state_at_submit, t.c.decision,
+            t.c.artifacts_payload.label("artifacts_inline"), t.c.result_payload.label("result_inline"),
+            a.c.codec.label("artifacts_codec"), a.c.data.label("artifacts_data"),
+            r.c.codec.label("result_codec"), r.c.data.label("result_data"),
+        )
+        .select_from(
+            t.outerjoin(a, a.c.hash == t.c.artifacts_hash).outerjoin(r, r.c.hash == t.c.result_hash)
+        )
+        .order_by(t.c.created_at.asc(), t.c.id.asc())
+    )
+    if project_id is not None:
+        q = q.where(t.c.project_id == project_id)
+    if owner_id is not None:
+        p = Project.__table__
+        q = q.where(t.c.project_id.in_(select(p.c.id).where(p.c.owner_id == owner_id)))
+    if since is not None:
+        q = q.where(tuple_(t.c.created_at, t.c.id) > since)
+    if until is not None:
+        q = q.where(tuple_(t.c.created_at, t.c.id) <= until)
+    if before is not None:
+        q = q.where(t.c.created_at < before)
+    return q
+
+
+def _export_row_payload(row: Any, kind: str) -> Optional[str]:
+    codec = getattr(row, f"{kind}_codec")
+    if codec is not None:
+        return payloads.decode(codec, getattr(row, f"{kind}_data"))
+    return getattr(row, f"{kind}_inline")
+
+
+def _export_since(db: Session, since: Optional[str], scope) -> Optional[Tuple[datetime, str]]:
+    """`since` = submission_id последней полученной строки; должен быть в той же выгрузке."""
+    if not since:
+        return None
+    row = db.query(Submission.created_at, Submission.id).filter(Submission.id == since, scope).first()
+    if row is None:
+        raise HTTPException(status_code=422, detail="Invalid since")
+    return row[0], row[1]
+
+
+def _ndjson(db: Session, q, *, owns: Optional[Callable[[], bool]] = None) -> StreamingResponse:
+    """
+    `owns`: проверка владельца, только если выгрузка пуста (запрос уже
+    ограничен владельцем) — как в списке, без отдельного round trip.
+    """
+    # yield_per -> stream_results: server-side cursor, fetched in batches
+    result = db.execute(q.execution_options(yield_per=_EXPORT_BATCH))
+    first = result.fetchmany(1)
+    if not first and owns is not None and not owns():
+        db.close()
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    def lines() -> Iterator[str]:
+        try:
+            for row in itertools.chain(first, result):
+                detail = _detail(row, _export_row_payload(row, "artifacts"), _export_row_payload(row, "result"))
+                yield detail.model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type=_NDJSON)
+
+
+@router.get(
+    "/projects/{project_id}/submissions/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {_NDJSON: {}}, "description": "One AuditSubmissionDetail per line"}},
+    summary="Export full audit trail of a project (NDJSON)",
+    description="Rows older than DG_AUDIT_EXPORT_SETTLE_SECONDS (5); resume with since to get the rest.",
+)
+def export_project_submissions(
+    project_id: str,
+    since: Optional[str] = Query(default=None, description="submission_id of the last exported line"),
+    owner_id: str = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    owned = Submission.project_id.in_(
+        select(Project.id).where(Project.id == project_id, Project.owner_id == owner_id)
+    )
+    try:
+        cursor = _export_since(db, since, owned)
+    except HTTPException:
+        if not _owns_project(db, project_id, owner_id):
+            raise HTTPException(status_code=404, detail="Project not found")
+        raise
+    q = _export_query(project_id=project_id, owner_id=owner_id, since=cursor, before=_settled_before())
+    return _ndjson(db, q, owns=lambda: _owns_project(db, project_id, owner_id))
+
+
+@router.get(
+    "/submissions/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {_NDJSON: {}}, "description": "One AuditSubmissionDetail per line"}},
+    summary="Export full audit trail of all owner projects (NDJSON)",
+    description="Rows older than DG_AUDIT_EXPORT_SETTLE_SECONDS (5); resume with since to get the rest.",
+)
+def export_owner_submissions(
+    since: Optional[str] = Query(default=None, description="submission_id of the last exported line"),
+    owner_id: str = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    owned = Submission.project_id.in_(select(Project.id).where(Project.owner_id == owner_id))
+    cursor = _export_since(db, since, owned)
+    return _ndjson(db, _export_query(owner_id=owner_id, since=cursor, before=_settled_before()))
+
+
 # -----------------------------
 # DETAIL: /submissions/{submission_id}
 # -----------------------------
@@ -223,52 +440,26 @@ def read_submission(
     db: Session = Depends(get_db),
 ) -> AuditSubmissionDetail:
     """
-    Owner scoping: Submission не содержит owner_id, поэтому проверяем через Project:
-    - читаем submission
-    - читаем project и сверяем owner_id
+    Owner scoping: Submission не содержит owner_id, поэтому join с Project
+    в том же запросе (один round trip). Чужой submission неотличим от
+    несуществующего — 404.
     """
-    s = db.query(Submission).filter(Submission.id == submission_id).first()
+    s = (
+        db.query(Submission)
+        .join(Project, (Project.id == Submission.project_id) & (Project.owner_id == owner_id))
+        # payloads are deferred on the model; the detail view needs both, in the same SELECT
+        # (blobs are decompressed only when the payload is read)
+        .options(
+            joinedload(Submission.artifacts_blob),
+            joinedload(Submission.result_blob),
+            undefer(Submission.artifacts_inline),
+            undefer(Submission.result_inline),
+        )
+        .filter(Submission.id == submission_id)
+        .first()
+    )
     if not s:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    p = db.query(Project).filter(Project.id == s.project_id).first()
-    if not p or p.owner_id != owner_id:
-        # чтобы не раскрывать факт существования submission чужого owner — возвращаем 404
-        raise HTTPException(status_code=404, detail="Submission not found")
-
-    artifacts_obj = _parse_json_object(s.artifacts_payload, what="artifacts_payload")
-    result_obj = _parse_json_object(s.result_payload, what="result_payload")
-
-    # request snapshot
-    req = AuditEvaluateRequestSnapshot(artifacts=artifacts_obj)
-
-    # result snapshot (decision/errors required)
-    decision_raw = result_obj.get("decision")
-    decision = str(decision_raw) if decision_raw is not None else str(s.decision)
-
-    errors_norm = _normalize_audit_errors(result_obj.get("errors", []))
-
-    res = AuditEvaluateResultSnapshot(
-        decision=decision,
-        project_state=(str(result_obj["project_state"]) if "project_state" in result_obj and result_obj["project_state"] is not None else None),
-        next_state=(str(result_obj["next_state"]) if "next_state" in result_obj and result_obj["next_state"] is not None else None),
-        current_gate_id=(str(result_obj["current_gate_id"]) if "current_gate_id" in result_obj and result_obj["current_gate_id"] is not None else None),
-        current_gate_version=(str(result_obj["current_gate_version"]) if "current_gate_version" in result_obj and result_obj["current_gate_version"] is not None else None),
-        errors=errors_norm,
-    )
-
-    imm = AuditImmutability(is_immutable=True, stored_at=s.created_at)
-
-    return AuditSubmissionDetail(
-        submission_id=s.id,
-        project_id=s.project_id,
-        created_at=s.created_at,
-        gate_id=s.gate_id,
-        gate_version=s.gate_version,
-        state_before=s.state_at_submit,
-        state_after=_state_after_from_result(result_obj),
-        request=req,
-        result=res,
-        immutability=imm,
-    )
+    return _detail(s, s.artifacts_payload, s.result_payload)
 
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure repo root is importable so we can import engine/
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from engine.config import fingerprint as source_fingerprint  # noqa: E402
+from engine.evaluator import (  # noqa: E402
+    cached_result,
+    check_required_artifacts,
+    config_store,
+    evaluate_gate,
+    evaluate_many,
+    message_catalog,
+    remember_result,
+    result_cache,
+)
+
+__all__ = [
+    "REPO_ROOT",
+    "cached_result",
+    "check_required_artifacts",
+    "config_store",
+    "evaluate_gate",
+    "evaluate_many",
+    "message_catalog",
+    "remember_result",
+    "result_cache",
+    "source_fingerprint",
+]
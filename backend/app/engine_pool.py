@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Iterable, Mapping, Optional
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from .engine_bridge import cached_result, config_store, evaluate_gate, evaluate_many, remember_result
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "")
+    return int(raw) if raw.strip() else default
+
+
+def _init_worker(reload_seconds: float) -> None:
+    # each worker holds its own config snapshot: keep it in sync like the parent
+    config_store().get()
+    if reload_seconds > 0:
+        config_store().start_watcher(reload_seconds)
+
+
+class EnginePool:
+    """
+    Runs the CPU-bound engine off the event loop.
+
+    workers > 0: a dedicated process pool (spawn) of that size;
+    workers == 0: inline in the default threadpool (tests, single-core dev).
+
+    At most `max_pending` evaluations are queued or running; a request that
+    cannot get a slot within `queue_timeout` seconds gets 503 + Retry-After
+    instead of piling up behind a burst.
+
+    Env: DG_ENGINE_WORKERS (default: CPU count), DG_ENGINE_MAX_PENDING
+    (default: 4 x workers), DG_ENGINE_QUEUE_TIMEOUT (seconds, default 10).
+    """
+
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float = 10.0, reload_seconds: float = 0.0):
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self.queue_timeout = queue_timeout
+        self.reload_seconds = reload_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_pending)
+
+    @classmethod
+    def from_env(cls, reload_seconds: float = 0.0) -> "EnginePool":
+        workers = _env_int("DG_ENGINE_WORKERS", os.cpu_count() or 1)
+        return cls(
+            workers=workers,
+            max_pending=_env_int("DG_ENGINE_MAX_PENDING", 4 * max(1, workers)),
+            queue_timeout=float(os.getenv("DG_ENGINE_QUEUE_TIMEOUT", "10") or 10),
+            reload_seconds=reload_seconds,
+        )
+
+    def start(self) -> None:
+        if self.workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.reload_seconds,),
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn, *args: Any, **kwargs: Any) -> Any:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Engine busy, retry later", headers={"Retry-After": "1"})
+        try:
+            if self._executor is None:
+                return await run_in_threadpool(fn, *args, **kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        finally:
+            self._slots.release()
+
+    # Process pool: the result cache is looked up and filled here, in the parent,
+    # so there is one cache for all workers and /health/engine reports its stats.
+    # Workers evaluate with use_cache=False.
+    async def evaluate_gate(self, **kwargs: Any) -> dict[str, Any]:
+        if self._executor is None:
+            return await self._run(evaluate_gate, **kwargs)
+        key, res = cached_result(**kwargs)
+        if res is None:
+            res = await self._run(evaluate_gate, **kwargs, use_cache=False)
+            remember_result(key, res)
+        return res
+
+    async def evaluate_many(self, items: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        items = list(items)
+        # one task per batch: the worker shares text analysis across the items
+        if self._executor is None:
+            return await self._run(evaluate_many, items)
+        looked = [cached_result(**it) for it in items]
+        misses = [it for it, (_, res) in zip(items, looked) if res is None]
+        computed = iter(await self._run(evaluate_many, misses, use_cache=False) if misses else [])
+        out = []
+        for key, res in looked:
+            if res is None:
+                res = next(computed)
+                remember_result(key, res)
+            out.append(res)
+        return out
+
+
+_POOL: Optional[EnginePool] = None
+
+
+def engine_pool() -> EnginePool:
+    """Pool installed by the app lifespan; inline fallback when the app was not started."""
+    global _POOL
+    if _POOL is None:
+        _POOL = EnginePool(workers=0, max_pending=64)
+    return _POOL
+
+
+def install_engine_pool(pool: Optional[EnginePool]) -> None:
+    global _POOL
+    _POOL = pool
+
+
+__all__ = ["EnginePool", "engine_pool", "install_engine_pool"]
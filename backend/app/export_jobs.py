@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .audit.routes import _detail, _export_query, _export_row_payload
+from .audit.schemas import AuditSubmissionDetail
+from .db import SessionLocal
+from .models import ExportJob, Project, Submission
+from .pdf import write_text_pdf
+
+FORMATS = {"JSON": ("json", "application/json"), "PDF": ("pdf", "application/pdf")}
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "")
+    return int(raw) if raw.strip() else default
+
+
+# -----------------------------
+# Renderers
+# -----------------------------
+def _protocol_details(db: Session, job: ExportJob) -> Iterator[AuditSubmissionDetail]:
+    """Submissions of the project up to (and including) the job's source submission, oldest first."""
+    if job.source_submission_id is None:
+        return
+    until = (
+        db.query(Submission.created_at, Submission.id)
+        .filter(Submission.id == job.source_submission_id)
+        .first()
+    )
+    q = _export_query(project_id=job.project_id, until=(until[0], until[1]) if until else None)
+    for row in db.execute(q.execution_options(yield_per=500)):
+        yield _detail(row, _export_row_payload(row, "artifacts"), _export_row_payload(row, "result"))
+
+
+def render_json(db: Session, job: ExportJob, project: Project, out) -> None:
+    # written incrementally: one submission in memory at a time
+    head = {
+        "project_id": project.id,
+        "title": project.title,
+        "current_state": project.current_state,
+        "source_submission_id": job.source_submission_id,
+    }
+    out.write(json.dumps(head, ensure_ascii=False)[:-1].encode("utf-8"))
+    out.write(b', "submissions": [')
+    for i, detail in enumerate(_protocol_details(db, job)):
+        if i:
+            out.write(b", ")
+        out.write(detail.model_dump_json().encode("utf-8"))
+    out.write(b"]}")
+
+
+def _protocol_lines(db: Session, job: ExportJob, project: Project) -> Iterator[str]:
+    yield f"Протокол проекта: {project.title}"
+    yield f"project_id: {project.id}"
+    yield f"Текущее состояние: {project.current_state}"
+    yield f"Последняя заявка: {job.source_submission_id or '—'}"
+    yield ""
+    for n, d in enumerate(_protocol_details(db, job), start=1):
+        yield f"#{n}  {d.created_at.isoformat()}  {d.gate_id} v{d.gate_version}  {d.result.decision}"
+        yield f"  submission_id: {d.submission_id}"
+        yield f"  Состояние: {d.state_before or '—'} → {d.state_after or '—'}"
+        if d.result.errors:
+            yield "  Ошибки:"
+            for e in d.result.errors:
+                yield f"    - {e.code} {e.path}" + (f": {e.message}" if e.message else "")
+        yield "  Артефакты:"
+        for line in json.dumps(d.request.artifacts, ensure_ascii=False, indent=2).splitlines():
+            yield "    " + line
+        yield ""
+
+
+def render_pdf(db: Session, job: ExportJob, project: Project, out) -> None:
+    # streamed page by page, like render_json (see pdf.py for the memory bound)
+    write_text_pdf(_protocol_lines(db, job, project), out)
+
+
+_RENDERERS = {"JSON": render_json, "PDF": render_pdf}
+
+
+# -----------------------------
+# Job queue
+# -----------------------------
+class ExportJobs:
+    """
+    Protocol exports rendered off the request path.
+
+    Jobs live in the export_jobs table and run on an in-process thread pool;
+    the output file goes to `out_dir`. A worker claims a job with a conditional
+    PENDING -> RUNNING update, so with several app processes each job renders
+    once. On start, PENDING jobs are queued again, and so are RUNNING jobs
+    started more than DG_EXPORT_STALE_SECONDS ago (their process died). A job is keyed by (project, format, last submission id),
+    so repeated exports of an unchanged project reuse the finished file.
+
+    workers == 0: render inline in the requesting thread (tests, dev).
+
+    Env: DG_EXPORT_WORKERS (default 2), DG_EXPORT_DIR (default ./exports),
+    DG_EXPORT_STALE_SECONDS (default 900, longer than any render).
+    """
+
+    def __init__(self, workers: int, out_dir: str | os.PathLike[str],
+                 session_factory: Callable[[], Session] = SessionLocal):
+        self.workers = max(0, workers)
+        self.out_dir = Path(out_dir)
+        self._sessions = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> "ExportJobs":
+        return cls(
+            workers=_env_int("DG_EXPORT_WORKERS", 2),
+            out_dir=os.getenv("DG_EXPORT_DIR", "").strip() or "./exports",
+        )
+
+    def start(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if self.workers and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dg-export")
+            self._recover()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            # queued jobs stay PENDING in the table and are picked up on the next start
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _recover(self) -> None:
+        stale = datetime.now(timezone.utc) - timedelta(seconds=_env_int("DG_EXPORT_STALE_SECONDS", 900))
+        db = self._sessions()
+        try:
+            # RUNNING in another live process is left alone; only abandoned claims go back to PENDING
+            db.execute(
+                update(ExportJob)
+                .where(
+                    ExportJob.status == "RUNNING",
+                    or_(ExportJob.started_at.is_(None), ExportJob.started_at < stale),
+                )
+                .values(status="PENDING", started_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            ids = [j.id for j in db.query(ExportJob.id).filter(ExportJob.status == "PENDING")]
+        finally:
+            db.close()
+        for job_id in ids:
+            self._executor.submit(self.run, job_id)
+
+    def path(self, job: ExportJob) -> Optional[Path]:
+        return self.out_dir / job.file_name if job.file_name else None
+
+    def request(self, db: Session, project: Project, fmt: str) -> ExportJob:
+        """The job serving (project, fmt) at its current last submission; queues one if needed."""
+        last = (
+            db.query(Submission.id)
+            .filter(Submission.project_id == project.id)
+            .order_by(Submission.created_at.desc(), Submission.id.desc())
+            .first()
+        )
+        source = last[0] if last else None
+
+        job = self._live_job(db, project.id, fmt, source)
+        if job is not None:
+            if job.status == "DONE" and not self.available(job):
+                self.requeue(db, job)  # output file was removed: render again
+            return job  # finished, queued or running
+
+        job = ExportJob(
+            id=str(uuid.uuid4()),
+            project_id=project.id,
+            owner_id=project.owner_id,
+            format=fmt,
+            source_submission_id=source,
+            status="PENDING",
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # a concurrent request queued the same job first (uq_export_jobs_live): share it
+            db.rollback()
+            job = self._live_job(db, project.id, fmt, source)
+            if job is None:
+                raise
+            return job
+        self._enqueue(db, job)
+        return job
+
+    @staticmethod
+    def _live_job(db: Session, project_id: str, fmt: str, source: Optional[str]) -> Optional[ExportJob]:
+        return (
+            db.query(ExportJob)
+            .filter(
+                ExportJob.project_id == project_id,
+                ExportJob.format == fmt,
+                ExportJob.source_submission_id.is_(None) if source is None else ExportJob.source_submission_id == source,
+                ExportJob.status != "FAILED",
+            )
+            .order_by(ExportJob.created_at.desc())
+            .first()
+        )
+
+    def available(self, job: ExportJob) -> bool:
+        p = self.path(job)
+        return job.status == "DONE" and p is not None and p.is_file()
+
+    def requeue(self, db: Session, job: ExportJob) -> None:
+        # conditional: a concurrent requeue may already have it PENDING or RUNNING
+        db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job.id, ExportJob.status == "DONE")
+            .values(status="PENDING", file_name=None, size=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        db.refresh(job)
+        self._enqueue(db, job)
+
+    def _enqueue(self, db: Session, job: ExportJob) -> None:
+        if self._executor is not None:
+            self._executor.submit(self.run, job.id)
+        else:
+            self.run(job.id, db)
+            db.refresh(job)
+
+    def run(self, job_id: str, db: Optional[Session] = None) -> None:
+        own = db is None
+        db = db or self._sessions()
+        try:
+            claimed = db.execute(
+                update(ExportJob)
+                .where(ExportJob.id == job_id, ExportJob.status == "PENDING")
+                .values(status="RUNNING", started_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if claimed != 1:
+                return  # done, or another worker has it
+            job = db.get(ExportJob, job_id, populate_existing=True)
+
+            ext = FORMATS[job.format][0]
+            name = f"{job.id}.{ext}"
+            tmp = self.out_dir / f".{name}.{uuid.uuid4().hex}.tmp"
+            try:
+                project = db.get(Project, job.project_id)
+                self.out_dir.mkdir(parents=True, exist_ok=True)
+                with tmp.open("wb") as out:
+                    _RENDERERS[job.format](db, job, project, out)
+                os.replace(tmp, self.out_dir / name)
+            except Exception as e:
+                db.rollback()
+                tmp.unlink(missing_ok=True)
+                job.status, job.error = "FAILED", f"{type(e).__name__}: {e}"
+            else:
+                job.status, job.file_name, job.size = "DONE", name, (self.out_dir / name).stat().st_size
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+        finally:
+            if own:
+                db.close()
+
+
+_JOBS: Optional[ExportJobs] = None
+
+
+def export_jobs() -> ExportJobs:
+    """Queue installed by the app lifespan; inline fallback when the app was not started."""
+    global _JOBS
+    if _JOBS is None:
+        _JOBS = ExportJobs.from_env()
+        _JOBS.workers = 0
+    return _JOBS
+
+
+def install_export_jobs(jobs: Optional[ExportJobs]) -> None:
+    global _JOBS
+    _JOBS = jobs
+
+
+__all__ = ["ExportJobs", "FORMATS", "export_jobs", "install_export_jobs", "render_json", "render_pdf"]
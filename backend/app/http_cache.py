@@ -0,0 +1,25 @@
+"""
+HTTP validators shared by the cached GET routes (project list pages, UI schemas).
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+
+def make_etag(digest_hex: str, *, weak: bool = False) -> str:
+    """ETag from a hex digest (first 128 bits); weak: W/ for semantically equal responses."""
+    tag = f'"{digest_hex[:32]}"'
+    return f"W/{tag}" if weak else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check for a 304 on GET."""
+    if not if_none_match:
+        return False
+    # weak comparison (RFC 9110): W/ prefixes are ignored
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+__all__ = ["etag_matches", "make_etag"]
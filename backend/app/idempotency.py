@@ -0,0 +1,171 @@
+"""
+Idempotency-Key for POST /projects/{id}/evaluate.
+
+The first request with a key claims it (a pending row, committed before the
+engine runs) and stores its response in that row next to the Submission
+(same transaction). Then, within DG_IDEMPOTENCY_TTL_SECONDS (24h):
+- a repeat gets the stored response back without running the engine or
+  writing anything;
+- a repeat while the first one is still running gets 409 + Retry-After;
+- the same key with a different project or artifacts is a 422.
+A request that fails releases its claim, so the retry runs; a claim left by
+a crashed process lapses after DG_IDEMPOTENCY_PENDING_SECONDS (60). Expired
+rows are ignored on read and purged on write, at most every
+DG_IDEMPOTENCY_PURGE_SECONDS (300).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import IdempotencyKey
+
+MISMATCH = "Idempotency-Key was already used with a different request"
+IN_PROGRESS = "A request with this Idempotency-Key is still in progress"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "")
+    return int(raw) if raw.strip() else default
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(status_code=409, detail=IN_PROGRESS, headers={"Retry-After": "1"})
+
+
+def request_hash(project_id: str, artifacts: Any) -> str:
+    """sha256 of the canonical JSON of (project_id, artifacts)."""
+    blob = json.dumps([project_id, artifacts], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def replay(db: Session, owner_id: str, key: str, rhash: str) -> Optional[JSONResponse]:
+    """
+    Stored response for an unexpired key, None if there is none;
+    422 if it was another request, 409 if that request is still running.
+    """
+    row = db.execute(
+        select(IdempotencyKey.request_hash, IdempotencyKey.response).where(
+            IdempotencyKey.owner_id == owner_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > _now(),
+        )
+    ).first()
+    if row is None:
+        return None
+    if row.request_hash != rhash:
+        raise HTTPException(status_code=422, detail=MISMATCH)
+    if row.response is None:
+        raise _in_progress()
+    return JSONResponse(content=json.loads(row.response), headers={REPLAYED_HEADER: "true"})
+
+
+def claim(db: Session, owner_id: str, key: str, *, project_id: str, rhash: str) -> Optional[JSONResponse]:
+    """
+    Commit a pending row for the key. None: claimed, the caller runs the
+    request and ends with complete() or release(). Lost to a concurrent
+    request with the same key: its stored response, or 409/422 as replay().
+    """
+    now = _now()
+    # an expired row of the same key (or a lapsed claim) would collide on the primary key
+    db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.owner_id == owner_id, IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+        .execution_options(synchronize_session=False)
+    )
+    _maybe_purge(db, now)
+    db.add(
+        IdempotencyKey(
+            owner_id=owner_id,
+            key=key,
+            project_id=project_id,
+            request_hash=rhash,
+            response=None,
+            created_at=now,
+            expires_at=now + timedelta(seconds=_env_int("DG_IDEMPOTENCY_PENDING_SECONDS", 60)),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        stored = replay(db, owner_id, key, rhash)
+        if stored is None:  # the other claim is already gone: let the client retry
+            raise _in_progress()
+        return stored
+    return None
+
+
+def complete(db: Session, owner_id: str, key: str, *, rhash: str, response: BaseModel) -> None:
+    """Store `response` in the claimed row (no commit: it goes in with the Submission); 409 if the claim lapsed."""
+    now = _now()
+    res = db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.owner_id == owner_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.request_hash == rhash,
+            IdempotencyKey.response.is_(None),
+        )
+        .values(
+            # serialized as the route sends it (response_model_exclude_none)
+            response=json.dumps(response.model_dump(mode="json", exclude_none=True), ensure_ascii=False),
+            expires_at=now + timedelta(seconds=_env_int("DG_IDEMPOTENCY_TTL_SECONDS", 86_400)),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount != 1:
+        raise _in_progress()
+
+
+def release(db: Session, owner_id: str, key: str) -> None:
+    """Drop an unfinished claim (the request failed) and commit."""
+    db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.owner_id == owner_id, IdempotencyKey.key == key, IdempotencyKey.response.is_(None))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def purge_expired(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete every expired key row (no commit). Returns the number deleted."""
+    res = db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.expires_at <= (now or _now()))
+        .execution_options(synchronize_session=False)
+    )
+    return res.rowcount or 0
+
+
+_purge_lock = threading.Lock()
+_last_purge = 0.0
+
+
+def _maybe_purge(db: Session, now: datetime) -> None:
+    global _last_purge
+    interval = _env_int("DG_IDEMPOTENCY_PURGE_SECONDS", 300)
+    with _purge_lock:
+        t = time.monotonic()
+        if interval < 0 or (_last_purge and t - _last_purge < interval):
+            return
+        _last_purge = t
+    purge_expired(db, now)
@@ -1,22 +1,70 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
 
 from .audit.routes import router as audit_router
-from .db import Base, engine
+from .db import engine
+from .engine_bridge import config_store, result_cache
+from .engine_pool import EnginePool, install_engine_pool
+from .export_jobs import ExportJobs, install_export_jobs
+from .migrations import migrate
 from .routes.projects import router as projects_router
-from .routes.evaluate import router as evaluate_router
+from .routes.evaluate import STATE_CONFLICT, router as evaluate_router
+from .routes.protocol import router as protocol_router
+from .routes.transition import router as transition_router
 from .routes.ui_schema import router as ui_schema_router
+from .ui_schemas import ui_schema_docs
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # DG_CONFIG_RELOAD_SECONDS > 0: pick up canon YAML edits without restarting workers
+    interval = float(os.getenv("DG_CONFIG_RELOAD_SECONDS", "0") or 0)
+    if interval > 0:
+        config_store().start_watcher(interval)
+    # engine off the event loop (DG_ENGINE_WORKERS etc., see engine_pool.py)
+    pool = EnginePool.from_env(reload_seconds=interval)
+    pool.start()
+    install_engine_pool(pool)
+    # protocol exports (DG_EXPORT_WORKERS, DG_EXPORT_DIR, see export_jobs.py)
+    jobs = ExportJobs.from_env()
+    jobs.start()
+    install_export_jobs(jobs)
+    # UI schema v1 documents: built and serialized once, before the first page load
+    ui_schema_docs()
+    try:
+        yield
+    finally:
+        install_export_jobs(None)
+        jobs.shutdown()
+        install_engine_pool(None)
+        pool.shutdown()
+        if interval > 0:
+            config_store().stop_watcher()
+
 
+app = FastAPI(title="Diagnostic Gate Backend", version="0.1.0", lifespan=lifespan)
 
-app = FastAPI(title="Diagnostic Gate Backend", version="0.1.0")
 
-# create tables (MVP)
-Base.metadata.create_all(bind=engine)
+@app.exception_handler(StaleDataError)
+async def stale_project_write(_: Request, exc: StaleDataError):
+    # an ORM write of a Project lost the version check (models.Project.version)
+    return JSONResponse(status_code=409, content={"detail": STATE_CONFLICT}, headers={"Retry-After": "0"})
+
+
+# create / upgrade tables (MVP, see migrations.py)
+migrate(engine)
 
 app.include_router(projects_router)
 app.include_router(evaluate_router)
 app.include_router(ui_schema_router)
+app.include_router(protocol_router)
+app.include_router(transition_router)
 
 # additive audit endpoints (contracted in openapi/audit.v0.1.yaml)
 app.include_router(audit_router)
@@ -26,3 +74,8 @@ app.include_router(audit_router)
 def health():
     return {"ok": True}
 
+
+
+@app.get("/health/engine")
+def health_engine():
+    return {"config_hash": config_store().get().config_hash, "result_cache": result_cache().stats()}
@@ -0,0 +1,205 @@
+"""
+Idempotent schema upgrades, run at startup (MVP: no Alembic yet).
+
+Each step checks the live schema/data and only does the missing work, so
+running migrate() on a fresh, partially upgraded or current database is safe.
+
+  python -m backend.app.migrations                     # upgrade DATABASE_URL explicitly
+  python -m backend.app.migrations --compact-payloads  # + move inline payloads to blobs
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Callable, List
+
+from sqlalchemy import inspect, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+
+from .db import Base, create_schema
+from .models import ExportJob, Submission, result_summary, store_payload
+
+
+log = logging.getLogger(__name__)
+
+
+def add_missing_columns(engine: Engine) -> None:
+    """ALTER TABLE ... ADD COLUMN for model columns the live table lacks (nullable or with a server default)."""
+    insp = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        existing = {c["name"] for c in insp.get_columns(table.name)}
+        for col in table.columns:
+            if col.name in existing:
+                continue
+            if not col.nullable and col.server_default is None:
+                raise RuntimeError(f"cannot add NOT NULL column {table.name}.{col.name} automatically")
+            ddl = CreateColumn(col).compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            log.info("added column %s.%s", table.name, col.name)
+
+
+def relax_not_null(engine: Engine) -> None:
+    """
+    Drop NOT NULL where the model now allows NULL (e.g. the inline payload
+    columns, empty for rows stored in payload_blobs). SQLite cannot alter a
+    constraint, so the table is rebuilt from the model and the rows copied.
+    """
+    insp = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        live = {c["name"]: c for c in insp.get_columns(table.name)}
+        stricter = [c.name for c in table.columns if c.nullable and c.name in live and not live[c.name]["nullable"]]
+        if not stricter:
+            continue
+        if engine.dialect.name != "sqlite":
+            with engine.begin() as conn:
+                for name in stricter:
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ALTER COLUMN {name} DROP NOT NULL")
+        else:
+            old = f"{table.name}__old"
+            cols = ", ".join(c.name for c in table.columns if c.name in live)
+            with engine.begin() as conn:
+                for ix in insp.get_indexes(table.name):
+                    conn.exec_driver_sql(f"DROP INDEX {ix['name']}")
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} RENAME TO {old}")
+                table.create(conn)
+                conn.exec_driver_sql(f"INSERT INTO {table.name} ({cols}) SELECT {cols} FROM {old}")
+                conn.exec_driver_sql(f"DROP TABLE {old}")
+        log.info("relaxed NOT NULL on %s: %s", table.name, ", ".join(stricter))
+
+
+def normalize_sqlite_timestamps(engine: Engine) -> None:
+    """
+    SQLite: CURRENT_TIMESTAMP defaults were stored as 'YYYY-MM-DD HH:MM:SS',
+    SQLAlchemy binds 'YYYY-MM-DD HH:MM:SS.ffffff'. Text comparison of the two
+    breaks keyset cursors on equal timestamps, so old values get the bound format.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for table, col in (("projects", "created_at"), ("projects", "updated_at"), ("submissions", "created_at")):
+            n = conn.exec_driver_sql(
+                f"UPDATE {table} SET {col} = strftime('%Y-%m-%d %H:%M:%f', {col}) || '000' "
+                f"WHERE length({col}) = 19"
+            ).rowcount
+            if n:
+                log.info("normalized %d %s.%s values", n, table, col)
+
+
+def fail_duplicate_export_jobs(engine: Engine) -> None:
+    """
+    Jobs queued twice for the same cache key before uq_export_jobs_live
+    existed: keep the newest live one, mark the others FAILED so the unique
+    index can be created. Runs before create_schema().
+    """
+    if not inspect(engine).has_table("export_jobs"):
+        return
+    t = ExportJob.__table__
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(t.c.id, t.c.project_id, t.c.format, t.c.source_submission_id)
+            .where(t.c.status != "FAILED")
+            .order_by(t.c.created_at.desc(), t.c.id.desc())
+        ).all()
+        seen, dupes = set(), []
+        for job_id, *key in rows:
+            if tuple(key) in seen:
+                dupes.append(job_id)
+            seen.add(tuple(key))
+        if dupes:
+            conn.execute(update(t).where(t.c.id.in_(dupes)).values(status="FAILED", error="duplicate job"))
+    if dupes:
+        log.info("failed %d duplicate export jobs", len(dupes))
+
+
+def backfill_submission_summary(engine: Engine, *, batch: int = 1_000) -> int:
+    """state_after / error_count / error_codes for rows written before those columns existed."""
+    t = Submission.__table__
+    done = 0
+    while True:
+        with engine.begin() as conn:
+            # only inline (pre-blob) rows can lack the summary: blob rows get it at insert
+            rows = conn.execute(
+                select(t.c.id, t.c.result_payload).where(t.c.error_count.is_(None)).order_by(t.c.id).limit(batch)
+            ).all()
+            for sid, payload in rows:
+                try:
+                    result = json.loads(payload or "{}")
+                except ValueError:
+                    result = {}
+                conn.execute(update(t).where(t.c.id == sid).values(**result_summary(result)))
+        done += len(rows)
+        if len(rows) < batch:
+            break
+    if done:
+        log.info("backfilled summary columns of %d submissions", done)
+    return done
+
+
+def move_inline_payloads_to_blobs(engine: Engine, *, batch: int = 500) -> int:
+    """
+    Compact rows written before payload_blobs: store their payloads as blobs
+    and clear the inline columns. Not run at startup (large tables take a
+    while); run it explicitly, then VACUUM to return the space.
+    """
+    t = Submission.__table__
+    done = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(t.c.id, t.c.artifacts_payload, t.c.result_payload)
+                .where(t.c.artifacts_hash.is_(None) | t.c.result_hash.is_(None))
+                .order_by(t.c.id)
+                .limit(batch)
+            ).all()
+            for sid, artifacts, result in rows:
+                conn.execute(update(t).where(t.c.id == sid).values(
+                    artifacts_hash=store_payload(conn, artifacts or "{}"),
+                    result_hash=store_payload(conn, result or "{}"),
+                    artifacts_payload=None,
+                    result_payload=None,
+                ))
+        done += len(rows)
+        if len(rows) < batch:
+            break
+    if done:
+        log.info("moved payloads of %d submissions to payload_blobs", done)
+    return done
+
+
+MIGRATIONS: List[Callable[[Engine], object]] = [
+    add_missing_columns,
+    relax_not_null,
+    normalize_sqlite_timestamps,
+    backfill_submission_summary,
+]
+
+
+def migrate(engine: Engine) -> None:
+    # before create_schema(): it adds uq_export_jobs_live to an existing table
+    fail_duplicate_export_jobs(engine)
+    create_schema(engine)
+    for step in MIGRATIONS:
+        step(engine)
+    # indexes on columns added above
+    create_schema(engine)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .db import engine
+
+    ap = argparse.ArgumentParser(prog="python -m backend.app.migrations")
+    ap.add_argument("--compact-payloads", action="store_true", help="also move inline payloads to payload_blobs")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    migrate(engine)
+    if args.compact_payloads:
+        move_inline_payloads_to_blobs(engine)
@@ -1,46 +1,275 @@
 from __future__ import annotations
 
-from sqlalchemy import String, DateTime, ForeignKey, Text
+import json
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import String, DateTime, ForeignKey, Index, Integer, LargeBinary, Text, event, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
-from .db import Base
+from . import payloads
+from .db import Base, JSONText
+
+
+def _utcnow() -> datetime:
+    # Python-side timestamps keep one storage format (microseconds) for keyset cursors;
+    # server_default still covers raw inserts
+    return datetime.now(timezone.utc)
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # GET /projects: WHERE owner_id = ? ORDER BY (updated_at, id) DESC -> index range scan
+        Index("ix_projects_owner_updated_id", "owner_id", "updated_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    owner_id: Mapped[str] = mapped_column(String(64), index=True)
+    # owner_id lookups use the composite index above (leading column)
+    owner_id: Mapped[str] = mapped_column(String(64))
 
     title: Mapped[str] = mapped_column(String(200))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     current_state: Mapped[str] = mapped_column(String(64), default="DRAFT", index=True)
+    # optimistic concurrency: every state change is a compare-and-swap on version
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
-    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
+    updated_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), default=_utcnow, server_default=func.now(), onupdate=_utcnow
+    )
 
     submissions: Mapped[list["Submission"]] = relationship(back_populates="project", cascade="all, delete-orphan")
 
+    # ORM flushes of a Project also check (and bump) version: a stale write raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        # audit pagination: WHERE project_id = ? ORDER BY (created_at, id) -> index range scan, no sort
+        Index("ix_submissions_project_created_id", "project_id", "created_at", "id"),
+        # per-project history filtered by decision
+        Index("ix_submissions_project_decision_created", "project_id", "decision", "created_at"),
+        # owner-wide audit export: ORDER BY (created_at, id) across projects
+        Index("ix_submissions_created_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    project_id: Mapped[str] = mapped_column(String(36), ForeignKey("projects.id"), index=True)
+    # project_id lookups use the composite indexes above (leading column)
+    project_id: Mapped[str] = mapped_column(String(36), ForeignKey("projects.id"))
 
     gate_id: Mapped[str] = mapped_column(String(64), index=True)
     gate_version: Mapped[str] = mapped_column(String(32))
     state_at_submit: Mapped[str] = mapped_column(String(64))
 
-    # store JSON as text in SQLite MVP
-    artifacts_payload: Mapped[str] = mapped_column(Text)
-    result_payload: Mapped[str] = mapped_column(Text)
+    # Payloads live in payload_blobs (compressed, deduplicated by content hash);
+    # artifacts_payload / result_payload below read and write them as JSON text.
+    artifacts_hash: Mapped[str | None] = mapped_column(String(64), ForeignKey("payload_blobs.hash"), nullable=True)
+    result_hash: Mapped[str | None] = mapped_column(String(64), ForeignKey("payload_blobs.hash"), nullable=True)
+    artifacts_blob: Mapped[Optional["PayloadBlob"]] = relationship(foreign_keys=[artifacts_hash], viewonly=True)
+    result_blob: Mapped[Optional["PayloadBlob"]] = relationship(foreign_keys=[result_hash], viewonly=True)
+
+    # Rows written before payload_blobs: inline JSON text (TEXT in SQLite, JSONB in Postgres).
+    # Deferred: loaded on first access or via undefer() (detail reads), never by list queries.
+    artifacts_inline: Mapped[str | None] = mapped_column("artifacts_payload", JSONText, deferred=True, nullable=True)
+    result_inline: Mapped[str | None] = mapped_column("result_payload", JSONText, deferred=True, nullable=True)
 
     decision: Mapped[str] = mapped_column(String(16), index=True)
 
-    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # denormalized from result_payload (result_summary), so listings never decode payloads
+    state_after: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    error_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error_codes: Mapped[str | None] = mapped_column(Text, nullable=True)  # "ERR_A,ERR_B", first-seen order
+
+    # Python-side like Project: keyset cursors (audit pages, export since/until) compare full precision
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
 
     project: Mapped["Project"] = relationship(back_populates="submissions")
 
+    # --- payload text (byte-identical to what was written)
+    def _payload(self, kind: str) -> Optional[str]:
+        written = getattr(self, "_written_payloads", None)
+        if written and kind in written:
+            return written[kind]
+        blob = getattr(self, f"{kind}_blob")
+        if blob is not None:
+            return blob.text()
+        return getattr(self, f"{kind}_inline")
+
+    def _set_payload(self, kind: str, text: str) -> None:
+        if not hasattr(self, "_written_payloads"):
+            self._written_payloads: dict[str, str] = {}
+        self._written_payloads[kind] = text
+        setattr(self, f"{kind}_hash", payloads.content_hash(text))
+        setattr(self, f"{kind}_inline", None)
+
+    @property
+    def artifacts_payload(self) -> Optional[str]:
+        return self._payload("artifacts")
+
+    @artifacts_payload.setter
+    def artifacts_payload(self, text: str) -> None:
+        self._set_payload("artifacts", text)
+
+    @property
+    def result_payload(self) -> Optional[str]:
+        return self._payload("result")
+
+    @result_payload.setter
+    def result_payload(self, text: str) -> None:
+        self._set_payload("result", text)
+
+
+class PayloadBlob(Base):
+    """One distinct payload text: sha256 of its UTF-8 bytes -> codec-tagged data (payloads.py)."""
+
+    __tablename__ = "payload_blobs"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(16))
+    size: Mapped[int] = mapped_column(Integer)  # uncompressed UTF-8 bytes
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+
+    def text(self) -> str:
+        # decompressed on first access only (detail reads), then kept on the instance
+        cached = getattr(self, "_text", None)
+        if cached is None:
+            cached = self._text = payloads.decode(self.codec, self.data)
+        return cached
+
+
+class ExportJob(Base):
+    """
+    Background render of a project's gate protocol (POST /protocol/export).
+    One row per (project, format, last submission): the output file is reused
+    until the project gets a new submission.
+    """
+
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        Index("ix_export_jobs_cache_key", "project_id", "format", "source_submission_id"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    project_id: Mapped[str] = mapped_column(String(36), ForeignKey("projects.id"))
+    owner_id: Mapped[str] = mapped_column(String(64))
+    format: Mapped[str] = mapped_column(String(8))  # JSON | PDF
+    # last submission when the job was queued (None: project without submissions)
+    source_submission_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+
+    status: Mapped[str] = mapped_column(String(16), default="PENDING", index=True)  # PENDING|RUNNING|DONE|FAILED
+    file_name: Mapped[str | None] = mapped_column(String(128), nullable=True)  # under DG_EXPORT_DIR
+    size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # set by the worker that claimed the job (PENDING -> RUNNING)
+    started_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# at most one live (not FAILED) job per cache key, so concurrent exports of the
+# same project share it; NULL source ids never collide, hence the second index
+_LIVE = ExportJob.status != "FAILED"
+_NO_SOURCE = ExportJob.source_submission_id.is_(None)
+Index(
+    "uq_export_jobs_live",
+    ExportJob.project_id,
+    ExportJob.format,
+    ExportJob.source_submission_id,
+    unique=True,
+    sqlite_where=_LIVE,
+    postgresql_where=_LIVE,
+)
+Index(
+    "uq_export_jobs_live_no_source",
+    ExportJob.project_id,
+    ExportJob.format,
+    unique=True,
+    sqlite_where=_LIVE & _NO_SOURCE,
+    postgresql_where=_LIVE & _NO_SOURCE,
+)
+
+
+class IdempotencyKey(Base):
+    """
+    Claim and stored response of POST /projects/{id}/evaluate for one
+    Idempotency-Key (idempotency.py). The response is written in the same
+    transaction as the Submission it describes; rows past expires_at are
+    ignored and purged.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    owner_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    project_id: Mapped[str] = mapped_column(String(36))
+    request_hash: Mapped[str] = mapped_column(String(64))  # sha256 of (project_id, artifacts)
+    # EvaluateResponse JSON, exactly as first sent; NULL: claimed, the request is still running
+    response: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
+    expires_at: Mapped[str] = mapped_column(DateTime(timezone=True), index=True)
+
+
+def store_payload(conn: Any, text: str) -> str:
+    """Insert the blob for `text` unless it exists (content-addressed). Returns its hash."""
+    h = payloads.content_hash(text)
+    t = PayloadBlob.__table__
+    if conn.execute(select(t.c.hash).where(t.c.hash == h)).first() is not None:
+        return h
+    codec, data = payloads.encode(text)
+    values = {"hash": h, "codec": codec, "size": len(text.encode("utf-8")), "data": data}
+    if conn.dialect.name == "sqlite":
+        conn.execute(sqlite_insert(t).values(**values).on_conflict_do_nothing())
+    elif conn.dialect.name == "postgresql":
+        conn.execute(pg_insert(t).values(**values).on_conflict_do_nothing())
+    else:
+        conn.execute(insert(t).values(**values))
+    return h
+
+
+def result_summary(result: Any) -> dict[str, Any]:
+    """Summary columns of a Submission from its engine result dict."""
+    if not isinstance(result, dict):
+        result = {}
+    ns = result.get("next_state")
+    errors = result.get("errors") or []
+    if not isinstance(errors, list):
+        errors = [errors]
+    codes: list[str] = []
+    for e in errors:
+        code = (e.get("error_code") or e.get("code")) if isinstance(e, dict) else None
+        if code and str(code) not in codes:
+            codes.append(str(code))
+    return {
+        "state_after": str(ns) if ns is not None else None,
+        "error_count": len(errors),
+        "error_codes": ",".join(codes) or None,
+    }
+
+
+@event.listens_for(Submission, "before_insert")
+def _store_payloads(_mapper, conn, target: Submission) -> None:
+    # blobs first: the submission row references them
+    for text in (getattr(target, "_written_payloads", None) or {}).values():
+        store_payload(conn, text)
+
+
+@event.listens_for(Submission, "before_insert")
+def _fill_summary(_mapper, _conn, target: Submission) -> None:
+    # writers that only set result_payload (imports, tests) still get the summary
+    if target.error_count is None:
+        try:
+            result = json.loads(target.result_payload or "{}")
+        except ValueError:
+            result = {}
+        for k, v in result_summary(result).items():
+            setattr(target, k, v)
+
@@ -0,0 +1,44 @@
+"""
+Submission payload storage: content-addressed, compressed blobs.
+
+A payload (artifacts or result JSON text) is stored once per distinct
+content in payload_blobs, keyed by the sha256 of its UTF-8 bytes, with a
+per-row codec tag. Decoding returns exactly the text that was written, so
+audit snapshots stay byte-identical.
+"""
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import Tuple
+
+CODEC_RAW = "raw"
+CODEC_ZLIB = "zlib"
+
+# below this, compression rarely pays for its header
+MIN_COMPRESS_BYTES = 256
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode(text: str) -> Tuple[str, bytes]:
+    """(codec, data) for `text`: zlib when it is smaller, raw UTF-8 otherwise."""
+    raw = text.encode("utf-8")
+    if len(raw) >= MIN_COMPRESS_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return CODEC_ZLIB, packed
+    return CODEC_RAW, raw
+
+
+def decode(codec: str, data: bytes) -> str:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    if codec == CODEC_RAW:
+        return bytes(data).decode("utf-8")
+    raise ValueError(f"unknown payload codec: {codec}")
+
+
+__all__ = ["CODEC_RAW", "CODEC_ZLIB", "content_hash", "encode", "decode"]
@@ -0,0 +1,295 @@
+"""
+Minimal text-only PDF writer (no third-party dependencies).
+
+Renders lines of Unicode text (Cyrillic included) onto A4 pages with an
+embedded TrueType font: a Type0/CIDFontType2 font with Identity-H encoding,
+so each character is written as its 2-byte glyph id, plus a ToUnicode map
+so text stays searchable and copyable. The whole font file is embedded (no
+subsetting), which costs a few hundred KB per document.
+
+Memory: pages are written out as they fill up, so rendering holds one page
+of text, the glyphs used so far and the font file (plus its compressed
+copy while it is written), independent of the document length.
+
+Font: DG_PDF_FONT (path to a .ttf), otherwise the first DejaVu Sans Mono
+found in the usual system locations (Debian/Ubuntu: fonts-dejavu-core).
+Without one, PDF exports are refused with 501 (routes/protocol.py).
+"""
+from __future__ import annotations
+
+import io
+import os
+import struct
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+A4 = (595, 842)
+MARGIN = 40
+
+_FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "/usr/share/fonts/truetype/DejaVuSansMono.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSansMono.ttf",
+    "/usr/share/fonts/TTF/DejaVuSansMono.ttf",
+    "/Library/Fonts/DejaVuSansMono.ttf",
+)
+
+
+class TrueTypeFont:
+    """The parts of a .ttf the writer needs: cmap (format 4), advances, metrics."""
+
+    def __init__(self, data: bytes, name: str):
+        self.data = data
+        self.name = "".join(ch for ch in name if ch.isalnum() or ch in "-_") or "Font"
+        tables = {}
+        (num_tables,) = struct.unpack_from(">H", data, 4)
+        for i in range(num_tables):
+            tag, _, offset, length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+            tables[tag.decode("latin-1")] = (offset, length)
+        for required in ("head", "hhea", "hmtx", "cmap"):
+            if required not in tables:
+                raise ValueError(f"TrueType font lacks '{required}' table")
+
+        head = tables["head"][0]
+        (self.units_per_em,) = struct.unpack_from(">H", data, head + 18)
+        self.bbox = struct.unpack_from(">hhhh", data, head + 36)
+        hhea = tables["hhea"][0]
+        self.ascent, self.descent = struct.unpack_from(">hh", data, hhea + 4)
+        (num_hmetrics,) = struct.unpack_from(">H", data, hhea + 34)
+        hmtx = tables["hmtx"][0]
+        self._advances = [struct.unpack_from(">H", data, hmtx + 4 * i)[0] for i in range(num_hmetrics)]
+        self._cmap = self._read_cmap(tables["cmap"][0])
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike[str]) -> "TrueTypeFont":
+        p = Path(path)
+        return cls(p.read_bytes(), p.stem)
+
+    def _read_cmap(self, base: int) -> Dict[int, int]:
+        data = self.data
+        (num,) = struct.unpack_from(">H", data, base + 2)
+        sub = None
+        for i in range(num):
+            platform, encoding, offset = struct.unpack_from(">HHI", data, base + 4 + 8 * i)
+            fmt = struct.unpack_from(">H", data, base + offset)[0]
+            if fmt == 4 and (platform, encoding) in ((3, 1), (0, 3), (0, 4)):
+                sub = base + offset
+                break
+        if sub is None:
+            raise ValueError("TrueType font has no Unicode BMP cmap (format 4)")
+
+        (seg_x2,) = struct.unpack_from(">H", data, sub + 6)
+        seg = seg_x2 // 2
+        ends = struct.unpack_from(f">{seg}H", data, sub + 14)
+        starts = struct.unpack_from(f">{seg}H", data, sub + 16 + seg_x2)
+        deltas = struct.unpack_from(f">{seg}h", data, sub + 16 + 2 * seg_x2)
+        ro_base = sub + 16 + 3 * seg_x2
+        range_offsets = struct.unpack_from(f">{seg}H", data, ro_base)
+
+        cmap: Dict[int, int] = {}
+        for i in range(seg):
+            start, end = starts[i], ends[i]
+            if start == 0xFFFF:
+                continue
+            for cp in range(start, end + 1):
+                if range_offsets[i] == 0:
+                    gid = (cp + deltas[i]) & 0xFFFF
+                else:
+                    at = ro_base + 2 * i + range_offsets[i] + 2 * (cp - start)
+                    (gid,) = struct.unpack_from(">H", data, at)
+                    if gid:
+                        gid = (gid + deltas[i]) & 0xFFFF
+                if gid:
+                    cmap[cp] = gid
+        return cmap
+
+    def glyph(self, ch: str) -> int:
+        return self._cmap.get(ord(ch), 0)
+
+    def advance(self, gid: int) -> int:
+        """Advance width in 1/1000 em (PDF glyph space)."""
+        adv = self._advances[gid] if gid < len(self._advances) else self._advances[-1]
+        return round(adv * 1000 / self.units_per_em)
+
+    def width(self, text: str, size: float) -> float:
+        return sum(self.advance(self.glyph(ch)) for ch in text) * size / 1000
+
+    def scaled(self, v: int) -> int:
+        return round(v * 1000 / self.units_per_em)
+
+
+@lru_cache(maxsize=4)
+def _load_font(path: str) -> TrueTypeFont:
+    return TrueTypeFont.from_file(path)
+
+
+class FontNotFound(RuntimeError):
+    pass
+
+
+FONT_HINT = "PDF export needs a TrueType font: install fonts-dejavu-core or set DG_PDF_FONT to a .ttf file"
+
+
+def find_font() -> Optional[str]:
+    """Path of the font PDF rendering would use, None if there is none."""
+    env = os.getenv("DG_PDF_FONT", "").strip()
+    for path in ([env] if env else []) + list(_FONT_CANDIDATES):
+        if Path(path).is_file():
+            return path
+    return None
+
+
+def default_font() -> TrueTypeFont:
+    path = find_font()
+    if path is None:
+        raise FontNotFound(FONT_HINT)
+    return _load_font(path)
+
+
+def _wrap(line: str, font: TrueTypeFont, size: float, width: float) -> List[str]:
+    if font.width(line, size) <= width:
+        return [line]
+    out: List[str] = []
+    cur = ""
+    cur_w = 0.0
+    for ch in line:
+        w = font.advance(font.glyph(ch)) * size / 1000
+        if cur and cur_w + w > width:
+            out.append(cur)
+            cur, cur_w = "", 0.0
+        cur += ch
+        cur_w += w
+    out.append(cur)
+    return out
+
+
+def write_text_pdf(
+    lines: Iterable[str],
+    out: BinaryIO,
+    *,
+    font: Optional[TrueTypeFont] = None,
+    size: float = 9.0,
+    leading: Optional[float] = None,
+) -> None:
+    """
+    Write a PDF with `lines` (wrapped to the page width) on as many A4 pages
+    as needed to `out`. Streaming: each page is written as soon as it is
+    full, and the font objects (which depend on the glyphs used) come last,
+    so memory is one page plus the font, whatever the number of lines.
+    """
+    font = font or default_font()
+    leading = leading or round(size * 1.25, 2)
+    page_w, page_h = A4
+    per_page = max(1, int((page_h - 2 * MARGIN) // leading))
+
+    offsets: Dict[int, int] = {}
+    pos = 0
+
+    def emit(data: bytes) -> None:
+        nonlocal pos
+        out.write(data)
+        pos += len(data)
+
+    def put(num: int, body: bytes) -> None:
+        offsets[num] = pos
+        emit(f"{num} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def stream(dict_entries: str, payload: bytes) -> bytes:
+        packed = zlib.compress(payload, 6)
+        return (
+            f"<< {dict_entries} /Filter /FlateDecode /Length {len(packed)} >>\nstream\n".encode("ascii")
+            + packed
+            + b"\nendstream"
+        )
+
+    # fixed numbers, referenced by every page; written at the end
+    catalog, pages_obj, type0 = 1, 2, 3
+    next_num = 4
+    page_ids: List[int] = []
+    used: Dict[int, str] = {}
+
+    def flush(page: List[str]) -> None:
+        nonlocal next_num
+        ops = [f"BT /F1 {size:g} Tf {leading:g} TL {MARGIN} {page_h - MARGIN - size:g} Td"]
+        ops.extend(f"<{hexed}> Tj T*" for hexed in page)
+        ops.append("ET")
+        content, page_id = next_num, next_num + 1
+        next_num += 2
+        put(content, stream("", "\n".join(ops).encode("ascii")))
+        put(page_id, (
+            f"<< /Type /Page /Parent {pages_obj} 0 R /MediaBox [0 0 {page_w} {page_h}] "
+            f"/Resources << /Font << /F1 {type0} 0 R >> >> /Contents {content} 0 R >>"
+        ).encode("ascii"))
+        page_ids.append(page_id)
+
+    emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    page: List[str] = []
+    for raw in lines:
+        for part in _wrap(raw.expandtabs(4), font, size, page_w - 2 * MARGIN):
+            if len(page) >= per_page:
+                flush(page)
+                page = []
+            hexed = []
+            for ch in part:
+                gid = font.glyph(ch)
+                used.setdefault(gid, ch)
+                hexed.append(f"{gid:04X}")
+            page.append("".join(hexed))
+    flush(page)
+
+    font_file, descriptor, cid_font, to_unicode = range(next_num, next_num + 4)
+    put(font_file, stream(f"/Length1 {len(font.data)}", font.data))
+    bbox = " ".join(str(font.scaled(v)) for v in font.bbox)
+    put(descriptor, (
+        f"<< /Type /FontDescriptor /FontName /{font.name} /Flags 32 /FontBBox [{bbox}] "
+        f"/ItalicAngle 0 /Ascent {font.scaled(font.ascent)} /Descent {font.scaled(font.descent)} "
+        f"/CapHeight {font.scaled(font.ascent)} /StemV 80 /FontFile2 {font_file} 0 R >>"
+    ).encode("ascii"))
+    widths = " ".join(f"{gid} [{font.advance(gid)}]" for gid in sorted(used))
+    put(cid_font, (
+        f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{font.name} "
+        f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+        f"/FontDescriptor {descriptor} 0 R /DW {font.advance(0)} /W [{widths}] /CIDToGIDMap /Identity >>"
+    ).encode("ascii"))
+    bfchars = [
+        f"<{gid:04X}> <{ch.encode('utf-16-be').hex().upper()}>"
+        for gid, ch in sorted(used.items())
+    ]
+    cmap = (
+        "/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        "/CMapName /Adobe-Identity-UCS def /CMapType 2 def\n"
+        "1 begincodespacerange <0000> <FFFF> endcodespacerange\n"
+        # bfchar blocks hold at most 100 entries
+        + "".join(
+            f"{len(chunk)} beginbfchar\n" + "\n".join(chunk) + "\nendbfchar\n"
+            for chunk in (bfchars[i:i + 100] for i in range(0, len(bfchars), 100))
+        )
+        + "endcmap CMapName currentdict /CMap defineresource pop end end"
+    )
+    put(to_unicode, stream("", cmap.encode("ascii")))
+    put(type0, (
+        f"<< /Type /Font /Subtype /Type0 /BaseFont /{font.name} /Encoding /Identity-H "
+        f"/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>"
+    ).encode("ascii"))
+    put(catalog, f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode("ascii"))
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    put(pages_obj, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("ascii"))
+
+    size_ = len(offsets) + 1
+    xref = pos
+    emit(f"xref\n0 {size_}\n0000000000 65535 f \n".encode("ascii"))
+    emit("".join(f"{offsets[n]:010d} 00000 n \n" for n in range(1, size_)).encode("ascii"))
+    emit(f"trailer\n<< /Size {size_} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+
+
+def render_text_pdf(lines: Iterable[str], **kwargs: Any) -> bytes:
+    """write_text_pdf() into bytes (small documents, tests)."""
+    buf = io.BytesIO()
+    write_text_pdf(lines, buf, **kwargs)
+    return buf.getvalue()
+
+
+__all__ = ["FontNotFound", "TrueTypeFont", "default_font", "find_font", "render_text_pdf", "write_text_pdf"]
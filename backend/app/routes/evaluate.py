@@ -1,26 +1,28 @@
 from __future__ import annotations
 
 import json
-import sys
 import uuid
-from pathlib import Path
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
+from .. import idempotency
 from ..auth import get_owner_id
 from ..db import get_db
-from ..models import Project, Submission
-from ..schemas import EvaluateRequest, EvaluateResponse
-from ..state import FINAL_STATE, gate_for_state
-
-# Ensure repo root is importable so we can import engine/
-REPO_ROOT = Path(__file__).resolve().parents[3]
-if str(REPO_ROOT) not in sys.path:
-    sys.path.append(str(REPO_ROOT))
-
-from engine.evaluator import evaluate_gate  # noqa: E402
+from ..engine_pool import engine_pool
+from ..models import Project, Submission, result_summary
+from ..schemas import (
+    BatchEvaluateRequest,
+    BatchEvaluateResponse,
+    BatchEvaluateResult,
+    EvaluateRequest,
+    EvaluateResponse,
+)
+from ..state import GateRef, gate_for_state, is_final
 
 
 router = APIRouter(prefix="/projects", tags=["evaluate"])
@@ -163,47 +165,64 @@ def normalize_errors(raw_errors: Any, *, gate_id: str, gate_version: str) -> lis
     return out
 
 
-@router.post(
-    "/{project_id}/evaluate",
-    response_model=EvaluateResponse,
-    response_model_exclude_none=True,  # ✅ ключевой фикс: не сериализовать None (и внутри meta тоже)
-)
-def evaluate_current_gate(
-    project_id: str,
-    payload: EvaluateRequest,
-    owner_id: str = Depends(get_owner_id),
-    db: Session = Depends(get_db),
-):
-    p = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.owner_id == owner_id)
-        .first()
-    )
-    if not p:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    if p.current_state == FINAL_STATE:
+def _gate_ref_or_409(p: Project) -> GateRef:
+    if is_final(p.current_state):
         raise HTTPException(status_code=409, detail="Project already finalized")
 
     gate_ref = gate_for_state(p.current_state)
     if gate_ref.gate_id == "FINAL":
         raise HTTPException(status_code=409, detail=f"Unknown state: {p.current_state}")
+    return gate_ref
 
-    result = evaluate_gate(
-        gate_id=gate_ref.gate_id,
-        gate_version=gate_ref.gate_version,
-        state=p.current_state,
-        artifacts=payload.artifacts,
-    )
 
-    raw_decision = result.get("decision", "BLOCK")
-    api_decision = map_decision(raw_decision)
+def _release(db: Session) -> None:
+    """
+    End the read transaction before awaiting the engine: the pooled connection
+    goes back to the pool instead of waiting out the engine queue. Loaded
+    objects stay usable (detached, not expired); _save re-attaches them.
+    """
+    db.close()
 
-    api_errors = normalize_errors(
-        result.get("errors", []),
-        gate_id=gate_ref.gate_id,
-        gate_version=gate_ref.gate_version,
+
+STATE_CONFLICT = "Project state changed concurrently; reload the project and retry"
+
+
+def _advance_state(db: Session, p: Project, next_state: str) -> None:
+    """
+    Compare-and-swap of the project state: applies only if nobody moved the
+    project since it was loaded (same version), otherwise 409. Only the
+    project row is touched, so submits to other projects never wait on it.
+    """
+    res = db.execute(
+        update(Project)
+        .where(Project.id == p.id, Project.version == p.version)
+        .values(current_state=next_state, version=Project.version + 1)
+        .execution_options(synchronize_session=False)
     )
+    if res.rowcount != 1:
+        raise HTTPException(status_code=409, detail=STATE_CONFLICT, headers={"Retry-After": "0"})
+    set_committed_value(p, "current_state", next_state)
+    set_committed_value(p, "version", p.version + 1)
+
+
+def _record_submission(
+    db: Session,
+    p: Project,
+    gate_ref: GateRef,
+    artifacts: dict[str, Any],
+    result: dict[str, Any],
+) -> str:
+    """
+    Add the Submission row and apply the state transition (no commit).
+    Returns submission id; 409 if the project moved since it was loaded.
+    """
+    raw_decision = result.get("decision", "BLOCK")
+    if (raw_decision or "").upper() == "PASS" and not result.get("next_state"):
+        raise HTTPException(status_code=500, detail="Engine returned PASS without next_state")
+
+    state_at_submit = p.current_state
+    if (raw_decision or "").upper() == "PASS":
+        _advance_state(db, p, result["next_state"])
 
     sid = str(uuid.uuid4())
     sub = Submission(
@@ -211,22 +230,23 @@ def evaluate_current_gate(
         project_id=p.id,
         gate_id=gate_ref.gate_id,
         gate_version=gate_ref.gate_version,
-        state_at_submit=p.current_state,
-        artifacts_payload=json.dumps(payload.artifacts, ensure_ascii=False),
+        state_at_submit=state_at_submit,
+        artifacts_payload=json.dumps(artifacts, ensure_ascii=False),
         result_payload=json.dumps(result, ensure_ascii=False),
         decision=raw_decision,
+        **result_summary(result),
     )
     db.add(sub)
+    return sid
 
-    if (raw_decision or "").upper() == "PASS":
-        next_state = result.get("next_state")
-        if not next_state:
-            raise HTTPException(status_code=500, detail="Engine returned PASS without next_state")
-        p.current_state = next_state
-
-    db.commit()
-    db.refresh(p)
 
+def _evaluate_response(p: Project, gate_ref: GateRef, result: dict[str, Any], sid: str) -> EvaluateResponse:
+    api_decision = map_decision(result.get("decision", "BLOCK"))
+    api_errors = normalize_errors(
+        result.get("errors", []),
+        gate_id=gate_ref.gate_id,
+        gate_version=gate_ref.gate_version,
+    )
     current_gate = gate_for_state(p.current_state)
 
     return EvaluateResponse(
@@ -239,3 +259,173 @@ def evaluate_current_gate(
         current_gate_version=current_gate.gate_version,
     )
 
+
+@router.post(
+    "/{project_id}/evaluate",
+    response_model=EvaluateResponse,
+    response_model_exclude_none=True,  # ✅ ключевой фикс: не сериализовать None (и внутри meta тоже)
+)
+async def evaluate_current_gate(
+    project_id: str,
+    payload: EvaluateRequest,
+    owner_id: str = Depends(get_owner_id),
+    idempotency_key: Optional[str] = Header(default=None, min_length=1, max_length=255),
+    db: Session = Depends(get_db),
+):
+    """
+    The engine runs in the engine pool (engine_pool.py) and the blocking DB
+    steps in the threadpool, so a burst of heavy submissions does not hold
+    the event loop or the threadpool slots other endpoints need.
+
+    Idempotency-Key: the key is claimed before the engine runs. A retry of an
+    answered request gets the stored response (Idempotent-Replayed: true)
+    with no engine run and no new row; a retry while it is still running
+    gets 409. See idempotency.py.
+    """
+    rhash = idempotency.request_hash(project_id, payload.artifacts) if idempotency_key else ""
+
+    def _abandon() -> None:
+        # the request failed: the retry must be able to run it
+        idempotency.release(db, owner_id, idempotency_key)
+
+    def _load() -> tuple[Project, GateRef] | Response:
+        if idempotency_key:
+            # before the state checks: the first request may have finalized the project
+            stored = idempotency.replay(db, owner_id, idempotency_key, rhash) or idempotency.claim(
+                db, owner_id, idempotency_key, project_id=project_id, rhash=rhash
+            )
+            if stored is not None:
+                return stored
+        try:
+            p = (
+                db.query(Project)
+                .filter(Project.id == project_id, Project.owner_id == owner_id)
+                .first()
+            )
+            if not p:
+                raise HTTPException(status_code=404, detail="Project not found")
+            gate_ref = _gate_ref_or_409(p)
+        except BaseException:
+            if idempotency_key:
+                _abandon()
+            raise
+        _release(db)
+        return p, gate_ref
+
+    loaded = await run_in_threadpool(_load)
+    if isinstance(loaded, Response):
+        return loaded
+    p, gate_ref = loaded
+
+    try:
+        result = await engine_pool().evaluate_gate(
+            gate_id=gate_ref.gate_id,
+            gate_version=gate_ref.gate_version,
+            state=p.current_state,
+            artifacts=payload.artifacts,
+        )
+    except BaseException:
+        if idempotency_key:
+            await run_in_threadpool(_abandon)
+        raise
+
+    def _save() -> EvaluateResponse:
+        db.add(p)
+        if not idempotency_key:
+            sid = _record_submission(db, p, gate_ref, payload.artifacts, result)
+            db.commit()
+            db.refresh(p)
+            return _evaluate_response(p, gate_ref, result, sid)
+
+        try:
+            sid = _record_submission(db, p, gate_ref, payload.artifacts, result)
+            # built before commit: the stored response goes in the same transaction
+            response = _evaluate_response(p, gate_ref, result, sid)
+            idempotency.complete(db, owner_id, idempotency_key, rhash=rhash, response=response)
+            db.commit()
+        except BaseException:
+            db.rollback()
+            _abandon()
+            raise
+        return response
+
+    return await run_in_threadpool(_save)
+
+
+@router.post(
+    "/evaluate-batch",
+    response_model=BatchEvaluateResponse,
+    response_model_exclude_none=True,
+)
+async def evaluate_batch(
+    payload: BatchEvaluateRequest,
+    owner_id: str = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Evaluate the current gate of N projects in one request.
+    - one owner-scoped query for all projects, one engine batch (evaluate_many);
+    - all Submission rows and state transitions are committed in one transaction;
+    - per-item failures (404/409) are reported in place and do not abort the batch.
+    """
+    ids = [it.project_id for it in payload.items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=422, detail="Duplicate project_id in batch")
+
+    def _load() -> dict[str, Project]:
+        loaded = {
+            p.id: p
+            for p in db.query(Project).filter(Project.id.in_(ids), Project.owner_id == owner_id).all()
+        }
+        _release(db)
+        return loaded
+
+    projects = await run_in_threadpool(_load)
+
+    results: list[Optional[BatchEvaluateResult]] = []
+    pending: list[tuple[int, Project, GateRef, dict[str, Any]]] = []
+    for i, it in enumerate(payload.items):
+        p = projects.get(it.project_id)
+        if p is None:
+            results.append(BatchEvaluateResult(project_id=it.project_id, status_code=404, detail="Project not found"))
+            continue
+        try:
+            gate_ref = _gate_ref_or_409(p)
+        except HTTPException as e:
+            results.append(BatchEvaluateResult(project_id=it.project_id, status_code=e.status_code, detail=e.detail))
+            continue
+        results.append(None)
+        pending.append((i, p, gate_ref, it.artifacts))
+
+    engine_results = await engine_pool().evaluate_many(
+        {
+            "gate_id": gate_ref.gate_id,
+            "gate_version": gate_ref.gate_version,
+            "state": p.current_state,
+            "artifacts": artifacts,
+        }
+        for _, p, gate_ref, artifacts in pending
+    )
+
+    def _save() -> None:
+        db.add_all(p for _, p, _, _ in pending)
+        for (i, p, gate_ref, artifacts), result in zip(pending, engine_results):
+            try:
+                sid = _record_submission(db, p, gate_ref, artifacts, result)
+            except HTTPException as e:
+                if e.status_code != 409:
+                    raise
+                # lost the compare-and-swap: nothing of this item was written
+                results[i] = BatchEvaluateResult(project_id=p.id, status_code=409, detail=e.detail)
+                continue
+            # built before commit: avoids re-loading every expired Project afterwards
+            results[i] = BatchEvaluateResult(
+                project_id=p.id,
+                status_code=200,
+                result=_evaluate_response(p, gate_ref, result, sid),
+            )
+        db.commit()
+
+    await run_in_threadpool(_save)
+
+    return BatchEvaluateResponse(results=[r for r in results if r is not None])
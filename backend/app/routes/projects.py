@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import base64
+import hashlib
+import json
 import uuid
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
 from ..db import get_db
+from ..engine_bridge import config_store
+from ..http_cache import etag_matches, make_etag
 from ..models import Project
 from ..schemas import ProjectCreate, ProjectOut
 from ..auth import get_owner_id
@@ -42,17 +51,75 @@ def create_project(
     )
 
 
+# -----------------------------
+# Cursor helpers (opaque, same style as audit/routes.py)
+# -----------------------------
+def _encode_cursor(updated_at: datetime, project_id: str) -> str:
+    payload = {"updated_at": updated_at.isoformat(), "project_id": project_id}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        payload = json.loads(raw)
+        updated_at = datetime.fromisoformat(payload["updated_at"])
+        project_id = str(payload["project_id"])
+        if not project_id:
+            raise ValueError("empty project_id")
+        return updated_at, project_id
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def _etag(rows: list[Project], next_cursor: Optional[str]) -> str:
+    """Weak ETag of a page: row versions + the gate mapping they are rendered with."""
+    h = hashlib.sha256(config_store().get().config_hash.encode("ascii"))
+    for p in rows:
+        h.update(f"\0{p.id}\0{p.updated_at.isoformat()}\0{p.current_state}\0{p.title}\0{p.description}".encode("utf-8"))
+    h.update(f"\0{next_cursor or ''}".encode("utf-8"))
+    return make_etag(h.hexdigest(), weak=True)
+
+
 @router.get("", response_model=list[ProjectOut])
 def list_projects(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     owner_id: str = Depends(get_owner_id),
     db: Session = Depends(get_db),
 ):
-    rows = (
+    """
+    Owner projects, most recently updated first. The body stays a plain list
+    (frozen for existing clients):
+    - with `limit`: a keyset page over (updated_at, id), served by
+      ix_projects_owner_updated_id; the next page's cursor is in
+      X-Next-Cursor (absent on the last page);
+    - without `limit`: the whole list, as before.
+    Weak ETag per page: a matching If-None-Match gets 304 and no ProjectOut is built.
+    """
+    q = (
         db.query(Project)
         .filter(Project.owner_id == owner_id)
-        .order_by(Project.updated_at.desc())
-        .all()
+        .order_by(Project.updated_at.desc(), Project.id.desc())
     )
+    if cursor:
+        q = q.filter(tuple_(Project.updated_at, Project.id) < _decode_cursor(cursor))
+
+    rows = q.limit(limit + 1).all() if limit else q.all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].updated_at, rows[-1].id)
+
+    headers = {"ETag": _etag(rows, next_cursor)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
 
     out: list[ProjectOut] = []
     for p in rows:
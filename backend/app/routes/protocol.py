@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy.orm import Session
+
+from ..auth import get_owner_id
+from ..db import get_db
+from ..export_jobs import FORMATS, export_jobs
+from ..models import ExportJob, Project
+from ..pdf import FONT_HINT, find_font
+from ..schemas import ProtocolExportRequest, ProtocolExportResponse
+
+router = APIRouter(prefix="/protocol", tags=["protocol"])
+
+
+def _download_ref(job: ExportJob) -> str:
+    return f"/protocol/export/{job.id}"
+
+
+@router.post("/export", response_model=ProtocolExportResponse, status_code=202)
+def export_protocol(
+    payload: ProtocolExportRequest,
+    response: Response,
+    owner_id: str = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Queue a render of the project's full gate protocol. 202 while it renders,
+    200 when an up-to-date file already exists; either way the file is served
+    at download_ref.
+    """
+    p = (
+        db.query(Project)
+        .filter(Project.id == payload.project_id, Project.owner_id == owner_id)
+        .first()
+    )
+    if not p:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if payload.format == "PDF" and find_font() is None:
+        # not configured on this deployment: refuse up front instead of queueing a job that can only fail
+        raise HTTPException(status_code=501, detail=FONT_HINT)
+
+    job = export_jobs().request(db, p, payload.format)
+    if job.status == "DONE":
+        response.status_code = 200
+    return ProtocolExportResponse(download_ref=_download_ref(job))
+
+
+@router.get("/export/{job_id}", responses={200: {"content": {mime: {} for _, mime in FORMATS.values()}}})
+def download_protocol(
+    job_id: str,
+    owner_id: str = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+):
+    job = db.get(ExportJob, job_id)
+    if not job or job.owner_id != owner_id:
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    if job.status == "DONE" and not export_jobs().available(job):
+        # file removed from DG_EXPORT_DIR: render again
+        export_jobs().requeue(db, job)
+    if job.status == "FAILED":
+        raise HTTPException(status_code=500, detail=f"Export failed: {job.error}")
+    if job.status != "DONE":
+        return JSONResponse({"status": job.status}, status_code=202, headers={"Retry-After": "1"})
+
+    ext, mime = FORMATS[job.format]
+    return FileResponse(export_jobs().path(job), media_type=mime, filename=f"protocol-{job.project_id}.{ext}")
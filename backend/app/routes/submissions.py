@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, undefer
 
 from ..db import get_db
 from ..models import Project, Submission
@@ -30,6 +30,8 @@ def list_submissions(
 
     rows = (
         db.query(Submission)
+        # result is shown, artifacts are not (stays deferred)
+        .options(joinedload(Submission.result_blob), undefer(Submission.result_inline))
         .filter(Submission.project_id == project_id)
         .order_by(Submission.created_at.desc())
         .limit(limit)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ..auth import get_owner_id
+from ..db import get_db
+from ..engine_bridge import check_required_artifacts
+from ..engine_pool import engine_pool
+from ..models import Project
+from ..schemas import TransitionGateRef, TransitionRequest, TransitionResponse
+from ..state import GateRef, state_machine
+from .evaluate import _record_submission, _release
+
+router = APIRouter(tags=["transition"])
+
+
+@router.post("/transition", response_model=TransitionResponse)
+async def evaluate_state_transition(
+    payload: TransitionRequest,
+    owner_id: str = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Check + evaluate + advance in one request, driven by nds_state_machine.yaml
+    (compiled index in the engine config snapshot, see engine/statemachine.py).
+
+    - the transition must leave the project's current state (no manual override: 409);
+    - require.artifacts is checked first: a missing artifact is a BLOCK with
+      ERR_MISSING_ARTIFACT and the gate rules do not run;
+    - otherwise the transition's gate_ref runs in the engine pool;
+    - either way the submission is recorded; PASS moves the project to `to`.
+    """
+    t = state_machine().transition(payload.transition_id)
+    if t is None:
+        raise HTTPException(status_code=422, detail=f"Unknown transition: {payload.transition_id}")
+    if t.from_state != payload.from_state:
+        raise HTTPException(status_code=422, detail=f"Transition {t.id} does not start at {payload.from_state}")
+
+    def _load() -> Project:
+        p = (
+            db.query(Project)
+            .filter(Project.id == payload.project_id, Project.owner_id == owner_id)
+            .first()
+        )
+        if not p:
+            raise HTTPException(status_code=404, detail="Project not found")
+        if p.current_state != t.from_state:
+            raise HTTPException(status_code=409, detail=f"Project is in {p.current_state}, not {t.from_state}")
+        _release(db)
+        return p
+
+    p = await run_in_threadpool(_load)
+
+    gate_ref = GateRef(t.gate_id, t.gate_version)
+    result = check_required_artifacts(t, payload.artifacts)
+    if result is None:
+        result = await engine_pool().evaluate_gate(
+            gate_id=t.gate_id,
+            gate_version=t.gate_version,
+            state=t.from_state,
+            artifacts=payload.artifacts,
+        )
+        if (result.get("decision") or "").upper() == "PASS" and result.get("next_state") != t.to_state:
+            raise HTTPException(status_code=500, detail=f"Gate {t.gate_id} next_state does not match transition {t.id}")
+
+    def _save() -> TransitionResponse:
+        db.add(p)
+        sid = _record_submission(db, p, gate_ref, payload.artifacts, result)
+        db.commit()
+        db.refresh(p)
+        passed = (result.get("decision") or "").upper() == "PASS"
+        return TransitionResponse(
+            decision="PASS" if passed else "BLOCK",
+            to_state=t.to_state if passed else None,
+            gate_ref=TransitionGateRef(gate_id=t.gate_id, gate_version=t.gate_version),
+            errors=list(result.get("errors") or []),
+            submission_id=sid,
+            project_state=p.current_state,
+        )
+
+    return await run_in_threadpool(_save)
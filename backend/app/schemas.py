@@ -73,6 +73,66 @@ class EvaluateResponse(BaseModel):
     current_gate_version: str
 
 
+# ============================================================
+# Batch evaluate (additive, not part of frozen OpenAPI v0.1)
+# ============================================================
+class BatchEvaluateItem(BaseModel):
+    project_id: str
+    artifacts: Dict[str, Any]
+
+
+class BatchEvaluateRequest(BaseModel):
+    items: List[BatchEvaluateItem] = Field(min_length=1, max_length=500)
+
+
+class BatchEvaluateResult(BaseModel):
+    project_id: str
+    status_code: int  # HTTP status the single-project route would have returned
+    detail: Optional[str] = None
+    result: Optional[EvaluateResponse] = None
+
+
+class BatchEvaluateResponse(BaseModel):
+    results: List[BatchEvaluateResult]
+
+
+# ============================================================
+# State transition (runtime_contract.yaml: evaluate_state_transition)
+# ============================================================
+class TransitionRequest(BaseModel):
+    project_id: str
+    from_state: str
+    transition_id: str
+    artifacts: Dict[str, Any]
+
+
+class TransitionGateRef(BaseModel):
+    gate_id: str
+    gate_version: str
+
+
+class TransitionResponse(BaseModel):
+    decision: Literal["PASS", "BLOCK"]
+    to_state: Optional[str] = None
+    gate_ref: TransitionGateRef
+    errors: List[Dict[str, Any]]  # engine errors (error_code, reason_class, message, missing_fields, ...)
+    # additive: the caller does not need a second round trip for the new state
+    submission_id: str
+    project_state: str
+
+
+# ============================================================
+# Protocol export (runtime_contract.yaml: export_protocol)
+# ============================================================
+class ProtocolExportRequest(BaseModel):
+    project_id: str
+    format: Literal["JSON", "PDF"]
+
+
+class ProtocolExportResponse(BaseModel):
+    download_ref: str
+
+
 # ============================================================
 # UI Schema (FROZEN CONTRACT) — legacy v0.1
 # MUST match OpenAPI spec (openapi/openapi.v0.1.yaml) schema: UiSchemaResponse.
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .engine_bridge import config_store
+
+if TYPE_CHECKING:
+    from engine.statemachine import StateMachine
 
 
 @dataclass(frozen=True)
@@ -9,20 +15,18 @@ class GateRef:
     gate_version: str
 
 
-STATE_TO_GATE: dict[str, GateRef] = {
-    "DRAFT": GateRef("PROBLEM_VALIDATION_01", "1.1.0"),
-    "VALIDATED_PROBLEM": GateRef("GOAL_TO_ADMISSION_02", "1.0.1"),
-    "ADMISSION_DEFINED": GateRef("CONTENT_TO_DECISIONS_03", "1.0.0"),
-    "DECISIONS_DEFINED": GateRef("ASSESSMENT_TO_ADMISSION_04", "1.0.0"),
-    "ADMISSION_ENFORCED": GateRef("UNIVERSALITY_FILTER_05", "1.0.0"),
-}
+def state_machine() -> "StateMachine":
+    """Compiled nds_state_machine.yaml of the current engine config snapshot."""
+    return config_store().get().state_machine
 
-FINAL_STATE = "SCOPE_AND_PATHS_DEFINED"
+
+def is_final(state: str) -> bool:
+    return state_machine().is_terminal(state)
 
 
 def gate_for_state(state: str) -> GateRef:
-    if state in STATE_TO_GATE:
-        return STATE_TO_GATE[state]
+    t = state_machine().next_transition(state)
+    if t is not None:
+        return GateRef(t.gate_id, t.gate_version)
     # If already final, "no gate"
     return GateRef("FINAL", "0.0.0")
-
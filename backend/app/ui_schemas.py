@@ -0,0 +1,162 @@
+"""
+Product UI schema v1 documents (GET /projects/{id}/ui-schema-v1), one per gate.
+
+Generated from the canon:
+- artifact_ui_mapping.yaml: layouts (one per gate), placeholders, hints;
+- artifact_registry.yaml: labels and value types;
+- gates_registry.yaml + gate specs: gate id/version (the gate whose
+  artifacts are the layout's artifacts) and objective.
+
+form_v1 widgets only write strings and numbers, so a field follows the
+artifact's registry type, not its mapping component: scalar_text is one
+textarea (structured_text sections become a placeholder outline) and
+numeric_measure a value + unit pair. A gate with list artifacts
+(list_text / list_objects) gets no document; the route answers 404 for it.
+
+Each document is kept serialized, with a strong ETag over its bytes, and
+rebuilt when the engine config snapshot or the two mapping files change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from .engine_bridge import REPO_ROOT, config_store, source_fingerprint
+from .http_cache import make_etag
+from .schemas import UiSchemaV1Response
+
+# re-validated on every load of the page: the gate (and so the document) follows the project state
+CACHE_CONTROL = "private, no-cache"
+
+GateKey = Tuple[str, str]  # (gate_id, gate_version)
+
+
+@dataclass(frozen=True)
+class UiSchemaDoc:
+    body: bytes  # JSON, None values omitted
+    etag: str
+
+
+def _load(root: Path, name: str) -> Dict[str, Any]:
+    return yaml.safe_load((root / name).read_text(encoding="utf-8")) or {}
+
+
+def _field(fid: str, label: str, description: Optional[str], ui: Dict[str, Any], value_type: str) -> Dict[str, Any]:
+    return {
+        "id": fid,
+        "artifact_path": f"artifacts.{fid}",
+        "label": label,
+        "description": description,
+        "ui": ui,
+        "value": {"type": value_type},
+        "visibility": {"product": True, "audit": True, "audit_details": True},
+    }
+
+
+def _artifact_fields(aid: str, label: str, value_type: str, ui: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Form fields writing artifacts.<aid> in its registry shape; None if form_v1 cannot produce it."""
+    # field ids follow the engine's ui_field_id binding: "<artifact_id>" or "<artifact_id>.<part>"
+    helper = ui.get("helper_text")
+
+    if value_type == "numeric_measure":
+        units = (ui.get("schema") or {}).get("units") or []
+        ph = ui.get("placeholder") if isinstance(ui.get("placeholder"), dict) else {}
+        return [
+            _field(f"{aid}.value", label, helper, {"widget": "number", "placeholder": str(ph.get("value") or "") or None}, "number"),
+            _field(
+                f"{aid}.unit",
+                "Единица измерения",
+                None,
+                {"widget": "select", "options": [{"value": str(u), "label": str(u)} for u in units]},
+                "string",
+            ),
+        ]
+
+    if value_type == "scalar_text":
+        sections = ui.get("sections") or []
+        if sections:
+            # structured_text: one text, its sections as an outline to fill in
+            placeholder = "\n".join(f"{s.get('label') or s['id']}: …" for s in sections)
+            rows = sum(int(s.get("rows") or 2) for s in sections)
+        else:
+            placeholder = ui.get("placeholder") if isinstance(ui.get("placeholder"), str) else None
+            rows = ui.get("rows")
+        return [_field(aid, label, helper, {"widget": "textarea", "rows": rows, "placeholder": placeholder}, "string")]
+
+    return None
+
+
+def build_ui_schemas(root: Path = REPO_ROOT) -> Dict[GateKey, UiSchemaV1Response]:
+    """
+    One UiSchemaV1Response per mapping layout form_v1 can fill in (see above);
+    ValueError if a layout matches no gate.
+    """
+    mapping = _load(root, "artifact_ui_mapping.yaml")
+    registry = {a["id"]: a for a in _load(root, "artifact_registry.yaml").get("artifacts", [])}
+
+    gates: Dict[frozenset, Tuple[GateKey, Optional[str]]] = {}
+    for g in _load(root, "gates_registry.yaml").get("gates", []):
+        spec = _load(root, str(g["file"]))
+        arts = frozenset(a["id"] for a in spec.get("artifacts", []) or [])
+        gates[arts] = ((str(g["gate_id"]), str(g["version"])), spec.get("objective"))
+
+    fields_by_layout: Dict[str, List[Dict[str, Any]]] = {}
+    for f in mapping.get("fields", []) or []:
+        fields_by_layout.setdefault(f["layout_id"], []).append(f)
+
+    out: Dict[GateKey, UiSchemaV1Response] = {}
+    for layout in mapping.get("layouts", []) or []:
+        match = gates.get(frozenset(layout.get("artifacts") or []))
+        if match is None:
+            raise ValueError(f"artifact_ui_mapping layout {layout['id']} matches no gate in gates_registry.yaml")
+        (gate_id, gate_version), objective = match
+
+        sections = []
+        for f in fields_by_layout.get(layout["id"], []):
+            aid = f["artifact_id"]
+            art = registry.get(aid) or {}
+            label = art.get("label") or aid
+            fields = _artifact_fields(aid, label, str(art.get("type") or ""), f.get("ui") or {})
+            if fields is None:
+                break
+            sections.append({"id": aid, "title": label, "fields": fields})
+        else:
+            out[(gate_id, gate_version)] = UiSchemaV1Response.model_validate(
+                {
+                    "locale": "ru",
+                    "gate": {"id": gate_id, "version": gate_version, "title": layout.get("title") or gate_id, "objective": objective},
+                    "form": {"sections": sections},
+                }
+            )
+    return out
+
+
+def _serialize(schema: UiSchemaV1Response) -> UiSchemaDoc:
+    body = schema.model_dump_json(exclude_none=True).encode("utf-8")
+    return UiSchemaDoc(body=body, etag=make_etag(hashlib.sha256(body).hexdigest()))
+
+
+# not engine canon files: their edits do not change config_hash
+_UI_SOURCES = ("artifact_ui_mapping.yaml", "artifact_registry.yaml")
+
+_DOCS: Optional[Tuple[Any, Dict[GateKey, UiSchemaDoc]]] = None  # (source key, documents)
+_LOCK = threading.Lock()
+
+
+def ui_schema_docs() -> Dict[GateKey, UiSchemaDoc]:
+    """Documents of the current canon, rebuilt on the first use after a change (main.py warms them at startup)."""
+    global _DOCS
+    key = (config_store().get().config_hash, source_fingerprint(REPO_ROOT, _UI_SOURCES))
+    cached = _DOCS
+    if cached is None or cached[0] != key:
+        with _LOCK:
+            cached = _DOCS
+            if cached is None or cached[0] != key:
+                cached = _DOCS = (key, {ref: _serialize(s) for ref, s in build_ui_schemas().items()})
+    return cached[1]
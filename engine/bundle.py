@@ -0,0 +1,168 @@
+"""
+Precompiled engine config bundle.
+
+A build step validates the canon YAMLs, compiles them into an EngineConfig
+(lexicons, message index, gate programs) and pickles it into one file.
+Workers unpickle it at startup instead of parsing YAML; the bundle is used
+only if the sha256 of the current canon files equals its config_hash and the
+sha256 of the engine sources (engine/*.py: rule classes, BINDINGS
+thresholds, compiler) equals its engine_hash, so a stale bundle silently
+falls back to YAML.
+
+The bundle is a trusted build artifact (pickle): ship it with the code,
+never accept it from users.
+
+Usage:
+  python -m engine.bundle build [--out PATH]
+  python -m engine.bundle check [--bundle PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from .config import EngineConfig, Fingerprint, read_sources, sources_hash
+
+
+log = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 2
+DEFAULT_BUNDLE = Path("build") / "engine-config.bundle"
+
+
+class BundleError(Exception):
+    """Canon does not validate, so no bundle is written."""
+
+
+def _python_tag() -> str:
+    return f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+@functools.lru_cache(maxsize=1)
+def engine_hash() -> str:
+    """sha256 of the engine package sources: the code the pickled programs belong to."""
+    h = hashlib.sha256()
+    for f in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        h.update(f.name.encode("utf-8") + b"\0")
+        h.update(hashlib.sha256(f.read_bytes()).digest())
+    return h.hexdigest()
+
+
+def default_bundle_path(root: Path) -> Path:
+    env = os.getenv("DG_ENGINE_BUNDLE")
+    return Path(env) if env else root / DEFAULT_BUNDLE
+
+
+def validate(cfg: EngineConfig, registry: Dict[str, Any]) -> List[str]:
+    """Cross-file checks beyond what compiling already enforces."""
+    problems: List[str] = []
+    for entry in registry.get("gates", []) or []:
+        program = cfg.programs.get((entry.get("gate_id"), str(entry.get("version"))))
+        if program is None:
+            problems.append(f"gate {entry.get('gate_id')} {entry.get('version')}: not compiled")
+        elif program.next_state != entry.get("exit_state"):
+            problems.append(f"{program.gate_id}: transition.to {program.next_state} != exit_state {entry.get('exit_state')}")
+    for t in cfg.state_machine.transitions.values():
+        program = cfg.programs.get((t.gate_id, t.gate_version))
+        if program is None:
+            problems.append(f"transition {t.id}: gate_ref {t.gate_id} {t.gate_version} not compiled")
+        elif program.next_state != t.to_state:
+            problems.append(f"transition {t.id}: to {t.to_state} != {program.gate_id} next_state {program.next_state}")
+    for program in cfg.programs.values():
+        for rule in program.rules:
+            if rule.error_code not in cfg.catalog:
+                problems.append(f"{program.gate_id}/{rule.rule_id}: {rule.error_code} has no ux_messages entry")
+    return problems
+
+
+def build(root: Path, out: Path) -> EngineConfig:
+    """Validate + compile the canon under `root`, write the bundle atomically."""
+    _, sources = read_sources(root)
+    try:
+        cfg = EngineConfig.from_sources(sources)
+    except Exception as e:
+        raise BundleError(f"canon does not compile: {e}") from e
+
+    problems = validate(cfg, yaml.safe_load(sources["gates_registry.yaml"].decode("utf-8")) or {})
+    if problems:
+        raise BundleError("; ".join(problems))
+
+    payload: Dict[str, Any] = {
+        "format": BUNDLE_FORMAT,
+        "python": _python_tag(),
+        "engine_hash": engine_hash(),
+        "config_hash": cfg.config_hash,
+        "config": cfg,
+    }
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_bytes(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp, out)
+    return cfg
+
+
+def load(root: Path, path: Path) -> Optional[Tuple[EngineConfig, Fingerprint]]:
+    """
+    (config, fingerprint) from a fresh bundle, or None if the bundle is
+    missing, unreadable, built by another format/interpreter/engine code, or stale.
+    """
+    try:
+        payload = pickle.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception:
+        log.warning("engine bundle %s unreadable; loading YAML", path, exc_info=True)
+        return None
+
+    if not isinstance(payload, dict) or payload.get("format") != BUNDLE_FORMAT or payload.get("python") != _python_tag():
+        log.info("engine bundle %s built for another format/interpreter; loading YAML", path)
+        return None
+    if payload.get("engine_hash") != engine_hash():
+        log.info("engine bundle %s built by other engine code; loading YAML", path)
+        return None
+
+    fp, sources = read_sources(root)
+    if sources_hash(sources) != payload.get("config_hash"):
+        log.info("engine bundle %s is stale; loading YAML", path)
+        return None
+    return payload["config"], fp
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    root = Path(__file__).resolve().parents[1]
+    ap = argparse.ArgumentParser(prog="python -m engine.bundle", description="Build/check the engine config bundle.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="validate canon and write the bundle")
+    b.add_argument("--out", type=Path, default=default_bundle_path(root))
+    c = sub.add_parser("check", help="exit 1 if the bundle is missing or stale")
+    c.add_argument("--bundle", type=Path, default=default_bundle_path(root))
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        try:
+            cfg = build(root, args.out)
+        except BundleError as e:
+            print(f"bundle not written: {e}", file=sys.stderr)
+            return 1
+        print(f"{args.out} ({cfg.config_hash[:12]}, {len(cfg.programs)} gates)")
+        return 0
+
+    loaded = load(root, args.bundle)
+    if loaded is None:
+        print(f"{args.bundle}: missing or stale", file=sys.stderr)
+        return 1
+    print(f"{args.bundle}: fresh ({loaded[0].config_hash[:12]})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
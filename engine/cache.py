@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional
+
+
+class ResultCache:
+    """
+    Bounded LRU of evaluation results, keyed by a canonical hash of
+    (gate_id, gate_version, config_hash, artifacts).
+
+    Evaluation is deterministic, so an identical resubmission can return the
+    stored result without running any rule. Entries are tied to one config
+    snapshot: sync() drops everything when the snapshot hash changes.
+    Results are copied in and out, callers may mutate what they get.
+
+    maxsize <= 0 disables the cache (every lookup is a miss, nothing stored).
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._config_hash: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(gate_id: str, gate_version: str, config_hash: str, artifacts: Mapping[str, Any]) -> Optional[str]:
+        """sha256 of the canonical JSON form, or None if artifacts are not JSON-like."""
+        try:
+            blob = json.dumps(
+                [gate_id, gate_version, config_hash, artifacts],
+                sort_keys=True, ensure_ascii=False, separators=(",", ":"), allow_nan=False,
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def sync(self, config_hash: str) -> None:
+        """Invalidate all entries if the current snapshot is not the one they were computed with."""
+        if self._config_hash == config_hash:
+            return
+        with self._lock:
+            if self._config_hash != config_hash:
+                if self._data:
+                    self.invalidations += 1
+                self._data.clear()
+                self._config_hash = config_hash
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key) if key is not None and self.maxsize > 0 else None
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: Optional[str], value: Any) -> None:
+        if key is None or self.maxsize <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "config_hash": self._config_hash,
+            }
+
+
+__all__ = ["ResultCache"]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .lexicon import LexiconMatcher
+from .rules import BINDINGS, Check, EvalContext, RuleSpec, Violation
+
+
+log = logging.getLogger(__name__)
+
+
+class GateCompileError(Exception):
+    """Gate spec cannot be compiled (malformed rule, unbound rule or conflicting lexicons)."""
+
+
+# Spec rules knowingly left without an engine binding (gate_id, rule_id): they
+# are not executed. Any other rule missing from rules.BINDINGS (a typo, a rule
+# added to gates/*.yaml) fails compilation instead of silently passing.
+UNBOUND_ALLOWED = frozenset({
+    # the pre-compiler engine never checked observable_criteria; binding it
+    # changes verdicts and needs a gate version bump
+    ("PROBLEM_VALIDATION_01", "observability_check"),
+})
+
+
+# -----------------------------
+# Compiled gate program
+# -----------------------------
+@dataclass(frozen=True)
+class CompiledRule:
+    rule_id: str
+    artifact_id: str
+    error_code: str
+    reason_class: str
+    variant: str
+    check: Check
+
+
+@dataclass(frozen=True)
+class GateProgram:
+    """
+    One gate spec (gates/<GATE>.v<version>.yaml) compiled once: rules in spec
+    order, one LexiconMatcher per artifact field, exit state from `transition.to`.
+
+    `unbound` lists spec rules with no engine binding in rules.BINDINGS (only
+    those in UNBOUND_ALLOWED); they are not executed.
+    """
+
+    gate_id: str
+    version: str
+    next_state: Optional[str]
+    rules: Tuple[CompiledRule, ...]
+    matchers: Mapping[str, LexiconMatcher]
+    unbound: Tuple[str, ...] = ()
+
+    def run(
+        self,
+        artifacts: Dict[str, Any],
+        memo: Optional[Dict[Tuple[str, str], Any]] = None,
+    ) -> List[Tuple[CompiledRule, Violation]]:
+        """Rules in spec order; `memo` may be shared across runs of this program."""
+        ctx = EvalContext(self.matchers, artifacts, memo)
+        out: List[Tuple[CompiledRule, Violation]] = []
+        for rule in self.rules:
+            for v in rule.check(ctx):
+                out.append((rule, v))
+        return out
+
+
+def compile_gate(
+    spec: Mapping[str, Any],
+    lexicons: Mapping[str, Sequence[str]],
+    patterns: Optional[Mapping[str, Any]] = None,
+) -> GateProgram:
+    """
+    Compile one parsed gate spec.
+    - lexicons: named needle lists (lexical_noise + "patterns.<name>" triggers);
+    - patterns: forbidden_patterns.yaml `patterns` (for examples-based rules).
+    """
+    gate_id = str(spec.get("gate_id") or "")
+    if not gate_id:
+        raise GateCompileError("gate spec without gate_id")
+
+    rules: List[CompiledRule] = []
+    unbound: List[str] = []
+    field_needles: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+
+    for raw in spec.get("gates", []) or []:
+        rule_id = str(raw.get("id") or "")
+        if not raw.get("trigger_on") or not raw.get("error_code"):
+            raise GateCompileError(f"{gate_id}: rule {rule_id!r} has no trigger_on/error_code")
+        binding = BINDINGS.get(rule_id)
+        if binding is None:
+            if (gate_id, rule_id) not in UNBOUND_ALLOWED:
+                raise GateCompileError(f"{gate_id}: rule {rule_id!r} has no engine binding (rules.BINDINGS)")
+            log.warning("%s: rule %s has no engine binding; not executed", gate_id, rule_id)
+            unbound.append(rule_id)
+            continue
+
+        rs = RuleSpec(gate=spec, rule=raw, lexicons=lexicons, patterns=patterns or {})
+        check = binding.build(rs)
+        rules.append(CompiledRule(
+            rule_id=rule_id,
+            artifact_id=rs.trigger,
+            error_code=str(raw["error_code"]),
+            reason_class=str(raw.get("reason_class", "") or ""),
+            variant=binding.variant,
+            check=check,
+        ))
+
+        for field_id, lexmap in check.needles().items():
+            merged = field_needles.setdefault(field_id, {})
+            for name, needles in lexmap.items():
+                if merged.setdefault(name, needles) != needles:
+                    raise GateCompileError(f"{gate_id}: lexicon {name!r} differs between rules on {field_id!r}")
+
+    # one matcher per scanned field, over the union of its rules' lexicons
+    matchers = {f: LexiconMatcher(lexmap) for f, lexmap in field_needles.items()}
+    transition = spec.get("transition", {}) or {}
+    return GateProgram(
+        gate_id=gate_id,
+        version=str(spec.get("version") or ""),
+        next_state=transition.get("to"),
+        rules=tuple(rules),
+        matchers=matchers,
+        unbound=tuple(unbound),
+    )
+
+
+def compile_registry(
+    registry: Mapping[str, Any],
+    specs: Mapping[str, Mapping[str, Any]],
+    lexicons: Mapping[str, Sequence[str]],
+    patterns: Optional[Mapping[str, Any]] = None,
+) -> Dict[Tuple[str, str], GateProgram]:
+    """
+    Compile every gate listed in gates_registry.yaml, keyed by (gate_id, version).
+    - specs: parsed gate spec files keyed by the registry `file` path.
+    """
+    programs: Dict[Tuple[str, str], GateProgram] = {}
+    for entry in registry.get("gates", []) or []:
+        spec = specs.get(entry["file"]) or {}
+        program = compile_gate(spec, lexicons, patterns)
+        if (program.gate_id, program.version) != (entry.get("gate_id"), str(entry.get("version"))):
+            raise GateCompileError(f"{entry['file']}: gate_id/version do not match gates_registry.yaml")
+        programs[(program.gate_id, program.version)] = program
+    return programs
+
+
+__all__ = ["GateProgram", "CompiledRule", "GateCompileError", "UNBOUND_ALLOWED", "compile_gate", "compile_registry"]
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import yaml
+
+from .compiler import GateProgram, compile_registry
+from .messages import MessageCatalog
+from .statemachine import StateMachine, compile_state_machine
+
+
+log = logging.getLogger(__name__)
+
+# Canon files every snapshot is built from (gate specs come from gates_registry.yaml).
+CANON_FILES: Tuple[str, ...] = (
+    "ux_messages.yaml",
+    "lexical_noise.yaml",
+    "forbidden_patterns.yaml",
+    "gates_registry.yaml",
+    "nds_state_machine.yaml",
+)
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]  # (relpath, mtime_ns, size)
+
+
+# -----------------------------
+# Immutable config snapshot
+# -----------------------------
+@dataclass(frozen=True)
+class EngineConfig:
+    """
+    Everything evaluate_gate reads, built once from the canon YAMLs and never
+    mutated. An evaluation takes one snapshot and uses only it, so a reload
+    in the middle of a request cannot mix old and new canon.
+
+    config_hash is the sha256 of the source files (path + bytes, sorted).
+    """
+
+    config_hash: str
+    files: Tuple[str, ...]
+    lexicons: Mapping[str, Tuple[str, ...]] = field(repr=False)
+    patterns: Mapping[str, Any] = field(repr=False)
+    catalog: MessageCatalog = field(repr=False)
+    programs: Mapping[Tuple[str, str], GateProgram] = field(repr=False)
+    state_machine: StateMachine = field(repr=False)
+
+    def __reduce__(self):
+        # MappingProxyType is not picklable: pickle plain dicts (engine/bundle.py)
+        return (_engine_config, (
+            self.config_hash, self.files, dict(self.lexicons), dict(self.patterns), self.catalog, dict(self.programs),
+            self.state_machine,
+        ))
+
+    def program_for(self, gate_id: str, gate_version: str) -> Optional[GateProgram]:
+        program = self.programs.get((gate_id, gate_version))
+        if program is None:
+            # unknown version => the registered version of the same gate
+            for (gid, _), p in self.programs.items():
+                if gid == gate_id:
+                    program = p
+        return program
+
+    @classmethod
+    def from_sources(cls, sources: Mapping[str, bytes]) -> "EngineConfig":
+        """Build from file contents keyed by path relative to the repo root."""
+        docs = {name: yaml.safe_load(data.decode("utf-8")) or {} for name, data in sources.items()}
+
+        lexicons: Dict[str, Tuple[str, ...]] = {}
+        for name, items in (docs["lexical_noise.yaml"].get("lexical_noise", {}) or {}).items():
+            lexicons[name] = tuple(items or [])
+        patterns = docs["forbidden_patterns.yaml"].get("patterns", {}) or {}
+        for name, pattern in patterns.items():
+            lexicons[f"patterns.{name}"] = tuple((pattern or {}).get("triggers", []) or [])
+
+        programs = compile_registry(docs["gates_registry.yaml"], docs, lexicons, patterns)
+        return cls(
+            config_hash=sources_hash(sources),
+            files=tuple(sorted(sources)),
+            lexicons=MappingProxyType(lexicons),
+            patterns=MappingProxyType(patterns),
+            catalog=MessageCatalog.from_yaml(docs["ux_messages.yaml"]),
+            programs=MappingProxyType(programs),
+            state_machine=compile_state_machine(docs["nds_state_machine.yaml"]),
+        )
+
+    @classmethod
+    def load(cls, root: Path) -> "EngineConfig":
+        return cls.from_sources(read_sources(root)[1])
+
+
+def _engine_config(
+    config_hash: str,
+    files: Tuple[str, ...],
+    lexicons: Dict[str, Tuple[str, ...]],
+    patterns: Dict[str, Any],
+    catalog: MessageCatalog,
+    programs: Dict[Tuple[str, str], GateProgram],
+    state_machine: StateMachine,
+) -> EngineConfig:
+    return EngineConfig(
+        config_hash=config_hash,
+        files=files,
+        lexicons=MappingProxyType(lexicons),
+        patterns=MappingProxyType(patterns),
+        catalog=catalog,
+        programs=MappingProxyType(programs),
+        state_machine=state_machine,
+    )
+
+
+def sources_hash(sources: Mapping[str, bytes]) -> str:
+    h = hashlib.sha256()
+    for name in sorted(sources):
+        h.update(name.encode("utf-8") + b"\0")
+        h.update(hashlib.sha256(sources[name]).digest())
+    return h.hexdigest()
+
+
+def source_files(root: Path) -> List[str]:
+    """Canon files + gate spec files listed in gates_registry.yaml (relative paths)."""
+    registry = yaml.safe_load((root / "gates_registry.yaml").read_text(encoding="utf-8")) or {}
+    return list(CANON_FILES) + [str(g["file"]) for g in registry.get("gates", []) or []]
+
+
+def read_sources(root: Path) -> Tuple[Fingerprint, Dict[str, bytes]]:
+    """
+    (fingerprint, contents) of every source file. The fingerprint is taken
+    before reading, so an edit racing the read shows up on the next check.
+    """
+    files = source_files(root)
+    fp = fingerprint(root, tuple(sorted(files)))
+    return fp, {name: (root / name).read_bytes() for name in files}
+
+
+def fingerprint(root: Path, files: Tuple[str, ...]) -> Fingerprint:
+    out = []
+    for name in files:
+        try:
+            st = (root / name).stat()
+            out.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((name, -1, -1))
+    return tuple(out)
+
+
+# -----------------------------
+# Current snapshot + reload
+# -----------------------------
+class ConfigStore:
+    """
+    Holds the current EngineConfig for one canon root.
+
+    get() is lock-free (a single reference read). reload_if_changed() stats
+    the source files; only if a mtime/size changed are they re-read, and only
+    if the content hash changed is a new snapshot compiled and swapped in.
+    A snapshot that fails to build is logged and the old one stays current.
+    """
+
+    def __init__(self, root: Path, bundle_path: Optional[Path] = None):
+        self.root = root
+        self.bundle_path = bundle_path
+        self._config: Optional[EngineConfig] = None
+        self._fingerprint: Optional[Fingerprint] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def get(self) -> EngineConfig:
+        cfg = self._config
+        if cfg is None:
+            with self._lock:
+                if self._config is None:
+                    self._swap(*self._initial())
+                cfg = self._config
+        return cfg  # type: ignore[return-value]
+
+    def _initial(self) -> Tuple[EngineConfig, Fingerprint]:
+        # prebuilt bundle (engine/bundle.py) if it matches the canon, else YAML
+        if self.bundle_path is not None:
+            from .bundle import load as load_bundle
+
+            loaded = load_bundle(self.root, self.bundle_path)
+            if loaded is not None:
+                return loaded
+        fp, sources = read_sources(self.root)
+        return EngineConfig.from_sources(sources), fp
+
+    def set(self, cfg: EngineConfig) -> None:
+        """Install a snapshot built elsewhere (tests, prebuilt bundles)."""
+        with self._lock:
+            self._swap(cfg, fingerprint(self.root, cfg.files))
+
+    def _swap(self, cfg: EngineConfig, fp: Fingerprint) -> None:
+        self._fingerprint = fp
+        self._config = cfg
+
+    def reload_if_changed(self) -> bool:
+        """True if a new snapshot was swapped in."""
+        with self._lock:
+            current = self._config
+            if current is None:
+                self._swap(*self._initial())
+                return True
+            if fingerprint(self.root, current.files) == self._fingerprint:
+                return False
+            try:
+                fp, sources = read_sources(self.root)
+                if sources_hash(sources) == current.config_hash:
+                    # touched but not changed
+                    self._fingerprint = fp
+                    return False
+                cfg = EngineConfig.from_sources(sources)
+            except Exception:
+                log.exception("engine config reload failed; keeping %s", current.config_hash[:12])
+                return False
+            self._swap(cfg, fp)
+            log.info("engine config reloaded: %s -> %s", current.config_hash[:12], cfg.config_hash[:12])
+            return True
+
+    def start_watcher(self, interval: float) -> threading.Thread:
+        """Poll for changes every `interval` seconds in a daemon thread (idempotent)."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+        self._stop.clear()
+
+        def _loop() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception:  # pragma: no cover - never kill the watcher
+                    log.exception("engine config watcher error")
+
+        self._watcher = threading.Thread(target=_loop, name="engine-config-watcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+
+__all__ = ["EngineConfig", "ConfigStore", "CANON_FILES", "read_sources", "sources_hash"]
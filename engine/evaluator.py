@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, TypedDict, Tuple
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TypedDict, Tuple
 from pathlib import Path
-import re
 
-import yaml
+from .bundle import default_bundle_path
+from .cache import ResultCache
+from .config import ConfigStore, EngineConfig
+from .messages import MessageCatalog
+from .statemachine import Transition, missing_artifacts
 
 
 class NotImplementedEngine(Exception):
@@ -37,85 +41,44 @@ class EngineResult(TypedDict, total=False):
     decision: str          # "PASS" | "BLOCK"
     next_state: Optional[str]
     errors: List[EngineError]
+    config_hash: str       # EngineConfig snapshot used
 
 
 # -----------------------------
-# Helpers: load YAMLs once
+# Config snapshot (canon YAMLs, compiled once per change)
 # -----------------------------
 _ROOT = Path(__file__).resolve().parents[1]
 
-_UX_CACHE: Optional[Dict[str, Any]] = None
-_LEX_CACHE: Optional[Dict[str, Any]] = None
-_FORB_CACHE: Optional[Dict[str, Any]] = None
+# DG_ENGINE_BUNDLE / build/engine-config.bundle: see engine/bundle.py
+_STORE = ConfigStore(_ROOT, bundle_path=default_bundle_path(_ROOT))
 
 
-def _load_yaml(path: Path) -> Dict[str, Any]:
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+def config_store() -> ConfigStore:
+    """Process-wide store; call start_watcher()/reload_if_changed() to pick up canon edits."""
+    return _STORE
 
 
-def _ux() -> Dict[str, Any]:
-    global _UX_CACHE
-    if _UX_CACHE is None:
-        _UX_CACHE = _load_yaml(_ROOT / "ux_messages.yaml")
-    return _UX_CACHE
+def current_config() -> EngineConfig:
+    return _STORE.get()
 
 
-def _lex() -> Dict[str, Any]:
-    global _LEX_CACHE
-    if _LEX_CACHE is None:
-        _LEX_CACHE = _load_yaml(_ROOT / "lexical_noise.yaml")
-    return _LEX_CACHE
+def message_catalog() -> MessageCatalog:
+    """Indexed ux_messages.yaml of the current snapshot (shared with the backend audit layer)."""
+    return _STORE.get().catalog
 
 
-def _forbidden() -> Dict[str, Any]:
-    global _FORB_CACHE
-    if _FORB_CACHE is None:
-        _FORB_CACHE = _load_yaml(_ROOT / "forbidden_patterns.yaml")
-    return _FORB_CACHE
+# DG_RESULT_CACHE_SIZE=0 disables the result cache
+_CACHE = ResultCache(int(os.getenv("DG_RESULT_CACHE_SIZE", "1024") or 0))
 
 
-def _msg(error_code: str, variant: str = "normal") -> str:
-    for m in _ux().get("messages", []):
-        if m.get("error_code") == error_code:
-            v = m.get("variants", {})
-            return v.get(variant) or v.get("normal") or ""
-    return ""
-
-
-def _reason_class_for(error_code: str) -> str:
-    for m in _ux().get("messages", []):
-        if m.get("error_code") == error_code:
-            return m.get("reason_class", "")
-    return ""
+def result_cache() -> ResultCache:
+    """Process-wide result cache; stats() gives hit/miss counters."""
+    return _CACHE
 
 
 # -----------------------------
-# String utilities
+# Error formatting
 # -----------------------------
-_RU_WORD_RE = re.compile(r"[А-Яа-яЁёA-Za-z0-9%]+", re.UNICODE)
-
-
-def _words(text: str) -> List[str]:
-    return _RU_WORD_RE.findall(text or "")
-
-
-def _contains_any(text: str, needles: List[str]) -> bool:
-    t = (text or "").lower()
-    return any(n.lower() in t for n in needles)
-
-
-def _first_span(text: str, needle: str) -> Optional[Dict[str, Any]]:
-    """Return a simple offending span for first occurrence."""
-    if not text or not needle:
-        return None
-    t_low = text.lower()
-    n_low = needle.lower()
-    idx = t_low.find(n_low)
-    if idx < 0:
-        return None
-    return {"start": idx, "end": idx + len(needle), "text": text[idx: idx + len(needle)]}
-
-
 def _make_error(
     artifact_id: str,
     error_code: str,
@@ -126,13 +89,15 @@ def _make_error(
     ui_field_id: Optional[str] = None,
     ui_field_ids: Optional[List[str]] = None,
     ui_block_id: Optional[str] = None,
+    catalog: Optional[MessageCatalog] = None,
 ) -> EngineError:
+    catalog = catalog or message_catalog()
     err: EngineError = {
         "artifact_id": artifact_id,
         "error_code": error_code,
-        "reason_class": _reason_class_for(error_code),
+        "reason_class": catalog.reason_class(error_code),
         "message_variant": variant,
-        "message": _msg(error_code, variant),
+        "message": catalog.text(error_code, variant),
         "offending_spans": spans or [],
         "missing_fields": missing_fields or [],
         # Default binding: same-named UI field as artifact_id
@@ -146,342 +111,163 @@ def _make_error(
 
 
 # -----------------------------
-# Shared dictionaries (from yaml)
-# -----------------------------
-def _state_verbs() -> List[str]:
-    return _lex().get("lexical_noise", {}).get("state_verbs_ru", []) or []
-
-
-def _soft_modals() -> List[str]:
-    return _lex().get("lexical_noise", {}).get("soft_modals_ru", []) or []
-
-
-def _universality_claims() -> List[str]:
-    return _lex().get("lexical_noise", {}).get("universality_claims_ru", []) or []
-
-
-def _pattern_triggers(name: str) -> List[str]:
-    return _forbidden().get("patterns", {}).get(name, {}).get("triggers", []) or []
-
-
-def _topic_only_titles_examples() -> List[str]:
-    return _forbidden().get("patterns", {}).get("topic_only_titles", {}).get("examples", []) or []
-
-
-# -----------------------------
-# Heuristics for alignment
-# -----------------------------
-_STOPWORDS = {
-    "и", "а", "но", "в", "во", "на", "к", "ко", "из", "у", "по", "при", "если", "то", "не",
-    "это", "как", "что", "чтобы", "ли", "для", "или", "же", "без", "до", "после", "над", "под",
-    "когда", "вместо", "с", "со", "о", "об", "от", "за", "про", "их", "его", "ее"
-}
-
-
-def _keywords(text: str) -> List[str]:
-    toks = [w.lower() for w in _words(text)]
-    # keep meaningful tokens
-    return [t for t in toks if len(t) >= 4 and t not in _STOPWORDS]
-
-
-def _goal_rule_mismatch(goal: str, rule: str) -> bool:
-    """
-    Minimal deterministic substitute for 'semantic_distance'.
-    считаем mismatch, если нет пересечения ключевых слов.
-    """
-    gk = set(_keywords(goal))
-    rk = set(_keywords(rule))
-    if not gk or not rk:
-        return True
-    return len(gk.intersection(rk)) == 0
-
-
-# -----------------------------
-# Gate evaluators
+# Public API
 # -----------------------------
-def _eval_problem_validation(artifacts: Dict[str, Any]) -> Tuple[str, Optional[str], List[EngineError]]:
-    errs: List[EngineError] = []
-
-    target_action = str(artifacts.get("target_action", "") or "")
-    error_scenario = str(artifacts.get("error_scenario", "") or "")
-    economic_impact = artifacts.get("economic_impact")
-
-    # target_action: forbidden verbs
-    for v in _state_verbs():
-        if v.lower() in target_action.lower():
-            span = _first_span(target_action, v)
-            errs.append(_make_error(
-                "target_action",
-                "ERR_VAGUE_OBJECTIVE",
-                spans=[span] if span else [],
-                ui_field_id="target_action",
-            ))
-            break
-
-    # error_scenario: must contain context tokens and be concrete
-    if len(_words(error_scenario)) < 20:
-        errs.append(_make_error(
-            "error_scenario",
-            "ERR_INCOMPLETE_ERROR_SCENARIO",
-            ui_field_id="error_scenario",
-        ))
-    if not _contains_any(error_scenario, ["когда", "если", "в случае"]):
-        # treat as incomplete (same error)
-        if not any(e["error_code"] == "ERR_INCOMPLETE_ERROR_SCENARIO" and e["artifact_id"] == "error_scenario" for e in errs):
-            errs.append(_make_error(
-                "error_scenario",
-                "ERR_INCOMPLETE_ERROR_SCENARIO",
-                ui_field_id="error_scenario",
-            ))
+def _evaluate(
+    cfg: EngineConfig,
+    gate_id: str,
+    gate_version: str,
+    artifacts: Dict[str, Any],
+    memos: Optional[Dict[Tuple[str, str], Dict[Tuple[str, str], Any]]] = None,
+) -> EngineResult:
+    gid = (gate_id or "").strip()
+    program = cfg.program_for(gid, (gate_version or "").strip())
+    errors: List[EngineError] = []
 
-    # abstract error: vague consequences OR "проблемы/эффективность" без конкретики
-    vague = _lex().get("lexical_noise", {}).get("vague_consequences_ru", [])
-    abstract_markers = vague + [
-        "появляются проблемы",
-        "возникают проблемы",
-        "становится хуже",
-        "становится лучше",
-        "снижается эффективность",
-        "повышается эффективность",
-        "улучшается взаимодействие",
-    ]
-    if _contains_any(error_scenario, abstract_markers):
-        errs.append(_make_error(
-            "error_scenario",
-            "ERR_ABSTRACT_ERROR",
-            ui_field_id="error_scenario",
-        ))
-
-    # economic impact thresholds
-    if not isinstance(economic_impact, dict) or "value" not in economic_impact or "unit" not in economic_impact:
-        missing: List[str] = []
-        if not isinstance(economic_impact, dict) or "value" not in economic_impact:
-            missing.append("value")
-        if not isinstance(economic_impact, dict) or "unit" not in economic_impact:
-            missing.append("unit")
-
-        ui_ids = [f"economic_impact.{m}" for m in missing] if missing else ["economic_impact.value", "economic_impact.unit"]
-        errs.append(_make_error(
-            "economic_impact",
-            "ERR_LOW_BUSINESS_IMPACT",
-            missing_fields=missing or ["value", "unit"],
-            ui_field_id=ui_ids[0],
-            ui_field_ids=ui_ids,
-        ))
+    if program is None:
+        # Unknown gate => hard BLOCK (explicit)
+        errors = [_make_error("gate_id", "ERR_INVALID_ADMISSION_RULE", variant="detailed", catalog=cfg.catalog)]
+        decision, next_state = "BLOCK", None
     else:
-        try:
-            value = float(economic_impact["value"])
-            unit = str(economic_impact["unit"])
-        except Exception:
-            # parsing error: most often value is not a number
-            errs.append(_make_error(
-                "economic_impact",
-                "ERR_LOW_BUSINESS_IMPACT",
-                ui_field_id="economic_impact.value",
+        memo = None if memos is None else memos.setdefault((program.gate_id, program.version), {})
+        for rule, v in program.run(artifacts, memo):
+            errors.append(_make_error(
+                rule.artifact_id,
+                rule.error_code,
+                variant=rule.variant,
+                spans=list(v.spans),
+                missing_fields=list(v.missing_fields),
+                ui_field_id=v.ui_field_id,
+                ui_field_ids=list(v.ui_field_ids),
+                catalog=cfg.catalog,
             ))
-        else:
-            thresholds = {
-                "USD": 500.0,
-                "RUB": 30000.0,
-                "Hours": 40.0,
-                "Conversion%": 1.0,
-            }
-            if unit not in thresholds:
-                errs.append(_make_error(
-                    "economic_impact",
-                    "ERR_LOW_BUSINESS_IMPACT",
-                    ui_field_id="economic_impact.unit",
-                ))
-            elif value < thresholds[unit]:
-                errs.append(_make_error(
-                    "economic_impact",
-                    "ERR_LOW_BUSINESS_IMPACT",
-                    ui_field_id="economic_impact.value",
-                ))
-
-    if errs:
-        return "BLOCK", None, errs
-    return "PASS", "VALIDATED_PROBLEM", []
-
-
-def _eval_goal_to_admission(artifacts: Dict[str, Any]) -> Tuple[str, Optional[str], List[EngineError]]:
-    errs: List[EngineError] = []
-
-    learning_goal = str(artifacts.get("learning_goal", "") or "")
-    decision_context = str(artifacts.get("decision_context", "") or "")
-    admission_rule = str(artifacts.get("admission_rule", "") or "")
-
-    # Declarative goal
-    if _contains_any(learning_goal, _state_verbs()) or _contains_any(learning_goal, _lex().get("lexical_noise", {}).get("abstract_nouns_ru", [])):
-        errs.append(_make_error("learning_goal", "ERR_DECLARATIVE_GOAL"))
-
-    # Non-operational goal: missing action/context/standard signals
-    # minimal heuristic: must contain "при" or "если" and at least one verb-like token (ending with "ет"/"ит"/"ет"/"ют" rough)
-    if not _contains_any(learning_goal, ["при", "если", "когда"]) or len(_keywords(learning_goal)) < 3:
-        errs.append(_make_error("learning_goal", "ERR_NON_OPERATIONAL_GOAL"))
-
-    # Decision context must include trigger and alternatives
-    if not _contains_any(decision_context, ["триггер", "если", "когда"]) or not _contains_any(decision_context, ["альтернатив", "вариант", "(1)", "1)"]):
-        errs.append(_make_error("decision_context", "ERR_NO_DECISION_CONTEXT"))
-
-    # Admission rule must be binary and match pattern
-    if not admission_rule.strip().lower().startswith("запрещать") or _contains_any(admission_rule, _soft_modals()):
-        errs.append(_make_error("admission_rule", "ERR_INVALID_ADMISSION_RULE"))
-    # Goal-rule mismatch
-    if admission_rule.strip() and learning_goal.strip() and _goal_rule_mismatch(learning_goal, admission_rule):
-        errs.append(_make_error("admission_rule", "ERR_GOAL_RULE_MISMATCH", variant="detailed"))
-
-    if errs:
-        return "BLOCK", None, errs
-    return "PASS", "ADMISSION_DEFINED", []
-
-
-def _eval_content_to_decisions(artifacts: Dict[str, Any]) -> Tuple[str, Optional[str], List[EngineError]]:
-    errs: List[EngineError] = []
-
-    content_outline = artifacts.get("content_outline")
-    decisions = artifacts.get("critical_decisions_map")
-    links = artifacts.get("error_prevention_links")
-
-    # content_outline must be list with >=3
-    if not isinstance(content_outline, list) or len(content_outline) < 3:
-        errs.append(_make_error("content_outline", "ERR_CONTENT_WITHOUT_DECISIONS"))
-    else:
-        # topic-only titles
-        generic = [e.lower() for e in _topic_only_titles_examples()]
-        if any(str(it).strip().lower() in generic for it in content_outline):
-            errs.append(_make_error("content_outline", "ERR_CONTENT_WITHOUT_DECISIONS"))
-
-    # decisions list >= 3
-    if not isinstance(decisions, list) or len(decisions) < 3:
-        errs.append(_make_error("critical_decisions_map", "ERR_INSUFFICIENT_DECISIONS"))
-    else:
-        # theoretical decisions
-        for d in decisions:
-            dp = str((d or {}).get("decision_point", "") or "")
-            if _contains_any(dp, _pattern_triggers("theoretical_choices_only")) or _contains_any(dp, _state_verbs()):
-                errs.append(_make_error("critical_decisions_map", "ERR_THEORETICAL_DECISIONS"))
-                break
-
-    # links must exist and cover each decision (by simple count)
-    if not isinstance(links, list) or len(links) == 0:
-        errs.append(_make_error("error_prevention_links", "ERR_CONTENT_NOT_PREVENTING_ERRORS", variant="detailed"))
-    else:
-        if isinstance(decisions, list) and len(decisions) >= 1 and len(links) < len(decisions):
-            errs.append(_make_error("error_prevention_links", "ERR_CONTENT_NOT_PREVENTING_ERRORS", variant="detailed"))
-
-        # reject generic benefits in prevented_error/rationale
-        for l in links:
-            pe = str((l or {}).get("prevented_error", "") or "")
-            ra = str((l or {}).get("rationale", "") or "")
-            if _contains_any(pe + " " + ra, _pattern_triggers("generic_benefits")):
-                errs.append(_make_error("error_prevention_links", "ERR_CONTENT_NOT_PREVENTING_ERRORS", variant="detailed"))
-                break
+        decision, next_state = ("BLOCK", None) if errors else ("PASS", program.next_state)
 
-    if errs:
-        return "BLOCK", None, errs
-    return "PASS", "DECISIONS_DEFINED", []
-
-
-def _eval_assessment_to_admission(artifacts: Dict[str, Any]) -> Tuple[str, Optional[str], List[EngineError]]:
-    errs: List[EngineError] = []
-
-    assessment_design = str(artifacts.get("assessment_design", "") or "")
-    admission_decision = str(artifacts.get("admission_decision", "") or "")
-    failure_consequences = str(artifacts.get("failure_consequences", "") or "")
-
-    # knowledge assessment markers
-    if _contains_any(assessment_design, ["тест", "вопрос", "самооцен"]):
-        errs.append(_make_error("assessment_design", "ERR_KNOWLEDGE_ASSESSMENT"))
-
-    # must be failable: require "провал" marker
-    if not _contains_any(assessment_design, ["провал", "проваливается", "провал —", "провал -"]):
-        errs.append(_make_error("assessment_design", "ERR_NON_FAILABLE_ASSESSMENT"))
-
-    # admission must be binary, no soft modals
-    if _contains_any(admission_decision, _soft_modals()) or not _contains_any(admission_decision, ["допуск", "недопуск", "заблок", "запрет"]):
-        errs.append(_make_error("admission_decision", "ERR_SOFT_ADMISSION", variant="detailed"))
-
-    # consequences must contain real block + remediation; reject "повторите материал"
-    if _contains_any(failure_consequences, _pattern_triggers("no_real_consequences")) or not _contains_any(failure_consequences, ["заблок", "блок", "запрещ"]):
-        errs.append(_make_error("failure_consequences", "ERR_NO_REAL_CONSEQUENCE", variant="detailed"))
-
-    if errs:
-        return "BLOCK", None, errs
-    return "PASS", "ADMISSION_ENFORCED", []
-
-
-def _eval_universality_filter(artifacts: Dict[str, Any]) -> Tuple[str, Optional[str], List[EngineError]]:
-    errs: List[EngineError] = []
-
-    audience_bounds = str(artifacts.get("audience_bounds", "") or "")
-    entry_diag = str(artifacts.get("entry_level_diagnostics", "") or "")
-    branching = str(artifacts.get("branching_or_paths", "") or "")
-    risks = artifacts.get("contraindications_and_risks")
-
-    # universal audience
-    if _contains_any(audience_bounds, _universality_claims()):
-        errs.append(_make_error("audience_bounds", "ERR_UNIVERSAL_AUDIENCE"))
-
-    # no exclusions
-    if not _contains_any(audience_bounds, ["исключ", "не допущ", "противопоказ", "нельзя"]):
-        errs.append(_make_error("audience_bounds", "ERR_NO_EXCLUSION_CRITERIA"))
-
-    # self declared levels
-    if _contains_any(entry_diag, _pattern_triggers("self_declared_levels")):
-        errs.append(_make_error("entry_level_diagnostics", "ERR_SELF_DECLARED_LEVEL"))
-
-    # no branching: require at least 2 path markers or "Путь" appears >=2
-    if branching.lower().count("путь") < 2 or not _contains_any(branching, ["гейтинг", "провер", "недопуск", "перевод"]):
-        errs.append(_make_error("branching_or_paths", "ERR_NO_BRANCHING"))
+    return {
+        "decision": decision,
+        "next_state": next_state,
+        "errors": errors,
+        "config_hash": cfg.config_hash,
+    }
 
-    # contraindications and risks: list >=2
-    if not isinstance(risks, list) or len(risks) < 2:
-        errs.append(_make_error("contraindications_and_risks", "ERR_NO_CONTRAINDICATIONS", variant="detailed"))
 
-    if errs:
-        return "BLOCK", None, errs
-    return "PASS", "SCOPE_AND_PATHS_DEFINED", []
+def _cached(
+    cfg: EngineConfig,
+    gate_id: str,
+    gate_version: str,
+    artifacts: Dict[str, Any],
+    memos: Optional[Dict[Tuple[str, str], Dict[Tuple[str, str], Any]]] = None,
+) -> EngineResult:
+    _CACHE.sync(cfg.config_hash)
+    key = _CACHE.key((gate_id or "").strip(), (gate_version or "").strip(), cfg.config_hash, artifacts)
+    res = _CACHE.get(key)
+    if res is None:
+        res = _evaluate(cfg, gate_id, gate_version, artifacts, memos)
+        _CACHE.put(key, res)
+    return res
 
 
-# -----------------------------
-# Public API
-# -----------------------------
 def evaluate_gate(
     *,
     gate_id: str,
     gate_version: str,
     state: str,
     artifacts: Dict[str, Any],
+    use_cache: bool = True,
 ) -> EngineResult:
     """
     Deterministic MVP evaluator for Gates 01–05.
     - No LLM.
-    - Minimal heuristics aligned with current corpus and UX codes.
+    - Runs the gate program compiled from gates/*.yaml (see engine/compiler.py).
+    - Minimal heuristics aligned with current corpus and UX codes (engine/rules.py).
+    - config_hash identifies the canon snapshot the result was computed with.
+    - Identical (gate, version, snapshot, artifacts) are served from the
+      result cache (engine/cache.py) unless use_cache=False.
     """
-    gid = (gate_id or "").strip()
+    cfg = current_config()
+    if not use_cache:
+        return _evaluate(cfg, gate_id, gate_version, artifacts)
+    return _cached(cfg, gate_id, gate_version, artifacts)
 
-    if gid == "PROBLEM_VALIDATION_01":
-        decision, next_state, errors = _eval_problem_validation(artifacts)
-    elif gid == "GOAL_TO_ADMISSION_02":
-        decision, next_state, errors = _eval_goal_to_admission(artifacts)
-    elif gid == "CONTENT_TO_DECISIONS_03":
-        decision, next_state, errors = _eval_content_to_decisions(artifacts)
-    elif gid == "ASSESSMENT_TO_ADMISSION_04":
-        decision, next_state, errors = _eval_assessment_to_admission(artifacts)
-    elif gid == "UNIVERSALITY_FILTER_05":
-        decision, next_state, errors = _eval_universality_filter(artifacts)
-    else:
-        # Unknown gate => hard BLOCK (explicit)
-        errors = [_make_error("gate_id", "ERR_INVALID_ADMISSION_RULE", variant="detailed")]
-        decision, next_state = "BLOCK", None
 
+def check_required_artifacts(transition: Transition, artifacts: Mapping[str, Any]) -> Optional[EngineResult]:
+    """
+    require.artifacts presence check of a state-machine transition, done
+    before evaluate_gate: a BLOCK with one ERR_MISSING_ARTIFACT per absent
+    artifact, or None when all are present (then the gate must run).
+    """
+    missing = missing_artifacts(transition, artifacts)
+    if not missing:
+        return None
+    cfg = current_config()
     return {
-        "decision": decision,
-        "next_state": next_state,
-        "errors": errors,
+        "decision": "BLOCK",
+        "next_state": None,
+        "errors": [
+            _make_error(a, "ERR_MISSING_ARTIFACT", missing_fields=[a], catalog=cfg.catalog) for a in missing
+        ],
+        "config_hash": cfg.config_hash,
     }
 
 
-__all__ = ["evaluate_gate", "EngineResult", "EngineError", "NotImplementedEngine"]
+def cached_result(
+    *, gate_id: str, gate_version: str, artifacts: Dict[str, Any], **_: Any
+) -> Tuple[Optional[str], Optional[EngineResult]]:
+    """
+    Result cache lookup without evaluating: (key, result or None) against the
+    current snapshot. Lets a process that dispatches to engine workers keep
+    the one cache (and its stats) itself, see remember_result().
+    """
+    cfg = current_config()
+    _CACHE.sync(cfg.config_hash)
+    key = _CACHE.key((gate_id or "").strip(), (gate_version or "").strip(), cfg.config_hash, artifacts)
+    return key, _CACHE.get(key)
+
+
+def remember_result(key: Optional[str], result: EngineResult) -> None:
+    """Store a result computed elsewhere under a cached_result() key, if it used the current snapshot."""
+    if result.get("config_hash") == current_config().config_hash:
+        _CACHE.put(key, result)
+
+
+def evaluate_many(items: Iterable[Mapping[str, Any]], use_cache: bool = True) -> List[EngineResult]:
+    """
+    Batch form of evaluate_gate: each item carries the evaluate_gate keyword
+    arguments (gate_id, gate_version, state, artifacts). Results are returned
+    in input order and are identical to per-item evaluate_gate calls.
+
+    Texts repeated across items (same field, same gate) are lowercased,
+    scanned and tokenized once per batch. The whole batch uses one snapshot;
+    items already in the result cache skip evaluation (use_cache=False:
+    no lookups, nothing stored).
+    """
+    cfg = current_config()
+    memos: Dict[Tuple[str, str], Dict[Tuple[str, str], Any]] = {}
+    run = _cached if use_cache else _evaluate
+    return [
+        run(
+            cfg,
+            str(it.get("gate_id") or ""),
+            str(it.get("gate_version") or ""),
+            it.get("artifacts") or {},
+            memos,
+        )
+        for it in items
+    ]
+
+
+__all__ = [
+    "evaluate_gate",
+    "evaluate_many",
+    "check_required_artifacts",
+    "cached_result",
+    "remember_result",
+    "message_catalog",
+    "current_config",
+    "config_store",
+    "result_cache",
+    "EngineResult",
+    "EngineError",
+    "NotImplementedEngine",
+]
 
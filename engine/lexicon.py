@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from .text import lower_keep_offsets
+
+
+# -----------------------------
+# Compiled multi-pattern matcher
+# -----------------------------
+class LexiconHit(NamedTuple):
+    start: int
+    end: int
+    needle_id: int
+
+
+def _trie_pattern(needles: List[str]) -> str:
+    """
+    Regex for a trie of `needles`: shared prefixes are factored out, so at
+    each text position `re` dispatches on the next char instead of trying
+    every needle. Greedy optional tails make the longest needle win.
+    """
+    trie: Dict[str, dict] = {}
+    for n in needles:
+        node = trie
+        for ch in n:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = "(?:" + "|".join(branches) + ")" if len(branches) > 1 else branches[0]
+        if "" in node:
+            body = ("(?:" + body + ")" if len(branches) == 1 else body) + "?"
+        return body
+
+    return emit(trie)
+
+
+# Below this many needles, lowercase-once + C-level str.find per needle beats
+# one trie-regex pass (sre costs ~60-100ns per text position in CPython).
+# `python tools/bench_engine.py --lexicon`, 1000-word text, us per scan:
+#   needles   8: find 37 / trie 114;  32: 138 / 217;  64: 289 / 262;
+#   128: 566 / 317;  256: 1169 / 241.
+# Canon fields have at most ~30 needles (the largest: GOAL_TO_ADMISSION_02
+# learning_goal, 1.5-2x faster on str.find), so they stay on str.find; the
+# trie is for lexicons grown past the crossover.
+TRIE_MIN_NEEDLES = 64
+
+
+class LexiconMatcher:
+    """
+    Multi-pattern matcher over every needle of every lexicon.
+
+    Built once per lexicon snapshot. A scan lowercases the text once and
+    returns all (including overlapping) case-insensitive occurrences with
+    offsets into the original text; semantics match
+    `needle.lower() in text.lower()`.
+
+    Large needle sets are compiled into an Aho–Corasick-style trie executed
+    as a single `re` program, so scan cost stops growing with the lexicon.
+    """
+
+    def __init__(self, lexicons: Mapping[str, Iterable[str]], *, trie_min_needles: int = TRIE_MIN_NEEDLES):
+        self._needles: List[str] = []
+        # needle_id -> [(lexicon, rank), ...]; rank = position in that lexicon
+        self._membership: List[List[Tuple[str, int]]] = []
+
+        ids: Dict[str, int] = {}
+        for name, items in lexicons.items():
+            for rank, raw in enumerate(items or []):
+                needle = str(raw).lower()
+                if not needle:
+                    continue
+                nid = ids.get(needle)
+                if nid is None:
+                    nid = ids[needle] = len(self._needles)
+                    self._needles.append(needle)
+                    self._membership.append([])
+                self._membership[nid].append((name, rank))
+
+        # Longest needle matched at a position -> every needle that is its prefix
+        # (all needles starting at one position are prefixes of the longest one).
+        self._closure: Dict[str, Tuple[int, ...]] = {
+            n: tuple(ids[n[:k]] for k in range(1, len(n) + 1) if n[:k] in ids)
+            for n in self._needles
+        }
+        self._re: Optional["re.Pattern[str]"] = None
+        if self._needles and len(self._needles) >= trie_min_needles:
+            self._re = re.compile(_trie_pattern(self._needles))
+
+    def needle(self, needle_id: int) -> str:
+        return self._needles[needle_id]
+
+    def scan(self, text: str, low: Optional[str] = None) -> "ScanResult":
+        """`low`: lower_keep_offsets(text) if the caller already has it (engine/text.py)."""
+        text = text or ""
+        hits: List[LexiconHit] = []
+        if not self._needles or not text:
+            return ScanResult(self, text, hits)
+
+        if low is None:
+            low = lower_keep_offsets(text)
+
+        needles = self._needles
+        if self._re is None:
+            for nid, n in enumerate(needles):
+                i = low.find(n)
+                while i >= 0:
+                    hits.append(LexiconHit(i, i + len(n), nid))
+                    i = low.find(n, i + 1)
+            hits.sort()
+        else:
+            # restart one char after each match => overlapping occurrences too
+            search, closure, pos = self._re.search, self._closure, 0
+            while True:
+                m = search(low, pos)
+                if m is None:
+                    break
+                start = m.start()
+                for nid in closure[m.group()]:
+                    hits.append(LexiconHit(start, start + len(needles[nid]), nid))
+                pos = start + 1
+        return ScanResult(self, text, hits)
+
+
+class ScanResult:
+    """All lexicon hits of one text, queried per lexicon name."""
+
+    __slots__ = ("matcher", "text", "_hits")
+
+    def __init__(self, matcher: LexiconMatcher, text: str, hits: List[LexiconHit]):
+        self.matcher = matcher
+        self.text = text
+        self._hits = hits
+
+    def hits(self, *lexicons: str) -> List[LexiconHit]:
+        """Hits belonging to any of the given lexicons, in text order."""
+        wanted = set(lexicons)
+        return [
+            h for h in self._hits
+            if any(name in wanted for name, _ in self.matcher._membership[h.needle_id])
+        ]
+
+    def any(self, *lexicons: str) -> bool:
+        wanted = set(lexicons)
+        for h in self._hits:
+            for name, _ in self.matcher._membership[h.needle_id]:
+                if name in wanted:
+                    return True
+        return False
+
+    def count(self, *lexicons: str) -> int:
+        return len(self.hits(*lexicons))
+
+    def first(self, lexicon: str) -> Optional[LexiconHit]:
+        """
+        Earliest occurrence of the highest-ranked needle of `lexicon`
+        (rank = order of the needle in the lexicon file).
+        """
+        best: Optional[Tuple[int, int]] = None
+        best_hit: Optional[LexiconHit] = None
+        for h in self._hits:
+            for name, rank in self.matcher._membership[h.needle_id]:
+                if name != lexicon:
+                    continue
+                key = (rank, h.start)
+                if best is None or key < best:
+                    best, best_hit = key, h
+        return best_hit
+
+    def span(self, hit: LexiconHit) -> Dict[str, object]:
+        return {"start": hit.start, "end": hit.end, "text": self.text[hit.start: hit.end]}
+
+    def spans(self, *lexicons: str) -> List[Dict[str, object]]:
+        """Every hit of the given lexicons as an offending span, in text order (equal spans once)."""
+        out: List[Dict[str, object]] = []
+        seen = set()
+        for h in self.hits(*lexicons):
+            if (h.start, h.end) not in seen:
+                seen.add((h.start, h.end))
+                out.append(self.span(h))
+        return out
+
+
+__all__ = ["LexiconMatcher", "LexiconHit", "ScanResult"]
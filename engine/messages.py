@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+
+# -----------------------------
+# UX message catalog (ux_messages.yaml)
+# -----------------------------
+@dataclass(frozen=True)
+class UxMessage:
+    error_code: str
+    reason_class: str
+    title: str
+    variants: Mapping[str, str]
+
+    def __reduce__(self):
+        # MappingProxyType is not picklable (config bundles pickle the catalog)
+        return (_ux_message, (self.error_code, self.reason_class, self.title, dict(self.variants)))
+
+
+def _ux_message(error_code: str, reason_class: str, title: str, variants: Dict[str, str]) -> UxMessage:
+    return UxMessage(error_code, reason_class, title, MappingProxyType(variants))
+
+
+@dataclass(frozen=True)
+class MessageCatalog:
+    """
+    Read-only index over ux_messages.yaml, built once at load time.
+
+    Lookups are O(1) by error_code and by (error_code, variant); a missing
+    variant falls back to "normal", an unknown error_code to "".
+    """
+
+    entries: Mapping[str, UxMessage]
+    _texts: Mapping[Tuple[str, str], str] = field(repr=False)
+
+    @classmethod
+    def from_yaml(cls, data: Optional[Dict[str, Any]]) -> "MessageCatalog":
+        entries: Dict[str, UxMessage] = {}
+        texts: Dict[Tuple[str, str], str] = {}
+        for m in (data or {}).get("messages", []) or []:
+            code = m.get("error_code")
+            if not code or code in entries:
+                # first entry wins (duplicates are rejected by tests anyway)
+                continue
+            variants = {str(k): str(v) for k, v in (m.get("variants") or {}).items() if v}
+            entries[code] = UxMessage(
+                error_code=code,
+                reason_class=m.get("reason_class", "") or "",
+                title=m.get("title", "") or "",
+                variants=MappingProxyType(variants),
+            )
+            for variant, text in variants.items():
+                texts[(code, variant)] = text
+        return cls(entries=MappingProxyType(entries), _texts=MappingProxyType(texts))
+
+    def __reduce__(self):
+        return (_catalog, (dict(self.entries), dict(self._texts)))
+
+    def get(self, error_code: str) -> Optional[UxMessage]:
+        return self.entries.get(error_code)
+
+    def text(self, error_code: str, variant: str = "normal") -> str:
+        t = self._texts.get((error_code, variant))
+        if t is None:
+            t = self._texts.get((error_code, "normal"), "")
+        return t
+
+    def reason_class(self, error_code: str) -> str:
+        m = self.entries.get(error_code)
+        return m.reason_class if m else ""
+
+    def __contains__(self, error_code: object) -> bool:
+        return error_code in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def _catalog(entries: Dict[str, UxMessage], texts: Dict[Tuple[str, str], str]) -> MessageCatalog:
+    return MessageCatalog(entries=MappingProxyType(entries), _texts=MappingProxyType(texts))
+
+
+__all__ = ["MessageCatalog", "UxMessage"]
@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+from .lexicon import ScanResult
+from .text import AnalyzedText
+
+
+# -----------------------------
+# Rule outcome
+# -----------------------------
+@dataclass(frozen=True)
+class Violation:
+    spans: Tuple[Dict[str, Any], ...] = ()
+    missing_fields: Tuple[str, ...] = ()
+    ui_field_id: Optional[str] = None
+    ui_field_ids: Tuple[str, ...] = ()
+
+
+BLOCKED = Violation()
+
+
+class EvalContext:
+    """
+    Per-evaluation view of the artifacts for one gate program.
+    Each distinct text is analyzed (engine/text.py) once and each
+    (field, text) scanned once, whichever rules read it. A batch passes the
+    same `memo` to every evaluation of one program, so identical texts shared
+    by many projects are processed once per batch.
+    """
+
+    def __init__(
+        self,
+        matchers: Mapping[str, Any],
+        artifacts: Dict[str, Any],
+        memo: Optional[Dict[Tuple[str, str], Any]] = None,
+    ):
+        self._matchers = matchers
+        self.artifacts = artifacts
+        self._memo: Dict[Tuple[str, str], Any] = {} if memo is None else memo
+
+    def value(self, field_id: str) -> Any:
+        return self.artifacts.get(field_id)
+
+    def text(self, field_id: str) -> str:
+        return str(self.artifacts.get(field_id, "") or "")
+
+    def analyzed(self, field_id: str, text: Optional[str] = None) -> AnalyzedText:
+        if text is None:
+            text = self.text(field_id)
+        key = ("\0text", text)
+        res = self._memo.get(key)
+        if res is None:
+            res = self._memo[key] = AnalyzedText(text)
+        return res
+
+    def scan(self, field_id: str, text: Optional[str] = None) -> ScanResult:
+        if text is None:
+            text = self.text(field_id)
+        key = (field_id, text)
+        res = self._memo.get(key)
+        if res is None:
+            res = self._memo[key] = self._matchers[field_id].scan(text, self.analyzed(field_id, text).lower)
+        return res
+
+
+# -----------------------------
+# Text heuristics
+# -----------------------------
+def _goal_rule_mismatch(goal_keywords: AbstractSet[str], rule_keywords: AbstractSet[str]) -> bool:
+    """
+    Minimal deterministic substitute for 'semantic_distance'.
+    считаем mismatch, если нет пересечения ключевых слов.
+    """
+    if not goal_keywords or not rule_keywords:
+        return True
+    return goal_keywords.isdisjoint(rule_keywords)
+
+
+# -----------------------------
+# Rule checks (picklable, built once per gate program)
+# -----------------------------
+Needles = Dict[str, Dict[str, Tuple[str, ...]]]  # field -> lexicon name -> needles
+
+
+class Check:
+    """Base: a compiled rule condition. Returns the Violations that BLOCK (empty => rule passed)."""
+
+    def needles(self) -> Needles:
+        return {}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class LexiconCondition(Check):
+    """
+    Blocks when any `forbidden` lexicon hits (spans = every forbidden hit),
+    or when some `required` lexicon has no hit at all.
+    """
+    field_id: str
+    forbidden: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+    required: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+
+    def needles(self) -> Needles:
+        return {self.field_id: dict(self.forbidden + self.required)}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        s = ctx.scan(self.field_id)
+        if self.forbidden:
+            spans = s.spans(*(name for name, _ in self.forbidden))
+            if spans:
+                return (Violation(spans=tuple(spans)),)
+        for name, _ in self.required:
+            if not s.any(name):
+                return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class IncompleteScenario(Check):
+    field_id: str
+    min_words: int
+    context: Tuple[str, Tuple[str, ...]]
+
+    def needles(self) -> Needles:
+        return {self.field_id: dict([self.context])}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        if len(ctx.analyzed(self.field_id).words) < self.min_words:
+            return (BLOCKED,)
+        if not ctx.scan(self.field_id).any(self.context[0]):
+            return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class ImpactBelowThreshold(Check):
+    field_id: str
+    thresholds: Tuple[Tuple[str, float], ...]
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        f = self.field_id
+        impact = ctx.value(f)
+        if not isinstance(impact, dict) or "value" not in impact or "unit" not in impact:
+            missing = [k for k in ("value", "unit") if not isinstance(impact, dict) or k not in impact]
+            ui_ids = tuple(f"{f}.{m}" for m in missing)
+            return (Violation(missing_fields=tuple(missing), ui_field_id=ui_ids[0], ui_field_ids=ui_ids),)
+        try:
+            value = float(impact["value"])
+            unit = str(impact["unit"])
+        except Exception:
+            # parsing error: most often value is not a number
+            return (Violation(ui_field_id=f"{f}.value"),)
+        thresholds = dict(self.thresholds)
+        if unit not in thresholds:
+            return (Violation(ui_field_id=f"{f}.unit"),)
+        if value < thresholds[unit]:
+            return (Violation(ui_field_id=f"{f}.value"),)
+        return ()
+
+
+@dataclass(frozen=True)
+class NonOperationalGoal(Check):
+    field_id: str
+    context: Tuple[str, Tuple[str, ...]]
+    min_keywords: int
+
+    def needles(self) -> Needles:
+        return {self.field_id: dict([self.context])}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        if not ctx.scan(self.field_id).any(self.context[0]):
+            return (BLOCKED,)
+        if len(ctx.analyzed(self.field_id).keywords) < self.min_keywords:
+            return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class InvalidAdmissionRule(Check):
+    field_id: str
+    prefix: str
+    soft: Tuple[str, Tuple[str, ...]]
+
+    def needles(self) -> Needles:
+        return {self.field_id: dict([self.soft])}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        if not ctx.analyzed(self.field_id).lower.strip().startswith(self.prefix):
+            return (BLOCKED,)
+        if ctx.scan(self.field_id).any(self.soft[0]):
+            return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class GoalRuleMismatch(Check):
+    goal_field: str
+    rule_field: str
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        goal, rule = ctx.analyzed(self.goal_field), ctx.analyzed(self.rule_field)
+        if rule.text.strip() and goal.text.strip() and _goal_rule_mismatch(goal.keyword_set, rule.keyword_set):
+            return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class TopicOnlyOutline(Check):
+    field_id: str
+    min_items: int
+    generic_titles: FrozenSet[str]
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        outline = ctx.value(self.field_id)
+        if not isinstance(outline, list) or len(outline) < self.min_items:
+            return (BLOCKED,)
+        if any(str(it).strip().lower() in self.generic_titles for it in outline):
+            return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class MinItems(Check):
+    field_id: str
+    min_items: int
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        items = ctx.value(self.field_id)
+        if not isinstance(items, list) or len(items) < self.min_items:
+            return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class ItemLexiconHit(Check):
+    """Blocks when `item_key` of any list item hits a forbidden lexicon (list must be valid)."""
+    field_id: str
+    item_key: str
+    min_items: int
+    forbidden: Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+    def needles(self) -> Needles:
+        return {self.field_id: dict(self.forbidden)}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        items = ctx.value(self.field_id)
+        if not isinstance(items, list) or len(items) < self.min_items:
+            return ()
+        names = [name for name, _ in self.forbidden]
+        for it in items:
+            text = str((it or {}).get(self.item_key, "") or "")
+            if ctx.scan(self.field_id, text).any(*names):
+                return (BLOCKED,)
+        return ()
+
+
+@dataclass(frozen=True)
+class LinksNotPreventing(Check):
+    field_id: str
+    decisions_field: str
+    generic: Tuple[str, Tuple[str, ...]]
+
+    def needles(self) -> Needles:
+        return {self.field_id: dict([self.generic])}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        links = ctx.value(self.field_id)
+        decisions = ctx.value(self.decisions_field)
+        if not isinstance(links, list) or len(links) == 0:
+            return (BLOCKED,)
+        out: List[Violation] = []
+        if isinstance(decisions, list) and len(decisions) >= 1 and len(links) < len(decisions):
+            out.append(BLOCKED)
+        # reject generic benefits in prevented_error/rationale (reported separately)
+        for l in links:
+            pe = str((l or {}).get("prevented_error", "") or "")
+            ra = str((l or {}).get("rationale", "") or "")
+            if ctx.scan(self.field_id, pe + " " + ra).any(self.generic[0]):
+                out.append(BLOCKED)
+                break
+        return tuple(out)
+
+
+@dataclass(frozen=True)
+class NoBranching(Check):
+    field_id: str
+    path_word: Tuple[str, Tuple[str, ...]]
+    min_paths: int
+    gating: Tuple[str, Tuple[str, ...]]
+
+    def needles(self) -> Needles:
+        return {self.field_id: dict([self.path_word, self.gating])}
+
+    def __call__(self, ctx: EvalContext) -> Tuple[Violation, ...]:
+        s = ctx.scan(self.field_id)
+        if s.count(self.path_word[0]) < self.min_paths or not s.any(self.gating[0]):
+            return (BLOCKED,)
+        return ()
+
+
+# -----------------------------
+# Bindings: gate rule id -> compiled check
+# -----------------------------
+# Marker lists used by gate heuristics that are not part of the canon lexicons.
+ENGINE_MARKERS: Dict[str, List[str]] = {
+    "abstract_error_extra": [
+        "появляются проблемы",
+        "возникают проблемы",
+        "становится хуже",
+        "становится лучше",
+        "снижается эффективность",
+        "повышается эффективность",
+        "улучшается взаимодействие",
+    ],
+    "goal_context": ["при", "если", "когда"],
+    "decision_trigger": ["триггер", "если", "когда"],
+    "decision_alternatives": ["альтернатив", "вариант", "(1)", "1)"],
+    "knowledge_assessment": ["тест", "вопрос", "самооцен"],
+    "failable_assessment": ["провал", "проваливается", "провал —", "провал -"],
+    "binary_admission": ["допуск", "недопуск", "заблок", "запрет"],
+    "real_block": ["заблок", "блок", "запрещ"],
+    "exclusion_markers": ["исключ", "не допущ", "противопоказ", "нельзя"],
+    "path_word": ["путь"],
+    "gating_markers": ["гейтинг", "провер", "недопуск", "перевод"],
+}
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """What a binding may read at compile time: the gate spec, one rule, and the lexicons."""
+    gate: Mapping[str, Any]
+    rule: Mapping[str, Any]
+    lexicons: Mapping[str, Sequence[str]]
+    patterns: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def trigger(self) -> str:
+        t = self.rule.get("trigger_on")
+        # multi-artifact rules report on the last artifact (the one being checked against)
+        return str(t[-1] if isinstance(t, list) else t)
+
+    def validation_rules(self, artifact_id: str) -> Mapping[str, Any]:
+        for a in self.gate.get("artifacts", []) or []:
+            if a.get("id") == artifact_id:
+                return a.get("validation_rules", {}) or {}
+        return {}
+
+    def lexicon(self, name: str) -> Tuple[str, Tuple[str, ...]]:
+        """Named needle list: engine markers first, then canon lexicons."""
+        items = ENGINE_MARKERS.get(name)
+        if items is None:
+            items = self.lexicons.get(name, []) or []
+        return name, tuple(str(x) for x in items)
+
+    def spec_list(self, artifact_id: str, key: str) -> Tuple[str, Tuple[str, ...]]:
+        """Literal list from the artifact's validation_rules, as a lexicon."""
+        items = self.validation_rules(artifact_id).get(key, []) or []
+        return f"{artifact_id}.{key}", tuple(str(x) for x in items)
+
+
+@dataclass(frozen=True)
+class Binding:
+    build: Callable[[RuleSpec], Check]
+    variant: str = "normal"
+
+
+BINDINGS: Dict[str, Binding] = {
+    # --- PROBLEM_VALIDATION_01
+    "semantic_censor": Binding(lambda r: LexiconCondition(r.trigger, forbidden=(r.lexicon("state_verbs_ru"),))),
+    "structural_error_check": Binding(lambda r: IncompleteScenario(
+        r.trigger,
+        # calibrated against the corpus; spec min_words (30) is stricter and needs a gate version bump
+        min_words=20,
+        context=r.spec_list(r.trigger, "must_contain_context"),
+    )),
+    "abstraction_blocker": Binding(lambda r: LexiconCondition(
+        r.trigger, forbidden=(r.lexicon("vague_consequences_ru"), r.lexicon("abstract_error_extra")),
+    )),
+    "impact_threshold_gate": Binding(lambda r: ImpactBelowThreshold(
+        r.trigger,
+        thresholds=tuple((str(u), float(v)) for u, v in (r.validation_rules(r.trigger).get("min_threshold") or {}).items()),
+    )),
+    # --- GOAL_TO_ADMISSION_02
+    "declarative_goal_censor": Binding(lambda r: LexiconCondition(
+        r.trigger, forbidden=(r.lexicon("state_verbs_ru"), r.lexicon("abstract_nouns_ru")),
+    )),
+    "non_admissible_goal_check": Binding(lambda r: NonOperationalGoal(
+        r.trigger, context=r.lexicon("goal_context"), min_keywords=3,
+    )),
+    "context_missing_gate": Binding(lambda r: LexiconCondition(
+        r.trigger, required=(r.lexicon("decision_trigger"), r.lexicon("decision_alternatives")),
+    )),
+    "admission_rule_validator": Binding(lambda r: InvalidAdmissionRule(
+        r.trigger, prefix="запрещать", soft=r.lexicon("soft_modals_ru"),
+    )),
+    "logic_consistency_check": Binding(
+        lambda r: GoalRuleMismatch(goal_field="learning_goal", rule_field=r.trigger),
+        variant="detailed",
+    ),
+    # --- CONTENT_TO_DECISIONS_03
+    "content_first_censor": Binding(lambda r: TopicOnlyOutline(
+        r.trigger,
+        min_items=3,
+        generic_titles=frozenset(
+            str(e).lower() for e in (r.patterns.get("topic_only_titles", {}) or {}).get("examples", []) or []
+        ),
+    )),
+    "insufficient_decisions_gate": Binding(lambda r: MinItems(
+        r.trigger, min_items=int(r.validation_rules(r.trigger).get("min_items", 3)),
+    )),
+    "theory_instead_of_choice_blocker": Binding(lambda r: ItemLexiconHit(
+        r.trigger,
+        item_key="decision_point",
+        min_items=int(r.validation_rules(r.trigger).get("min_items", 3)),
+        forbidden=(r.lexicon("patterns.theoretical_choices_only"), r.lexicon("state_verbs_ru")),
+    )),
+    "content_error_mismatch_check": Binding(
+        lambda r: LinksNotPreventing(
+            r.trigger, decisions_field="critical_decisions_map", generic=r.lexicon("patterns.generic_benefits"),
+        ),
+        variant="detailed",
+    ),
+    # --- ASSESSMENT_TO_ADMISSION_04
+    "knowledge_assessment_blocker": Binding(lambda r: LexiconCondition(
+        r.trigger, forbidden=(r.lexicon("knowledge_assessment"),),
+    )),
+    "non_failable_assessment_gate": Binding(lambda r: LexiconCondition(
+        r.trigger, required=(r.lexicon("failable_assessment"),),
+    )),
+    "soft_admission_blocker": Binding(
+        lambda r: LexiconCondition(
+            r.trigger, forbidden=(r.lexicon("soft_modals_ru"),), required=(r.lexicon("binary_admission"),),
+        ),
+        variant="detailed",
+    ),
+    "consequence_absence_check": Binding(
+        lambda r: LexiconCondition(
+            r.trigger, forbidden=(r.lexicon("patterns.no_real_consequences"),), required=(r.lexicon("real_block"),),
+        ),
+        variant="detailed",
+    ),
+    # --- UNIVERSALITY_FILTER_05
+    "universality_claim_blocker": Binding(lambda r: LexiconCondition(
+        r.trigger, forbidden=(r.lexicon("universality_claims_ru"),),
+    )),
+    "missing_exclusion_criteria_gate": Binding(lambda r: LexiconCondition(
+        r.trigger, required=(r.lexicon("exclusion_markers"),),
+    )),
+    "self_assessment_level_blocker": Binding(lambda r: LexiconCondition(
+        r.trigger, forbidden=(r.lexicon("patterns.self_declared_levels"),),
+    )),
+    "no_branching_gate": Binding(lambda r: NoBranching(
+        r.trigger,
+        path_word=r.lexicon("path_word"),
+        min_paths=int(r.validation_rules(r.trigger).get("min_paths", 2)),
+        gating=r.lexicon("gating_markers"),
+    )),
+    "missing_risk_control_gate": Binding(
+        lambda r: MinItems(r.trigger, min_items=int(r.validation_rules(r.trigger).get("min_items", 2))),
+        variant="detailed",
+    ),
+}
+
+
+__all__ = ["Violation", "EvalContext", "Check", "RuleSpec", "Binding", "BINDINGS", "ENGINE_MARKERS"]
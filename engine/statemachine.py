@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Transition:
+    """One compiled nds_state_machine.yaml transition."""
+
+    id: str
+    from_state: str
+    to_state: str
+    gate_id: str
+    gate_version: str
+    required_artifacts: Tuple[str, ...] = ()
+    lock_on_fail: bool = True
+
+
+@dataclass(frozen=True)
+class StateMachine:
+    """
+    Index of nds_state_machine.yaml: transitions by id and by source state,
+    terminal states. Built once per config snapshot (engine/config.py).
+    """
+
+    states: Tuple[str, ...]
+    terminal: frozenset
+    transitions: Mapping[str, Transition] = field(repr=False)
+    outgoing: Mapping[str, Tuple[Transition, ...]] = field(repr=False)
+
+    def __reduce__(self):
+        # MappingProxyType is not picklable (engine/bundle.py)
+        return (_state_machine, (self.states, self.terminal, dict(self.transitions), dict(self.outgoing)))
+
+    def transition(self, transition_id: str) -> Optional[Transition]:
+        return self.transitions.get(transition_id)
+
+    def next_transition(self, state: str) -> Optional[Transition]:
+        """The (first) transition out of `state`; None for terminal or unknown states."""
+        out = self.outgoing.get(state)
+        return out[0] if out else None
+
+    def is_terminal(self, state: str) -> bool:
+        return state in self.terminal
+
+
+def _state_machine(
+    states: Tuple[str, ...],
+    terminal: frozenset,
+    transitions: Dict[str, Transition],
+    outgoing: Dict[str, Tuple[Transition, ...]],
+) -> StateMachine:
+    return StateMachine(states, terminal, MappingProxyType(transitions), MappingProxyType(outgoing))
+
+
+def compile_state_machine(doc: Mapping[str, Any]) -> StateMachine:
+    states: List[str] = []
+    terminal = set()
+    for s in doc.get("states", []) or []:
+        sid = str(s["id"])
+        states.append(sid)
+        if s.get("terminal"):
+            terminal.add(sid)
+
+    transitions: Dict[str, Transition] = {}
+    outgoing: Dict[str, List[Transition]] = {}
+    for t in doc.get("transitions", []) or []:
+        ref = t.get("gate_ref") or {}
+        tr = Transition(
+            id=str(t["id"]),
+            from_state=str(t["from"]),
+            to_state=str(t["to"]),
+            gate_id=str(ref.get("gate_id", "")),
+            gate_version=str(ref.get("version", "")),
+            required_artifacts=tuple(str(a) for a in ((t.get("require") or {}).get("artifacts") or [])),
+            lock_on_fail=bool(t.get("lock_on_fail", True)),
+        )
+        for state in (tr.from_state, tr.to_state):
+            if state not in states:
+                raise ValueError(f"transition {tr.id}: unknown state {state}")
+        if tr.id in transitions:
+            raise ValueError(f"duplicate transition id {tr.id}")
+        transitions[tr.id] = tr
+        outgoing.setdefault(tr.from_state, []).append(tr)
+
+    return _state_machine(
+        tuple(states),
+        frozenset(terminal),
+        transitions,
+        {k: tuple(v) for k, v in outgoing.items()},
+    )
+
+
+def _present(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return bool(value.strip())
+    if isinstance(value, (dict, list, tuple)):
+        return bool(value)
+    return True
+
+
+def missing_artifacts(transition: Transition, artifacts: Mapping[str, Any]) -> List[str]:
+    """require.artifacts absent from `artifacts` (missing key, null, blank string, empty object/list)."""
+    return [a for a in transition.required_artifacts if not _present(artifacts.get(a))]
+
+
+__all__ = ["StateMachine", "Transition", "compile_state_machine", "missing_artifacts"]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import re
+from typing import FrozenSet, List, Optional, Tuple
+
+
+# -----------------------------
+# Tokenization
+# -----------------------------
+_RU_WORD_RE = re.compile(r"[А-Яа-яЁёA-Za-z0-9%]+", re.UNICODE)
+
+_STOPWORDS = {
+    "и", "а", "но", "в", "во", "на", "к", "ко", "из", "у", "по", "при", "если", "то", "не",
+    "это", "как", "что", "чтобы", "ли", "для", "или", "же", "без", "до", "после", "над", "под",
+    "когда", "вместо", "с", "со", "о", "об", "от", "за", "про", "их", "его", "ее"
+}
+
+
+def lower_keep_offsets(text: str) -> str:
+    """text.lower() with the same length, so offsets into it are offsets into `text`."""
+    low = text.lower()
+    if len(low) != len(text):
+        # lower() expanded some char (e.g. "İ"); lower per char to keep offsets
+        low = "".join(ch.lower()[0] for ch in text)
+    return low
+
+
+class AnalyzedText:
+    """
+    Views of one text that rules need, each computed on first use and kept:
+    lowercased text (offset-preserving), word tokens with offsets, keywords
+    (lowercased, >= 4 chars, no stopwords) and their set.
+
+    One instance per distinct text per evaluation (EvalContext.analyzed), so
+    every rule reading the same field shares the work.
+    """
+
+    __slots__ = ("text", "_lower", "_tokens", "_words", "_keywords", "_keyword_set")
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self._lower: Optional[str] = None
+        self._tokens: Optional[List[Tuple[int, int]]] = None
+        self._words: Optional[List[str]] = None
+        self._keywords: Optional[List[str]] = None
+        self._keyword_set: Optional[FrozenSet[str]] = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = lower_keep_offsets(self.text)
+        return self._lower
+
+    @property
+    def tokens(self) -> List[Tuple[int, int]]:
+        """(start, end) of every word in text order."""
+        if self._tokens is None:
+            self._tokens = [m.span() for m in _RU_WORD_RE.finditer(self.text)]
+        return self._tokens
+
+    @property
+    def words(self) -> List[str]:
+        if self._words is None:
+            text = self.text
+            self._words = [text[s:e] for s, e in self.tokens]
+        return self._words
+
+    @property
+    def keywords(self) -> List[str]:
+        if self._keywords is None:
+            toks = [w.lower() for w in self.words]
+            # keep meaningful tokens
+            self._keywords = [t for t in toks if len(t) >= 4 and t not in _STOPWORDS]
+        return self._keywords
+
+    @property
+    def keyword_set(self) -> FrozenSet[str]:
+        if self._keyword_set is None:
+            self._keyword_set = frozenset(self.keywords)
+        return self._keyword_set
+
+
+__all__ = ["AnalyzedText", "lower_keep_offsets"]
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 import sys  # <-- ADD
 import yaml
@@ -46,13 +48,18 @@ def gate_files(root):
 # HTTP / API test infrastructure
 # ===============================
 
+# engine inline in the threadpool: no spawned engine workers per TestClient
+os.environ.setdefault("DG_ENGINE_WORKERS", "0")
+# protocol exports rendered inline, into a throwaway directory
+os.environ.setdefault("DG_EXPORT_WORKERS", "0")
+os.environ.setdefault("DG_EXPORT_DIR", tempfile.mkdtemp(prefix="dg-exports-"))
+
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool # <-- важно
 
 from backend.app.main import app
-from backend.app.db import Base, get_db
+from backend.app.db import Base, get_db, make_engine
 
 
 @pytest.fixture(scope="session")
@@ -63,14 +70,26 @@ def test_engine():
     IMPORTANT:
     For SQLite in-memory, tables disappear across connections unless we use StaticPool
     and "sqlite://" (single shared in-memory DB for the whole test session).
+
+    DG_TEST_DATABASE_URL=postgresql+psycopg://... runs the same tests against a
+    throwaway local database instead (tables are created and dropped here).
     """
-    engine = create_engine(
+    url = os.getenv("DG_TEST_DATABASE_URL")
+    if url:
+        engine = make_engine(url)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        yield engine
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+        return
+
+    engine = make_engine(
         "sqlite://", # <-- важно (не sqlite:///:memory:)
-        connect_args={"check_same_thread": False},
         poolclass=StaticPool, # <-- важно
     )
     Base.metadata.create_all(bind=engine)
-    return engine
+    yield engine
 
 
 @pytest.fixture(scope="function")
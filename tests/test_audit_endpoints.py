@@ -146,6 +146,30 @@ def test_audit_list_shape_and_pagination_smoke(client, db, order: str):
     assert got_ids == {s1.id, s2.id, s3.id}
 
 
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_audit_list_pages_through_same_second_submissions(client, db, monkeypatch, order: str):
+    # submissions written by the route itself (no explicit created_at), all within about a second
+    monkeypatch.setattr(
+        "backend.app.engine_pool.evaluate_gate",
+        lambda **kw: {"decision": "BLOCK", "next_state": None, "errors": []},
+    )
+    owner = "owner-same-second"
+    pid = client.post("/projects", json={"title": "t"}, headers=_hdr(owner)).json()["id"]
+    for _ in range(5):
+        assert client.post(f"/projects/{pid}/evaluate", json={"artifacts": {}}, headers=_hdr(owner)).status_code == 200
+
+    seen: list[str] = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 1, "order": order, **({"cursor": cursor} if cursor else {})}
+        body = client.get(f"/projects/{pid}/submissions", params=params, headers=_hdr(owner)).json()
+        seen += [it["submission_id"] for it in body["items"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+
 def test_audit_list_invalid_cursor_422(client, db):
     owner_id = "owner-a"
     project_id = str(uuid.uuid4())
@@ -261,3 +285,65 @@ def test_audit_detail_owner_scoping_404(client, db):
     # deliberately 404 to avoid leaking existence
     assert r.status_code == 404
 
+
+
+def test_audit_reads_are_single_owner_scoped_queries(client, db):
+    from sqlalchemy import event
+
+    owner_id = "owner-q"
+    project_id = str(uuid.uuid4())
+    _mk_project(db=db, project_id=project_id, owner_id=owner_id)
+    sid = str(uuid.uuid4())
+    _mk_submission(db=db, submission_id=sid, project_id=project_id,
+                   created_at=datetime(2026, 1, 7, tzinfo=timezone.utc))
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        assert client.get(f"/submissions/{sid}", headers=_hdr(owner_id)).status_code == 200
+        assert len(statements) == 1, statements
+        statements.clear()
+        r = client.get(f"/projects/{project_id}/submissions", headers=_hdr(owner_id))
+        assert r.status_code == 200 and len(r.json()["items"]) == 1
+        assert len(statements) == 1, statements
+        statements.clear()
+        r = client.get(f"/projects/{project_id}/submissions/export", headers=_hdr(owner_id))
+        assert r.status_code == 200 and len(r.text.splitlines()) == 1
+        assert len(statements) == 1, statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
+
+    # empty page of someone else's project is still 404, not []
+    r = client.get(f"/projects/{project_id}/submissions", headers=_hdr("owner-other"))
+    assert r.status_code == 404
+    assert client.get(f"/projects/{project_id}/submissions/export", headers=_hdr("owner-other")).status_code == 404
+
+
+def test_audit_detail_returns_stored_error_text_as_is(client, db):
+    owner_id = "owner-msg"
+    project_id = str(uuid.uuid4())
+    _mk_project(db=db, project_id=project_id, owner_id=owner_id)
+    sid = str(uuid.uuid4())
+    _mk_submission(
+        db=db,
+        submission_id=sid,
+        project_id=project_id,
+        created_at=datetime(2026, 1, 7, 12, 0, 0, tzinfo=timezone.utc),
+        decision="BLOCK",
+        result={
+            "decision": "BLOCK",
+            # a known error_code without text: not filled from today's ux_messages.yaml
+            "errors": [{"error_code": "ERR_NO_BRANCHING", "artifact_id": "branching_or_paths"}],
+            "next_state": None,
+        },
+    )
+
+    r = client.get(f"/submissions/{sid}", headers=_hdr(owner_id))
+    assert r.status_code == 200
+    assert r.json()["result"]["errors"][0].get("message") is None
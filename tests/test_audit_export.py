@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from backend.app.models import Project, Submission
+
+
+def _hdr(owner_id: str) -> dict[str, str]:
+    return {"X-Owner-Id": owner_id}
+
+
+def _seed(db, *, owner_id: str, project_id: str, n: int, base: datetime) -> list[str]:
+    db.add(Project(id=project_id, owner_id=owner_id, title="Export", description="", current_state="S1"))
+    ids = []
+    for i in range(n):
+        sid = str(uuid.uuid4())
+        db.add(Submission(
+            id=sid,
+            project_id=project_id,
+            gate_id="G1",
+            gate_version="1",
+            state_at_submit="S1",
+            artifacts_payload=json.dumps({"scenario": {"actor": f"a{i}"}}, ensure_ascii=False),
+            result_payload=json.dumps(
+                {"decision": "BLOCK", "errors": [{"code": "E1", "path": "/artifacts/x", "message": "нет"}],
+                 "next_state": None},
+                ensure_ascii=False,
+            ),
+            decision="BLOCK",
+            created_at=base + timedelta(seconds=i // 2),  # equal pairs: id breaks the tie
+        ))
+        ids.append(sid)
+    db.commit()
+    return ids
+
+
+def _lines(resp) -> list[dict]:
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_project_export_streams_details_in_order_and_matches_detail(client, db):
+    base = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    pid = str(uuid.uuid4())
+    _seed(db, owner_id="exp-a", project_id=pid, n=5, base=base)
+
+    rows = _lines(client.get(f"/projects/{pid}/submissions/export", headers=_hdr("exp-a")))
+    assert len(rows) == 5
+    keys = [(r["created_at"], r["submission_id"]) for r in rows]
+    assert keys == sorted(keys)
+
+    # each line is exactly what GET /submissions/{id} returns
+    for r in rows:
+        detail = client.get(f"/submissions/{r['submission_id']}", headers=_hdr("exp-a")).json()
+        assert r == detail
+
+    # incremental pull: everything after the 2nd line
+    tail = _lines(client.get(
+        f"/projects/{pid}/submissions/export", params={"since": rows[1]["submission_id"]}, headers=_hdr("exp-a")
+    ))
+    assert [r["submission_id"] for r in tail] == [r["submission_id"] for r in rows[2:]]
+
+
+def test_owner_export_spans_projects_and_is_owner_scoped(client, db):
+    base = datetime(2026, 2, 2, tzinfo=timezone.utc)
+    p1, p2, foreign = (str(uuid.uuid4()) for _ in range(3))
+    _seed(db, owner_id="exp-b", project_id=p1, n=2, base=base)
+    _seed(db, owner_id="exp-b", project_id=p2, n=2, base=base + timedelta(milliseconds=500))
+    foreign_ids = _seed(db, owner_id="exp-c", project_id=foreign, n=1, base=base)
+
+    rows = _lines(client.get("/submissions/export", headers=_hdr("exp-b")))
+    assert sorted({r["project_id"] for r in rows}) == sorted({p1, p2})
+    assert len(rows) == 4
+    keys = [(r["created_at"], r["submission_id"]) for r in rows]
+    assert keys == sorted(keys)
+
+    # another owner's project / submission id is not a valid scope or cursor
+    assert client.get(f"/projects/{foreign}/submissions/export", headers=_hdr("exp-b")).status_code == 404
+    r = client.get("/submissions/export", params={"since": foreign_ids[0]}, headers=_hdr("exp-b"))
+    assert r.status_code == 422
+
+
+def test_since_keeps_rows_written_in_the_same_second(client, db, monkeypatch):
+    monkeypatch.setenv("DG_AUDIT_EXPORT_SETTLE_SECONDS", "0")
+    # no explicit created_at: the timestamps the routes write themselves
+    monkeypatch.setattr(
+        "backend.app.engine_pool.evaluate_gate",
+        lambda **kw: {"decision": "BLOCK", "next_state": None, "errors": []},
+    )
+    pid = client.post("/projects", json={"title": "t"}, headers=_hdr("exp-d")).json()["id"]
+    for _ in range(5):
+        assert client.post(f"/projects/{pid}/evaluate", json={"artifacts": {}}, headers=_hdr("exp-d")).status_code == 200
+
+    rows = _lines(client.get(f"/projects/{pid}/submissions/export", headers=_hdr("exp-d")))
+    assert len(rows) == 5
+    tail = _lines(client.get(
+        f"/projects/{pid}/submissions/export", params={"since": rows[1]["submission_id"]}, headers=_hdr("exp-d")
+    ))
+    assert [r["submission_id"] for r in tail] == [r["submission_id"] for r in rows[2:]]
+
+
+def test_rows_committed_late_are_not_skipped_on_resume(client, db, monkeypatch):
+    now = datetime.now(timezone.utc)
+    pid = str(uuid.uuid4())
+    _seed(db, owner_id="exp-e", project_id=pid, n=2, base=now - timedelta(minutes=1))
+    fresh = _seed_one(db, pid, now - timedelta(seconds=1))
+
+    rows = _lines(client.get(f"/projects/{pid}/submissions/export", headers=_hdr("exp-e")))
+    assert len(rows) == 2  # the fresh row is not settled yet
+
+    # an evaluation that stamped created_at before `fresh` but committed after the export
+    late = _seed_one(db, pid, now - timedelta(seconds=3))
+    monkeypatch.setenv("DG_AUDIT_EXPORT_SETTLE_SECONDS", "0")
+    tail = _lines(client.get(
+        f"/projects/{pid}/submissions/export", params={"since": rows[-1]["submission_id"]}, headers=_hdr("exp-e")
+    ))
+    assert [r["submission_id"] for r in tail] == [late, fresh]
+
+
+def _seed_one(db, project_id: str, created_at: datetime) -> str:
+    sid = str(uuid.uuid4())
+    db.add(Submission(id=sid, project_id=project_id, gate_id="G1", gate_version="1", state_at_submit="S1",
+                      artifacts_payload="{}", result_payload='{"decision": "PASS", "errors": []}',
+                      decision="PASS", created_at=created_at))
+    db.commit()
+    return sid
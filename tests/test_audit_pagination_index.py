@@ -0,0 +1,30 @@
+import importlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from backend.app.audit.routes import _submissions_page_query
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("owner_id", [None, "o1"])
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_page_query_is_an_index_range_scan(db, order, owner_id):
+    cursor = (datetime(2026, 1, 6, tzinfo=timezone.utc), "x")
+    q = _submissions_page_query(db, "p1", order=order, cursor=cursor, owner_id=owner_id).limit(51)
+    stmt = q.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = " ".join(str(r[-1]) for r in db.execute(text(f"EXPLAIN QUERY PLAN {stmt}")))
+    assert "ix_submissions_project_created_id" in plan
+    assert "TEMP B-TREE" not in plan  # no sort step
+
+
+def test_bench_pages_stay_flat(monkeypatch, tmp_path):
+    monkeypatch.syspath_prepend(str(ROOT / "tools"))
+    bench = importlib.import_module("bench_audit_pages")
+    res = bench.run(3_000, repeats=3, db_dir=tmp_path)
+    assert res["project_rows"] == 3_000
+    assert set(res["pages"]) == {"0%", "10%", "50%", "90%", "100%"}
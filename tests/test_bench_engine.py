@@ -0,0 +1,58 @@
+import importlib
+import json
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def bench(monkeypatch):
+    monkeypatch.syspath_prepend(str(ROOT / "tools"))
+    return importlib.import_module("bench_engine")
+
+
+def test_quick_scenarios_scale_the_declared_dimension(bench):
+    by_name = {name: (gid, artifacts) for name, gid, _, artifacts in bench.scenarios(quick=True)}
+    for gate_id, fields in bench.TEXT_FIELDS.items():
+        for n in bench.QUICK_WORD_SIZES:
+            gid, artifacts = by_name[f"{gate_id}/words={n}"]
+            assert gid == gate_id
+            assert all(len(artifacts[f].split()) == n for f in fields)
+    for n in bench.QUICK_ITEM_SIZES:
+        _, artifacts = by_name[f"{bench.ITEM_GATE}/items={n}"]
+        assert len(artifacts["critical_decisions_map"]) == n == len(artifacts["error_prevention_links"])
+
+
+def test_compare_scales_by_calibration_and_gates_on_p50(bench):
+    base = {"calibration_ns": 100, "scenarios": {"g/words=10": {"p50_us": 10.0, "p99_us": 20.0, "evals_per_sec": 1000.0}}}
+
+    # 2x slower machine, 2x slower numbers: no regression
+    slow_box = {"calibration_ns": 200, "scenarios": {"g/words=10": {"p50_us": 20.0, "p99_us": 40.0, "evals_per_sec": 500.0}}}
+    assert bench.compare(slow_box, base, tolerance=0.25) == ([], [])
+
+    regressed = {"calibration_ns": 100, "scenarios": {"g/words=10": {"p50_us": 15.0, "p99_us": 50.0, "evals_per_sec": 700.0}}}
+    regressions, warnings = bench.compare(regressed, base, tolerance=0.25)
+    assert len(regressions) == 2 and len(warnings) == 1
+
+
+def test_regressions_fail_the_run_only_with_strict(bench, monkeypatch, tmp_path, capsys):
+    fast = {"calibration_ns": 100, "python": "3", "machine": "box",
+            "scenarios": {"g/words=10": {"runs": 5, "p50_us": 10.0, "p99_us": 20.0, "evals_per_sec": 1000.0}}}
+    slow = json.loads(json.dumps(fast))
+    slow["scenarios"]["g/words=10"].update(p50_us=20.0, evals_per_sec=500.0)
+    monkeypatch.setattr(bench, "run", lambda **_: slow)
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(fast), encoding="utf-8")
+
+    assert bench.main(["--baseline", str(baseline)]) == 0
+    assert "REGRESSION g/words=10" in capsys.readouterr().err
+    assert bench.main(["--baseline", str(baseline), "--strict"]) == 1
+
+
+def test_lexicon_scan_times_both_paths(bench):
+    rows = bench.lexicon_scan(words=50)
+    assert [n for n, _, _ in rows] == list(bench.LEXICON_NEEDLES)
+    assert all(find_us > 0 and trie_us > 0 for _, find_us, trie_us in rows)
@@ -0,0 +1,55 @@
+import importlib
+from pathlib import Path
+
+import pytest
+import yaml
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def runner(monkeypatch):
+    # importable by name: spawned pool workers re-import it from the parent's sys.path
+    monkeypatch.syspath_prepend(str(ROOT / "tools"))
+    return importlib.import_module("run_corpus")
+
+
+def _case_count():
+    return sum(
+        len(yaml.safe_load(f.read_text(encoding="utf-8"))["cases"])
+        for f in (ROOT / "corpus").glob("*.examples.yaml")
+    )
+
+
+def test_repo_corpus_has_no_mismatches(runner):
+    total, mismatches = runner.run([ROOT / "corpus"], workers=0, chunk_size=2)
+    assert total == _case_count()
+    assert mismatches == []
+
+
+def test_mismatches_stream_with_test_normalization(runner, tmp_path):
+    data = yaml.safe_load((ROOT / "corpus" / "PROBLEM_VALIDATION_01.examples.yaml").read_text(encoding="utf-8"))
+    bad = dict(data["cases"][1])
+    bad["id"] = "PV_wrong"
+    bad["expected"] = {"decision": "BLOCK", "errors": [{"artifact_id": "economic_impact", "error_code": "ERR_LOW_BUSINESS_IMPACT"}]}
+    data["cases"] = [data["cases"][0], bad]
+    f = tmp_path / "X.examples.yaml"
+    f.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+
+    seen = []
+    for workers in (0, 2):
+        total, mismatches = runner.run([tmp_path], workers=workers, chunk_size=1, on_mismatch=seen.append)
+        assert total == 2
+        assert [(m["case_id"], m["reason"]) for m in mismatches] == [("PV_wrong", "missing expected errors")]
+        assert mismatches[0]["expected"] == [("economic_impact", "ERR_LOW_BUSINESS_IMPACT")]
+    assert len(seen) == 2
+
+
+def test_corpus_cases_bypass_the_result_cache(runner):
+    from engine import evaluator
+
+    before = evaluator.result_cache().stats()
+    runner.run([ROOT / "corpus"], workers=0, chunk_size=50)
+    after = evaluator.result_cache().stats()
+    assert (after["hits"], after["misses"], after["size"]) == (before["hits"], before["misses"], before["size"])
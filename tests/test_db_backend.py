@@ -0,0 +1,43 @@
+import json
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+
+from backend.app import db as db_module
+
+from backend.app.db import JSONText, make_engine
+from backend.app.models import Submission
+
+
+def test_sqlite_file_uses_wal(tmp_path):
+    eng = make_engine(f"sqlite:///{tmp_path / 'dg.sqlite3'}")
+    with eng.connect() as c:
+        assert c.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert c.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    eng.dispose()
+
+
+def test_postgres_gets_pool_settings(monkeypatch):
+    seen = {}
+    monkeypatch.setattr(db_module, "create_engine", lambda url, **kw: seen.update(kw, url=url))
+    monkeypatch.setenv("DG_DB_POOL_SIZE", "4")
+    make_engine("postgresql+psycopg://u:p@localhost/dg")
+    assert seen == {
+        "url": "postgresql+psycopg://u:p@localhost/dg",
+        "pool_size": 4, "max_overflow": 20, "pool_recycle": 1800, "pool_pre_ping": True,
+    }
+
+
+def test_payloads_are_jsonb_on_postgres_and_text_elsewhere():
+    col = Submission.__table__.c.result_payload.type
+    assert isinstance(col, JSONText)
+    pg, lite = postgresql.dialect(), sqlite.dialect()
+    assert "result_payload JSONB" in str(CreateTable(Submission.__table__).compile(dialect=pg))
+    assert "result_payload TEXT" in str(CreateTable(Submission.__table__).compile(dialect=lite))
+
+    doc = {"decision": "BLOCK", "errors": [{"message": "Запрет"}]}
+    raw = json.dumps(doc, ensure_ascii=False)
+    assert col.process_bind_param(raw, pg) == doc
+    assert json.loads(col.process_result_value(doc, pg)) == doc
+    assert col.process_bind_param(raw, lite) == raw
@@ -0,0 +1,73 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+from engine import bundle, evaluator
+from engine.config import CANON_FILES, ConfigStore, EngineConfig
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def canon(tmp_path):
+    root = tmp_path / "canon"
+    root.mkdir()
+    for name in CANON_FILES:
+        shutil.copy(ROOT / name, root / name)
+    shutil.copytree(ROOT / "gates", root / "gates")
+    return root
+
+
+def test_fresh_bundle_replaces_yaml_loading(canon, tmp_path, monkeypatch):
+    path = tmp_path / "cfg.bundle"
+    built = bundle.build(canon, path)
+
+    def _no_yaml(*a, **kw):
+        raise AssertionError("YAML compiled despite a fresh bundle")
+
+    monkeypatch.setattr(EngineConfig, "from_sources", _no_yaml)
+    cfg = ConfigStore(canon, bundle_path=path).get()
+    assert cfg.config_hash == built.config_hash
+
+    artifacts = {"target_action": "Понимать важность", "economic_impact": {"value": 1, "unit": "USD"}}
+    key = ("PROBLEM_VALIDATION_01", "1.1.0")
+    assert evaluator._evaluate(cfg, *key, artifacts) == evaluator._evaluate(built, *key, artifacts)
+
+
+def test_stale_or_foreign_bundle_falls_back_to_yaml(canon, tmp_path):
+    path = tmp_path / "cfg.bundle"
+    built = bundle.build(canon, path)
+
+    p = canon / "lexical_noise.yaml"
+    p.write_text(p.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    assert bundle.load(canon, path) is None
+    cfg = ConfigStore(canon, bundle_path=path).get()
+    assert cfg.config_hash != built.config_hash
+
+    path.write_bytes(b"not a pickle")
+    assert bundle.load(canon, path) is None
+    assert bundle.load(canon, tmp_path / "missing.bundle") is None
+
+
+def test_bundle_of_other_engine_code_falls_back_to_yaml(canon, tmp_path, monkeypatch):
+    path = tmp_path / "cfg.bundle"
+    bundle.build(canon, path)
+    assert bundle.load(canon, path) is not None
+
+    # e.g. a threshold changed in rules.BINDINGS, canon untouched
+    monkeypatch.setattr(bundle, "engine_hash", lambda: "other")
+    assert bundle.load(canon, path) is None
+
+
+def test_build_rejects_invalid_canon(canon, tmp_path):
+    ux = yaml.safe_load((canon / "ux_messages.yaml").read_text(encoding="utf-8"))
+    ux["messages"] = [m for m in ux["messages"] if m["error_code"] != "ERR_NO_BRANCHING"]
+    (canon / "ux_messages.yaml").write_text(yaml.safe_dump(ux, allow_unicode=True), encoding="utf-8")
+
+    path = tmp_path / "cfg.bundle"
+    with pytest.raises(bundle.BundleError, match="ERR_NO_BRANCHING"):
+        bundle.build(canon, path)
+    assert not path.exists()
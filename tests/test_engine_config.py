@@ -0,0 +1,80 @@
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from engine import evaluator
+from engine.config import CANON_FILES, ConfigStore, EngineConfig
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PV01 = ("PROBLEM_VALIDATION_01", "1.1.0")
+
+
+@pytest.fixture()
+def canon(tmp_path):
+    for name in CANON_FILES:
+        shutil.copy(ROOT / name, tmp_path / name)
+    shutil.copytree(ROOT / "gates", tmp_path / "gates")
+    return tmp_path
+
+
+def _add_state_verb(root: Path, verb: str):
+    p = root / "lexical_noise.yaml"
+    text = p.read_text(encoding="utf-8")
+    p.write_text(text.replace("state_verbs_ru:\n", f"state_verbs_ru:\n    - {verb}\n", 1), encoding="utf-8")
+
+
+def _vague(cfg: EngineConfig, target_action: str) -> bool:
+    res = evaluator._evaluate(cfg, *PV01, {"target_action": target_action})
+    return any(e["error_code"] == "ERR_VAGUE_OBJECTIVE" for e in res["errors"])
+
+
+def test_result_reports_snapshot_hash():
+    res = evaluator.evaluate_gate(gate_id=PV01[0], gate_version=PV01[1], state="DRAFT", artifacts={})
+    assert res["config_hash"] == evaluator.current_config().config_hash
+    assert EngineConfig.load(ROOT).config_hash == res["config_hash"]
+
+
+def test_reload_swaps_only_on_content_change(canon):
+    store = ConfigStore(canon)
+    old = store.get()
+    assert store.reload_if_changed() is False
+
+    # touched, same bytes: no rebuild
+    p = canon / "ux_messages.yaml"
+    p.write_bytes(p.read_bytes())
+    assert store.reload_if_changed() is False
+    assert store.get() is old
+
+    _add_state_verb(canon, "курировать")
+    assert store.reload_if_changed() is True
+    new = store.get()
+    assert new.config_hash != old.config_hash
+
+    # in-flight holders of the old snapshot keep the old canon
+    assert _vague(new, "Курировать отчёты") and not _vague(old, "Курировать отчёты")
+
+
+def test_broken_canon_keeps_current_snapshot(canon):
+    store = ConfigStore(canon)
+    old = store.get()
+    (canon / "gates_registry.yaml").write_text("gates: [", encoding="utf-8")
+    assert store.reload_if_changed() is False
+    assert store.get() is old
+
+
+def test_watcher_picks_up_edits(canon):
+    store = ConfigStore(canon)
+    old = store.get()
+    store.start_watcher(0.02)
+    try:
+        _add_state_verb(canon, "курировать")
+        deadline = time.monotonic() + 5
+        while store.get() is old and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        store.stop_watcher()
+    assert store.get().config_hash != old.config_hash
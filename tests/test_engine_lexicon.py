@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from engine.lexicon import LexiconMatcher
+
+
+@pytest.fixture(params=[10_000, 1], ids=["find", "trie"])
+def trie_min(request):
+    return request.param
+
+
+def test_scan_returns_all_overlapping_hits_with_offsets(trie_min):
+    m = LexiconMatcher({"block": ["блок", "заблок"], "path": ["путь"]}, trie_min_needles=trie_min)
+    r = m.scan("Заблокировать путь. Путь блок")
+
+    got = [(h.start, h.end, r.text[h.start:h.end]) for h in r.hits("block")]
+    assert got == [(0, 6, "Заблок"), (2, 6, "блок"), (25, 29, "блок")]
+    assert r.count("path") == 2
+    assert r.any("path") and not r.any("missing")
+
+
+def test_shared_needle_belongs_to_every_lexicon(trie_min):
+    m = LexiconMatcher({"a": ["рекомендуется"], "b": ["желательно", "рекомендуется"]}, trie_min_needles=trie_min)
+    r = m.scan("Рекомендуется повторить")
+    assert r.any("a") and r.any("b")
+    assert r.hits("a") == r.hits("b")
+
+
+def test_first_prefers_lexicon_rank_then_position(trie_min):
+    m = LexiconMatcher({"verbs": ["знать", "понимать"]}, trie_min_needles=trie_min)
+    r = m.scan("понимать и знать, знать")
+    assert r.span(r.first("verbs")) == {"start": 11, "end": 16, "text": "знать"}
+    assert m.scan("ничего").first("verbs") is None
+
+
+def test_scan_matches_substring_semantics(trie_min):
+    rnd = random.Random(7)
+    alphabet = "абвгд Е("
+    needles = sorted({"".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 4))) for _ in range(40)})
+    m = LexiconMatcher({"x": needles}, trie_min_needles=trie_min)
+    for _ in range(200):
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 30)))
+        low = text.lower()
+        expected = sorted(
+            (i, i + len(n.lower()))
+            for n in set(n.lower() for n in needles)
+            for i in range(len(low))
+            if low.startswith(n, i)
+        )
+        assert sorted((h.start, h.end) for h in m.scan(text).hits("x")) == expected
+
+
+def test_spans_cover_every_hit_once_in_text_order(trie_min):
+    m = LexiconMatcher({"a": ["блок", "заблок"], "b": ["блок", "путь"]}, trie_min_needles=trie_min)
+    r = m.scan("Заблокировать путь, блок")
+    assert r.spans("a", "b") == [
+        {"start": 0, "end": 6, "text": "Заблок"},
+        {"start": 2, "end": 6, "text": "блок"},
+        {"start": 14, "end": 18, "text": "путь"},
+        {"start": 20, "end": 24, "text": "блок"},
+    ]
+    assert m.scan("ничего").spans("a") == []
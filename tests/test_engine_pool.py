@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app.engine_bridge import evaluate_gate
+from backend.app.engine_pool import EnginePool
+
+
+PV01 = dict(gate_id="PROBLEM_VALIDATION_01", gate_version="1.1.0", state="DRAFT")
+ARTIFACTS = {"target_action": "Понимать важность", "economic_impact": {"value": 1, "unit": "USD"}}
+
+
+def test_process_pool_matches_inline_engine():
+    pool = EnginePool(workers=1, max_pending=2)
+    pool.start()
+    try:
+        async def go():
+            one = await pool.evaluate_gate(**PV01, artifacts=ARTIFACTS)
+            many = await pool.evaluate_many([dict(PV01, artifacts=ARTIFACTS)] * 2)
+            return one, many
+
+        one, many = asyncio.run(go())
+    finally:
+        pool.shutdown()
+    expected = evaluate_gate(**PV01, artifacts=ARTIFACTS)
+    assert one == expected
+    assert many == [expected, expected]
+
+
+def test_process_pool_keeps_the_result_cache_in_the_parent():
+    from backend.app.engine_bridge import result_cache
+
+    artifacts = dict(ARTIFACTS, target_action="Понимать важность (parent cache)")
+    pool = EnginePool(workers=1, max_pending=2)
+    pool.start()
+    try:
+        before = result_cache().stats()
+
+        async def go():
+            first = await pool.evaluate_gate(**PV01, artifacts=artifacts)
+            again = await pool.evaluate_gate(**PV01, artifacts=artifacts)
+            many = await pool.evaluate_many([dict(PV01, artifacts=artifacts)])
+            return first, again, many
+
+        first, again, many = asyncio.run(go())
+    finally:
+        pool.shutdown()
+    after = result_cache().stats()
+    assert again == first and many == [first]
+    # /health/engine reads these: one miss, then hits served without a worker round trip
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+
+def test_full_queue_is_rejected_with_503():
+    pool = EnginePool(workers=0, max_pending=1, queue_timeout=0.05)
+
+    async def go():
+        slow = asyncio.ensure_future(pool._run(time.sleep, 0.5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as e:
+            await pool.evaluate_gate(**PV01, artifacts=ARTIFACTS)
+        await slow
+        return e.value
+
+    err = asyncio.run(go())
+    assert err.status_code == 503
+    assert err.headers == {"Retry-After": "1"}
+
+
+@pytest.mark.parametrize("route", ["evaluate", "batch", "transition"])
+def test_no_db_connection_is_held_during_the_engine_call(tmp_path, monkeypatch, route):
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import sessionmaker
+
+    from backend.app.db import create_schema, get_db, make_engine
+    from backend.app.main import app
+    from backend.app.models import Project
+
+    engine = make_engine(f"sqlite:///{tmp_path / 'pool.sqlite3'}")
+    create_schema(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        s.add(Project(id="p", owner_id="o", title="t", current_state="DRAFT"))
+        s.commit()
+
+    held = []
+
+    def _evaluate(**kw):
+        held.append(engine.pool.checkedout())
+        return {"decision": "BLOCK", "next_state": None, "errors": []}
+
+    monkeypatch.setattr("backend.app.engine_pool.evaluate_gate", _evaluate)
+    monkeypatch.setattr("backend.app.engine_pool.evaluate_many", lambda items: [_evaluate(**it) for it in items])
+
+    def _get_db():
+        with Session() as s:
+            yield s
+
+    full = {"target_action": "x", "error_scenario": "y", "economic_impact": {"value": 1, "unit": "USD"}}
+    path, body = {
+        "evaluate": ("/projects/p/evaluate", {"artifacts": {}}),
+        "batch": ("/projects/evaluate-batch", {"items": [{"project_id": "p", "artifacts": {}}]}),
+        "transition": ("/transition", {"project_id": "p", "from_state": "DRAFT",
+                                       "transition_id": "T01_PROBLEM_VALIDATION", "artifacts": full}),
+    }[route]
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        with TestClient(app) as c:
+            r = c.post(path, json=body, headers={"X-Owner-Id": "o"})
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    assert r.status_code == 200, r.text
+    assert held == [0]
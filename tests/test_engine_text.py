@@ -0,0 +1,33 @@
+from engine import evaluator
+from engine.rules import EvalContext
+from engine.text import AnalyzedText
+
+
+def test_views_are_derived_once_and_keep_offsets():
+    t = AnalyzedText("İmpact: Если менеджер НЕ проверяет отчёт, то клиент уходит")
+    assert t.words[:3] == ["mpact", "Если", "менеджер"]
+    assert all(t.text[s:e] == w for (s, e), w in zip(t.tokens, t.words))
+    assert len(t.lower) == len(t.text) and t.lower[8:12] == "если"
+    assert t.keywords == ["mpact", "менеджер", "проверяет", "отчёт", "клиент", "уходит"]
+    assert t.keywords is t.keywords and "если" not in t.keyword_set
+
+
+def test_rules_of_a_gate_share_one_analysis_per_text():
+    program = evaluator.current_config().programs[("GOAL_TO_ADMISSION_02", "1.0.1")]
+    goal = "Понимать важность решений при запуске проекта"
+    memo = {}
+    program.run({"learning_goal": goal, "decision_context": goal, "admission_rule": goal}, memo)
+    analyzed = [v for k, v in memo.items() if isinstance(v, AnalyzedText)]
+    assert [a.text for a in analyzed] == [goal]
+
+    ctx = EvalContext(program.matchers, {"learning_goal": goal}, memo)
+    assert ctx.analyzed("learning_goal") is analyzed[0]
+
+
+def test_lexicon_errors_report_every_offending_span():
+    res = evaluator.evaluate_gate(
+        gate_id="PROBLEM_VALIDATION_01", gate_version="1.1.0", state="DRAFT",
+        artifacts={"target_action": "Понимать риски и знать, как развить команду"},
+    )
+    spans = next(e["offending_spans"] for e in res["errors"] if e["error_code"] == "ERR_VAGUE_OBJECTIVE")
+    assert [s["text"] for s in spans] == ["Понимать", "знать", "развить"]
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import yaml
+
+from backend.app.models import Project, Submission
+from engine.evaluator import evaluate_gate, evaluate_many
+
+
+ROOT = Path(__file__).resolve().parents[1]
+HEADERS = {"X-Owner-Id": "batch-owner"}
+
+
+def _pv01_cases():
+    data = yaml.safe_load((ROOT / "corpus" / "PROBLEM_VALIDATION_01.examples.yaml").read_text(encoding="utf-8"))
+    return {c["id"]: c["input"] for c in data["cases"]}
+
+
+def test_evaluate_many_matches_evaluate_gate_in_input_order():
+    items = []
+    for path in sorted((ROOT / "corpus").glob("*.examples.yaml")):
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        for c in data["cases"]:
+            items.append({
+                "gate_id": data["gate_id"],
+                "gate_version": data["version"],
+                "state": "ANY",
+                "artifacts": c["input"],
+            })
+    items = items + items[::-1] + [{"gate_id": "NOPE", "gate_version": "0", "state": "", "artifacts": {}}]
+
+    assert evaluate_many(items) == [evaluate_gate(**it) for it in items]
+
+
+def _create(client, title):
+    r = client.post("/projects", json={"title": title}, headers=HEADERS)
+    assert r.status_code == 200
+    return r.json()["id"]
+
+
+def test_evaluate_batch_single_transaction_and_per_item_status(client, db):
+    cases = _pv01_cases()
+    ok_id = _create(client, "ok")
+    blocked_id = _create(client, "blocked")
+    final_id = _create(client, "final")
+    db.query(Project).filter(Project.id == final_id).update({"current_state": "SCOPE_AND_PATHS_DEFINED"})
+    db.flush()
+
+    r = client.post(
+        "/projects/evaluate-batch",
+        json={"items": [
+            {"project_id": blocked_id, "artifacts": cases["PV02_block_vague_objective"]},
+            {"project_id": "missing", "artifacts": {}},
+            {"project_id": ok_id, "artifacts": cases["PV01_valid"]},
+            {"project_id": final_id, "artifacts": {}},
+        ]},
+        headers=HEADERS,
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+
+    assert [(x["project_id"], x["status_code"]) for x in results] == [
+        (blocked_id, 200), ("missing", 404), (ok_id, 200), (final_id, 409),
+    ]
+    assert results[0]["result"]["decision"] == "reject"
+    assert {e["code"] for e in results[0]["result"]["errors"]} >= {"ERR_VAGUE_OBJECTIVE", "ERR_ABSTRACT_ERROR"}
+    assert results[2]["result"]["decision"] == "allow"
+    assert results[2]["result"]["project_state"] == "VALIDATED_PROBLEM"
+    assert "result" not in results[1] and results[1]["detail"] == "Project not found"
+
+    subs = db.query(Submission).filter(Submission.project_id.in_([ok_id, blocked_id, final_id])).all()
+    assert sorted(s.id for s in subs) == sorted([results[0]["result"]["submission_id"], results[2]["result"]["submission_id"]])
+    assert db.get(Project, ok_id).current_state == "VALIDATED_PROBLEM"
+    assert db.get(Project, blocked_id).current_state == "DRAFT"
+
+
+def test_evaluate_batch_rejects_duplicate_projects(client):
+    pid = _create(client, "dup")
+    r = client.post(
+        "/projects/evaluate-batch",
+        json={"items": [{"project_id": pid, "artifacts": {}}, {"project_id": pid, "artifacts": {}}]},
+        headers=HEADERS,
+    )
+    assert r.status_code == 422
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from backend.app import idempotency
+from backend.app.db import create_schema, get_db, make_engine
+from backend.app.main import app
+from backend.app.models import IdempotencyKey, Project, Submission
+
+HEADERS = {"X-Owner-Id": "idem-owner"}
+PASS = {"decision": "PASS", "next_state": "VALIDATED_PROBLEM", "errors": []}
+
+
+def _count_engine_calls(monkeypatch, result=PASS):
+    calls = []
+
+    def _evaluate(**kw):
+        calls.append(kw)
+        return dict(result)
+
+    monkeypatch.setattr("backend.app.engine_pool.evaluate_gate", _evaluate)
+    return calls
+
+
+def _evaluate(client, pid, key, artifacts=None):
+    headers = dict(HEADERS, **({"Idempotency-Key": key} if key else {}))
+    return client.post(f"/projects/{pid}/evaluate", json={"artifacts": artifacts or {}}, headers=headers)
+
+
+def test_retry_with_the_same_key_replays_the_stored_response(client, db, monkeypatch):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    calls = _count_engine_calls(monkeypatch)
+
+    first = _evaluate(client, pid, "k-1", {"problem": "x"})
+    # the project is past the gate now: without the key this would run the next gate
+    retry = _evaluate(client, pid, "k-1", {"problem": "x"})
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers[idempotency.REPLAYED_HEADER] == "true"
+    assert idempotency.REPLAYED_HEADER not in first.headers
+    assert len(calls) == 1
+    assert db.query(Submission).filter(Submission.project_id == pid).count() == 1
+    assert db.get(Project, pid).current_state == "VALIDATED_PROBLEM"
+
+
+def test_key_reused_with_another_request_is_rejected(client, db, monkeypatch):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    other = client.post("/projects", json={"title": "u"}, headers=HEADERS).json()["id"]
+    calls = _count_engine_calls(monkeypatch, {"decision": "BLOCK", "next_state": None, "errors": []})
+
+    assert _evaluate(client, pid, "k-2", {"problem": "x"}).status_code == 200
+    for r in (_evaluate(client, pid, "k-2", {"problem": "y"}), _evaluate(client, other, "k-2", {"problem": "x"})):
+        assert r.status_code == 422
+        assert r.json()["detail"] == idempotency.MISMATCH
+    assert len(calls) == 1
+
+
+def test_keys_are_scoped_per_owner_and_optional(client, db, monkeypatch):
+    calls = _count_engine_calls(monkeypatch, {"decision": "BLOCK", "next_state": None, "errors": []})
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+
+    assert _evaluate(client, pid, None).status_code == 200
+    assert _evaluate(client, pid, None).status_code == 200
+    assert _evaluate(client, pid, "k-3").status_code == 200
+    # another owner's key of the same name neither replays nor reveals this project
+    r = client.post(f"/projects/{pid}/evaluate", json={"artifacts": {}},
+                    headers={"X-Owner-Id": "someone-else", "Idempotency-Key": "k-3"})
+    assert r.status_code == 404
+    assert db.query(IdempotencyKey).filter(IdempotencyKey.owner_id == "someone-else").count() == 0  # claim released
+    assert len(calls) == 3
+    assert db.query(Submission).filter(Submission.project_id == pid).count() == 3
+
+
+def test_expired_key_is_evaluated_again(client, db, monkeypatch):
+    monkeypatch.setenv("DG_IDEMPOTENCY_TTL_SECONDS", "0")
+    calls = _count_engine_calls(monkeypatch, {"decision": "BLOCK", "next_state": None, "errors": []})
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+
+    a = _evaluate(client, pid, "k-4")
+    b = _evaluate(client, pid, "k-4")
+    assert a.status_code == b.status_code == 200
+    assert idempotency.REPLAYED_HEADER not in b.headers
+    assert a.json()["submission_id"] != b.json()["submission_id"]
+    assert len(calls) == 2
+    # the expired row was replaced, not duplicated
+    assert db.query(IdempotencyKey).filter(IdempotencyKey.key == "k-4").count() == 1
+
+
+def test_purge_expired(db):
+    now = datetime.now(timezone.utc)
+    for key, ttl in (("old", -1), ("live", 60)):
+        db.add(IdempotencyKey(owner_id="o", key=key, project_id="p", request_hash="h", response="{}",
+                              expires_at=now + timedelta(seconds=ttl)))
+    db.flush()
+
+    assert idempotency.purge_expired(db, now) == 1
+    assert [k.key for k in db.query(IdempotencyKey).filter(IdempotencyKey.owner_id == "o")] == ["live"]
+
+
+def _file_db_client(tmp_path, monkeypatch, evaluate):
+    engine = make_engine(f"sqlite:///{tmp_path / 'idem.sqlite3'}")
+    create_schema(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        s.add(Project(id="p", owner_id=HEADERS["X-Owner-Id"], title="t", current_state="DRAFT"))
+        s.commit()
+    monkeypatch.setattr("backend.app.engine_pool.evaluate_gate", evaluate)
+
+    def _get_db():
+        with Session() as s:
+            yield s
+
+    app.dependency_overrides[get_db] = _get_db
+    return engine, Session
+
+
+def _evaluate_with_key(c):
+    return c.post("/projects/p/evaluate", json={"artifacts": {}}, headers=dict(HEADERS, **{"Idempotency-Key": "k-5"}))
+
+
+def test_retry_while_the_first_request_runs_gets_409(tmp_path, monkeypatch):
+    during = []
+
+    def _evaluate(**kw):
+        # the client gave up waiting and retried while this request is in the engine
+        during.append(c.post("/projects/p/evaluate", json={"artifacts": {}},
+                             headers=dict(HEADERS, **{"Idempotency-Key": "k-5"})))
+        return dict(PASS)
+
+    engine, Session = _file_db_client(tmp_path, monkeypatch, _evaluate)
+    try:
+        with TestClient(app) as c:
+            first = _evaluate_with_key(c)
+            retry = _evaluate_with_key(c)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert len(during) == 1  # the retry did not reach the engine
+    assert during[0].status_code == 409
+    assert during[0].json()["detail"] == idempotency.IN_PROGRESS
+    assert during[0].headers["Retry-After"] == "1"
+    assert first.status_code == 200
+    assert retry.json() == first.json() and retry.headers[idempotency.REPLAYED_HEADER] == "true"
+    with Session() as s:
+        assert s.query(Submission).count() == 1
+    engine.dispose()
+
+
+def test_failed_request_releases_its_claim(tmp_path, monkeypatch):
+    calls = []
+
+    def _evaluate(**kw):
+        calls.append(kw)
+        if len(calls) == 1:
+            raise HTTPException(status_code=503, detail="Engine busy, retry later")
+        return dict(PASS)
+
+    engine, Session = _file_db_client(tmp_path, monkeypatch, _evaluate)
+    try:
+        with TestClient(app) as c:
+            assert _evaluate_with_key(c).status_code == 503
+            assert _evaluate_with_key(c).status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+
+    assert len(calls) == 2
+    with Session() as s:
+        assert s.query(Submission).count() == 1
+        assert s.query(IdempotencyKey).one().response is not None
+    engine.dispose()
@@ -0,0 +1,80 @@
+import copy
+from pathlib import Path
+
+import pytest
+import yaml
+
+from engine import evaluator
+from engine.compiler import UNBOUND_ALLOWED, GateCompileError, compile_gate
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _spec(name: str):
+    return yaml.safe_load((ROOT / "gates" / name).read_text(encoding="utf-8"))
+
+
+def _compile(spec):
+    cfg = evaluator.current_config()
+    return compile_gate(spec, cfg.lexicons, cfg.patterns)
+
+
+def test_every_registered_gate_compiles_in_spec_order():
+    registry = yaml.safe_load((ROOT / "gates_registry.yaml").read_text(encoding="utf-8"))
+    programs = evaluator.current_config().programs
+    for entry in registry["gates"]:
+        program = programs[(entry["gate_id"], str(entry["version"]))]
+        spec = _spec(Path(entry["file"]).name)
+        assert program.next_state == entry["exit_state"]
+        spec_ids = [g["id"] for g in spec["gates"]]
+        assert [r.rule_id for r in program.rules] == [i for i in spec_ids if i not in program.unbound]
+        assert [r.error_code for r in program.rules] == [
+            g["error_code"] for g in spec["gates"] if g["id"] not in program.unbound
+        ]
+
+
+def test_rules_without_binding_are_reported_not_executed():
+    program = evaluator.current_config().programs[("PROBLEM_VALIDATION_01", "1.1.0")]
+    assert program.unbound == ("observability_check",)
+    assert "ERR_NON_OBSERVABLE_ACTION" not in {r.error_code for r in program.rules}
+
+
+def test_rule_without_binding_is_rejected_unless_allowed():
+    spec = _spec("ASSESSMENT_TO_ADMISSION_04.v1.0.0.yaml")
+    spec["gates"][0]["id"] += "_typo"
+    with pytest.raises(GateCompileError, match="no engine binding"):
+        _compile(spec)
+
+    assert _compile(_spec("PROBLEM_VALIDATION_01.v1.1.0.yaml")).unbound == ("observability_check",)
+    assert ("PROBLEM_VALIDATION_01", "observability_check") in UNBOUND_ALLOWED
+
+
+def test_threshold_comes_from_gate_spec():
+    spec = _spec("PROBLEM_VALIDATION_01.v1.1.0.yaml")
+    artifacts = {"economic_impact": {"value": 600, "unit": "USD"}}
+
+    def low_impact(program):
+        return [r.error_code for r, _ in program.run(artifacts) if r.error_code == "ERR_LOW_BUSINESS_IMPACT"]
+
+    assert low_impact(_compile(spec)) == []
+
+    raised = copy.deepcopy(spec)
+    raised["version"] = "1.2.0"
+    raised["artifacts"][2]["validation_rules"]["min_threshold"]["USD"] = 1000
+    assert low_impact(_compile(raised)) == ["ERR_LOW_BUSINESS_IMPACT"]
+
+
+def test_unknown_version_falls_back_to_registered_gate():
+    res = evaluator.evaluate_gate(
+        gate_id="UNIVERSALITY_FILTER_05", gate_version="0.0.1", state="ADMISSION_ENFORCED", artifacts={},
+    )
+    assert res["decision"] == "BLOCK"
+    assert {e["artifact_id"] for e in res["errors"]} >= {"audience_bounds", "contraindications_and_risks"}
+
+
+def test_malformed_rule_is_rejected():
+    spec = _spec("ASSESSMENT_TO_ADMISSION_04.v1.0.0.yaml")
+    del spec["gates"][0]["error_code"]
+    with pytest.raises(GateCompileError):
+        _compile(spec)
@@ -0,0 +1,40 @@
+import json
+
+from sqlalchemy import func, select
+
+from backend.app import payloads
+from backend.app.models import PayloadBlob, Submission
+
+
+HEADERS = {"X-Owner-Id": "payload-owner"}
+
+
+def test_codec_round_trip_is_exact():
+    long = json.dumps({"error_scenario": "Если менеджер не проверяет отчёт, клиент уходит. " * 40}, ensure_ascii=False)
+    for text in (long, "{}", "  {\"a\": 1}\n"):
+        codec, data = payloads.encode(text)
+        assert payloads.decode(codec, data) == text
+    assert payloads.encode(long)[0] == payloads.CODEC_ZLIB
+    assert payloads.encode("{}")[0] == payloads.CODEC_RAW
+
+
+def test_resubmissions_share_one_compressed_blob(client, db):
+    artifacts = {"error_scenario": "Руководитель проекта не фиксирует риски при планировании спринта. " * 30}
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    sids = [
+        client.post(f"/projects/{pid}/evaluate", json={"artifacts": artifacts}, headers=HEADERS).json()["submission_id"]
+        for _ in range(3)
+    ]
+
+    db.expunge_all()
+    subs = [db.get(Submission, sid) for sid in sids]
+    assert len({s.artifacts_hash for s in subs}) == 1
+    assert all(s.artifacts_inline is None for s in subs)
+    blob = db.get(PayloadBlob, subs[0].artifacts_hash)
+    assert blob.codec == payloads.CODEC_ZLIB and len(blob.data) < blob.size
+    assert db.scalar(select(func.count()).select_from(PayloadBlob).where(PayloadBlob.hash == blob.hash)) == 1
+
+    # immutable snapshot: exactly the text that was written
+    assert subs[0].artifacts_payload == json.dumps(artifacts, ensure_ascii=False)
+    detail = client.get(f"/submissions/{sids[0]}", headers=HEADERS).json()
+    assert detail["request"]["artifacts"] == artifacts
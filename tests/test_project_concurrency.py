@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import create_schema, make_engine
+from backend.app.models import Project, Submission
+from backend.app.routes.evaluate import _record_submission
+from backend.app.state import GateRef
+
+HEADERS = {"X-Owner-Id": "cc-owner"}
+PASS = {"decision": "PASS", "next_state": "VALIDATED_PROBLEM", "errors": []}
+GATE = GateRef("PROBLEM_VALIDATION_01", "1.1.0")
+
+
+def test_second_writer_of_the_same_state_loses_the_cas(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'cas.sqlite3'}")
+    create_schema(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        s.add(Project(id="p", owner_id="o", title="t", current_state="DRAFT"))
+        s.commit()
+
+    a, b = Session(), Session()
+    pa, pb = a.get(Project, "p"), b.get(Project, "p")  # both read DRAFT at the same version
+    v0, updated0 = pb.version, pb.updated_at
+
+    _record_submission(a, pa, GATE, {}, PASS)
+    a.commit()
+    assert pa.current_state == "VALIDATED_PROBLEM" and pa.version == v0 + 1
+
+    with pytest.raises(HTTPException) as exc:
+        _record_submission(b, pb, GATE, {}, PASS)
+    assert exc.value.status_code == 409 and exc.value.headers == {"Retry-After": "0"}
+    b.rollback()
+
+    with Session() as s:
+        p = s.get(Project, "p")
+        assert (p.current_state, p.version) == ("VALIDATED_PROBLEM", v0 + 1)
+        assert p.updated_at > updated0  # onupdate applies to the CAS UPDATE too (ETag of GET /projects)
+        assert s.query(Submission).count() == 1  # the loser recorded nothing
+    a.close()
+    b.close()
+    engine.dispose()
+
+
+def _move_project_during_evaluation(monkeypatch, db, project_ids):
+    def _evaluate(**kw):
+        # another request advanced these projects while the engine was running
+        for pid in project_ids:
+            db.execute(text("UPDATE projects SET version = version + 1 WHERE id = :id"), {"id": pid})
+        return dict(PASS)
+
+    monkeypatch.setattr("backend.app.engine_pool.evaluate_gate", _evaluate)
+    monkeypatch.setattr("backend.app.engine_pool.evaluate_many", lambda items: [_evaluate(**it) for it in items])
+
+
+def test_evaluate_returns_409_when_the_project_moved(client, db, monkeypatch):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    _move_project_during_evaluation(monkeypatch, db, [pid])
+
+    r = client.post(f"/projects/{pid}/evaluate", json={"artifacts": {}}, headers=HEADERS)
+    assert r.status_code == 409
+    assert r.headers["Retry-After"] == "0"
+    assert db.query(Submission).filter(Submission.project_id == pid).count() == 0
+
+
+def test_batch_reports_conflicts_in_place(client, db, monkeypatch):
+    moved = client.post("/projects", json={"title": "a"}, headers=HEADERS).json()["id"]
+    calm = client.post("/projects", json={"title": "b"}, headers=HEADERS).json()["id"]
+    _move_project_during_evaluation(monkeypatch, db, [moved])
+
+    r = client.post("/projects/evaluate-batch", headers=HEADERS, json={"items": [
+        {"project_id": moved, "artifacts": {}},
+        {"project_id": calm, "artifacts": {}},
+    ]})
+    assert r.status_code == 200
+    by_id = {it["project_id"]: it for it in r.json()["results"]}
+    assert by_id[moved]["status_code"] == 409
+    assert by_id[calm]["status_code"] == 200
+    assert by_id[calm]["result"]["project_state"] == "VALIDATED_PROBLEM"
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from backend.app.db import create_schema, make_engine
+from backend.app.migrations import normalize_sqlite_timestamps
+from backend.app.models import Project
+
+
+def _hdr(owner_id: str) -> dict[str, str]:
+    return {"X-Owner-Id": owner_id}
+
+
+def _seed(db, owner_id: str, n: int) -> list[str]:
+    base = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    for i in range(n):
+        # pairs of equal updated_at exercise the id tie-break
+        t = base + timedelta(seconds=i // 2)
+        db.add(Project(id=f"{owner_id}-{i:02d}", owner_id=owner_id, title=f"P{i}", current_state="DRAFT",
+                       created_at=t, updated_at=t))
+    db.commit()
+    # newest first, id descending within equal timestamps
+    return [p.id for p in sorted(
+        db.query(Project).filter(Project.owner_id == owner_id), key=lambda p: (p.updated_at, p.id), reverse=True
+    )]
+
+
+def test_keyset_pages_cover_the_list_once(client, db):
+    expected = _seed(db, "pp-a", 7)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        r = client.get("/projects", params=params, headers=_hdr("pp-a"))
+        assert r.status_code == 200
+        seen += [p["id"] for p in r.json()]
+        pages += 1
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == expected and pages == 3
+
+    # no limit: the whole list, same order (legacy clients)
+    assert [p["id"] for p in client.get("/projects", headers=_hdr("pp-a")).json()] == expected
+    assert client.get("/projects", params={"cursor": "nope"}, headers=_hdr("pp-a")).status_code == 422
+
+
+def test_unchanged_page_is_304_until_a_project_changes(client, db):
+    _seed(db, "pp-b", 3)
+    first = client.get("/projects", params={"limit": 2}, headers=_hdr("pp-b"))
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    again = client.get("/projects", params={"limit": 2}, headers={**_hdr("pp-b"), "If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == etag and again.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+    p = db.get(Project, "pp-b-02")
+    p.current_state = "VALIDATED_PROBLEM"
+    db.commit()
+    changed = client.get("/projects", params={"limit": 2}, headers={**_hdr("pp-b"), "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    # the update moved it to the front
+    assert changed.json()[0]["id"] == "pp-b-02"
+
+
+def test_page_query_uses_owner_updated_index(db):
+    stmt = (
+        "SELECT * FROM projects WHERE owner_id = 'o' AND (updated_at, id) < ('2026-01-01 00:00:00.000000', 'x') "
+        "ORDER BY updated_at DESC, id DESC LIMIT 51"
+    )
+    plan = " ".join(str(r[-1]) for r in db.execute(text(f"EXPLAIN QUERY PLAN {stmt}")))
+    assert "ix_projects_owner_updated_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_legacy_sqlite_timestamps_are_normalized(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'legacy.sqlite3'}")
+    create_schema(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO projects (id, owner_id, title, current_state, created_at, updated_at) "
+            "VALUES ('a', 'o', 't', 'DRAFT', '2026-01-01 10:00:00', '2026-01-01 10:00:00')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO submissions (id, project_id, gate_id, gate_version, state_at_submit, decision, created_at) "
+            "VALUES ('s', 'a', 'g', '1', 'DRAFT', 'BLOCK', '2026-01-01 10:00:01')"
+        )
+    normalize_sqlite_timestamps(engine)
+    with engine.begin() as conn:
+        assert conn.exec_driver_sql("SELECT updated_at FROM projects").scalar() == "2026-01-01 10:00:00.000000"
+        assert conn.exec_driver_sql("SELECT created_at FROM submissions").scalar() == "2026-01-01 10:00:01.000000"
+    engine.dispose()
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import create_schema, make_engine
+from backend.app.export_jobs import ExportJobs
+from backend.app.migrations import migrate
+from backend.app.models import ExportJob, Project, Submission
+from backend.app.pdf import FONT_HINT, default_font, find_font, write_text_pdf
+
+
+def _hdr(owner_id: str) -> dict[str, str]:
+    return {"X-Owner-Id": owner_id}
+
+
+def _project(db, owner_id: str) -> Project:
+    p = Project(id=str(uuid.uuid4()), owner_id=owner_id, title="Протокол", description="", current_state="S1")
+    db.add(p)
+    db.commit()
+    return p
+
+
+def _submit(db, project_id: str, created_at: datetime, actor: str) -> str:
+    sid = str(uuid.uuid4())
+    db.add(Submission(
+        id=sid,
+        project_id=project_id,
+        gate_id="G1",
+        gate_version="1",
+        state_at_submit="S1",
+        artifacts_payload=json.dumps({"scenario": {"actor": actor}}, ensure_ascii=False),
+        result_payload=json.dumps({"decision": "BLOCK", "errors": [{"code": "E1", "path": "/a", "message": "нет"}],
+                                   "next_state": None}, ensure_ascii=False),
+        decision="BLOCK",
+        created_at=created_at,
+    ))
+    db.commit()
+    return sid
+
+
+def test_json_export_is_cached_by_last_submission(client, db):
+    base = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    p = _project(db, "pe-a")
+    ids = [_submit(db, p.id, base + timedelta(seconds=i), f"актор {i}") for i in range(3)]
+
+    r = client.post("/protocol/export", json={"project_id": p.id, "format": "JSON"}, headers=_hdr("pe-a"))
+    assert r.status_code == 200  # inline workers: rendered during the request
+    ref = r.json()["download_ref"]
+
+    doc = client.get(ref, headers=_hdr("pe-a"))
+    assert doc.status_code == 200
+    assert doc.headers["content-type"].startswith("application/json")
+    body = doc.json()
+    assert body["source_submission_id"] == ids[-1]
+    assert [s["submission_id"] for s in body["submissions"]] == ids
+    assert body["submissions"][0] == client.get(f"/submissions/{ids[0]}", headers=_hdr("pe-a")).json()
+
+    # unchanged project -> same job; a new submission -> a new one
+    again = client.post("/protocol/export", json={"project_id": p.id, "format": "JSON"}, headers=_hdr("pe-a"))
+    assert again.json()["download_ref"] == ref
+    _submit(db, p.id, base + timedelta(seconds=10), "новый")
+    fresh = client.post("/protocol/export", json={"project_id": p.id, "format": "JSON"}, headers=_hdr("pe-a"))
+    assert fresh.json()["download_ref"] != ref
+    assert len(client.get(fresh.json()["download_ref"], headers=_hdr("pe-a")).json()["submissions"]) == 4
+
+
+def test_pdf_export_and_owner_scoping(client, db):
+    try:
+        default_font()
+    except RuntimeError:
+        pytest.skip("no TrueType font for PDF rendering")
+    p = _project(db, "pe-b")
+    _submit(db, p.id, datetime(2026, 3, 2, tzinfo=timezone.utc), "актор")
+
+    r = client.post("/protocol/export", json={"project_id": p.id, "format": "PDF"}, headers=_hdr("pe-b"))
+    assert r.status_code == 200
+    ref = r.json()["download_ref"]
+    pdf = client.get(ref, headers=_hdr("pe-b"))
+    assert pdf.status_code == 200
+    assert pdf.headers["content-type"] == "application/pdf"
+    assert pdf.content.startswith(b"%PDF-") and pdf.content.rstrip().endswith(b"%%EOF")
+
+    assert client.get(ref, headers=_hdr("pe-other")).status_code == 404
+    r = client.post("/protocol/export", json={"project_id": p.id, "format": "PDF"}, headers=_hdr("pe-other"))
+    assert r.status_code == 404
+
+
+def test_pdf_export_without_a_font_is_refused(client, db, monkeypatch):
+    monkeypatch.delenv("DG_PDF_FONT", raising=False)
+    monkeypatch.setattr("backend.app.pdf._FONT_CANDIDATES", ())
+    p = _project(db, "pe-f")
+
+    r = client.post("/protocol/export", json={"project_id": p.id, "format": "PDF"}, headers=_hdr("pe-f"))
+    assert r.status_code == 501
+    assert r.json()["detail"] == FONT_HINT
+    assert db.query(ExportJob).filter(ExportJob.project_id == p.id).count() == 0  # nothing queued to fail
+    r = client.post("/protocol/export", json={"project_id": p.id, "format": "JSON"}, headers=_hdr("pe-f"))
+    assert r.status_code in (200, 202)
+
+
+def test_pdf_is_written_page_by_page():
+    if find_font() is None:
+        pytest.skip("no TrueType font for PDF rendering")
+    out = _Recorder()
+    write_text_pdf((f"строка {i}" for i in range(500)), out)
+    body = b"".join(out.chunks)
+
+    assert body.startswith(b"%PDF-") and body.rstrip().endswith(b"%%EOF")
+    assert body.count(b"/Type /Page ") > 1
+    # no single write holds more than a page or the font
+    assert max(map(len, out.chunks)) < len(default_font().data) + 4096
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+
+def _wait_done(Session, job_id: str, timeout: float = 10.0) -> ExportJob:
+    deadline = time.monotonic() + timeout
+    while True:
+        with Session() as s:
+            job = s.get(ExportJob, job_id)
+            if job.status in ("DONE", "FAILED") or time.monotonic() > deadline:
+                return job
+        time.sleep(0.02)
+
+
+def test_worker_pool_renders_off_thread_and_recovers_pending_jobs(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'jobs.sqlite3'}")
+    create_schema(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        pid = _project(db, "pe-c").id
+        _submit(db, pid, datetime(2026, 3, 3, tzinfo=timezone.utc), "актор")
+        # left PENDING by a previous process
+        db.add(ExportJob(id="stale", project_id=pid, owner_id="pe-c", format="JSON",
+                         source_submission_id=None, status="PENDING"))
+        db.commit()
+
+    jobs = ExportJobs(workers=2, out_dir=tmp_path / "out", session_factory=Session)
+    jobs.start()
+    try:
+        with Session() as db:
+            job = jobs.request(db, db.get(Project, pid), "JSON")
+            job_id = job.id
+        done = _wait_done(Session, job_id)
+        assert done.status == "DONE", done.error
+        assert json.loads(jobs.path(done).read_text(encoding="utf-8"))["project_id"] == pid
+
+        stale = _wait_done(Session, "stale")
+        assert stale.status == "DONE"
+        assert json.loads(jobs.path(stale).read_text(encoding="utf-8"))["submissions"] == []
+    finally:
+        jobs.shutdown()
+        engine.dispose()
+
+
+def test_concurrent_requests_share_one_job(tmp_path, monkeypatch):
+    engine = make_engine(f"sqlite:///{tmp_path / 'race.sqlite3'}")
+    create_schema(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        pid = _project(db, "pe-d").id
+    jobs = ExportJobs(workers=0, out_dir=tmp_path / "out", session_factory=Session)
+
+    live_job = ExportJobs._live_job
+    raced = []
+
+    def _racing_live_job(db, *args):
+        if db is not other and not raced:
+            # another request queues the same job between this one's lookup and insert
+            raced.append(jobs.request(other, other.get(Project, pid), "JSON").id)
+            return None
+        return live_job(db, *args)
+
+    monkeypatch.setattr(ExportJobs, "_live_job", staticmethod(_racing_live_job))
+    try:
+        with Session() as db, Session() as other:
+            job = jobs.request(db, db.get(Project, pid), "JSON")
+            assert job.id == raced[0]
+            assert job.status == "DONE"
+            assert db.query(ExportJob).filter(ExportJob.project_id == pid).count() == 1
+    finally:
+        engine.dispose()
+
+
+def test_migrate_fails_duplicate_jobs_before_adding_the_unique_index(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'dupes.sqlite3'}")
+    create_schema(engine)
+    with engine.begin() as conn:
+        for name in ("uq_export_jobs_live", "uq_export_jobs_live_no_source"):
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        pid = _project(db, "pe-e").id
+        for i, created in enumerate((datetime(2026, 3, 4, tzinfo=timezone.utc), datetime(2026, 3, 5, tzinfo=timezone.utc))):
+            db.add(ExportJob(id=f"dup-{i}", project_id=pid, owner_id="pe-e", format="JSON",
+                             source_submission_id=None, status="PENDING", created_at=created))
+        db.commit()
+
+    migrate(engine)
+    with Session() as db:
+        assert {j.id: j.status for j in db.query(ExportJob)} == {"dup-0": "FAILED", "dup-1": "PENDING"}
+    assert {"uq_export_jobs_live", "uq_export_jobs_live_no_source"} <= {
+        ix["name"] for ix in inspect(engine).get_indexes("export_jobs")
+    }
+    engine.dispose()
+
+
+def test_jobs_are_claimed_once_and_only_stale_running_jobs_are_recovered(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'claim.sqlite3'}")
+    create_schema(engine)
+    Session = sessionmaker(bind=engine)
+    now = datetime.now(timezone.utc)
+    with Session() as db:
+        pid = _project(db, "pe-g").id
+        # rendering in another live process / left by a process that died an hour ago
+        db.add(ExportJob(id="live", project_id=pid, owner_id="pe-g", format="JSON", source_submission_id=None,
+                         status="RUNNING", started_at=now))
+        db.add(ExportJob(id="dead", project_id=pid, owner_id="pe-g", format="PDF", source_submission_id=None,
+                         status="RUNNING", started_at=now - timedelta(hours=1)))
+        db.commit()
+
+    jobs = ExportJobs(workers=1, out_dir=tmp_path / "out", session_factory=Session)
+    jobs.run("live")  # not PENDING: another worker holds the claim
+    with Session() as db:
+        assert db.get(ExportJob, "live").status == "RUNNING"
+
+    if find_font() is None:
+        pytest.skip("no TrueType font for PDF rendering")
+    jobs.start()
+    try:
+        assert _wait_done(Session, "dead").status == "DONE"
+    finally:
+        jobs.shutdown()
+    with Session() as db:
+        assert db.get(ExportJob, "live").status == "RUNNING"
+    assert not list((tmp_path / "out").glob("*.tmp"))
+    engine.dispose()
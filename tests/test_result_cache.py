@@ -0,0 +1,46 @@
+from engine import evaluator
+from engine.cache import ResultCache
+from engine.compiler import GateProgram
+
+
+PV01 = dict(gate_id="PROBLEM_VALIDATION_01", gate_version="1.1.0", state="DRAFT")
+
+
+def test_repeat_submission_skips_rule_execution(monkeypatch):
+    monkeypatch.setattr(evaluator, "_CACHE", ResultCache(8))
+    artifacts = {"target_action": "Понимать важность", "economic_impact": {"value": 1, "unit": "USD"}}
+    first = evaluator.evaluate_gate(**PV01, artifacts=artifacts)
+
+    def _no_run(*a, **kw):
+        raise AssertionError("rules executed on a cache hit")
+
+    monkeypatch.setattr(GateProgram, "run", _no_run)
+    # same content, different key order / object identity
+    again = evaluator.evaluate_gate(**PV01, artifacts=dict(reversed(list(artifacts.items()))))
+    assert again == first
+    assert evaluator.evaluate_many([dict(PV01, artifacts=artifacts)]) == [first]
+
+    # callers may mutate what they get
+    again["errors"].clear()
+    assert evaluator.evaluate_gate(**PV01, artifacts=artifacts) == first
+
+    stats = evaluator.result_cache().stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (3, 1, 1)
+
+
+def test_lru_bound_and_snapshot_invalidation():
+    cache = ResultCache(2)
+    cache.sync("cfg-a")
+    keys = [cache.key("G", "1", "cfg-a", {"n": i}) for i in range(3)]
+    for i, k in enumerate(keys):
+        cache.put(k, {"n": i})
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == {"n": 2}
+    assert cache.stats()["evictions"] == 1
+
+    cache.sync("cfg-b")
+    assert cache.get(keys[2]) is None
+    assert cache.stats()["invalidations"] == 1
+
+    assert cache.key("G", "1", "cfg-a", {"x": object()}) is None
+    assert ResultCache(0).get(keys[2]) is None
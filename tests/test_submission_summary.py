@@ -0,0 +1,119 @@
+import json
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from backend.app.db import make_engine
+from backend.app.migrations import migrate, move_inline_payloads_to_blobs
+from backend.app.models import Submission
+
+
+HEADERS = {"X-Owner-Id": "summary-owner"}
+
+LEGACY_SCHEMA = """
+CREATE TABLE projects (
+    id VARCHAR(36) PRIMARY KEY, owner_id VARCHAR(64), title VARCHAR(200), description TEXT,
+    current_state VARCHAR(64), created_at DATETIME, updated_at DATETIME
+);
+CREATE TABLE submissions (
+    id VARCHAR(36) PRIMARY KEY, project_id VARCHAR(36) REFERENCES projects(id),
+    gate_id VARCHAR(64), gate_version VARCHAR(32), state_at_submit VARCHAR(64),
+    artifacts_payload TEXT NOT NULL, result_payload TEXT NOT NULL, decision VARCHAR(16), created_at DATETIME
+);
+"""
+
+
+def test_migrate_adds_and_backfills_summary_columns(tmp_path):
+    eng = make_engine(f"sqlite:///{tmp_path / 'legacy.sqlite3'}")
+    raw = eng.raw_connection()
+    raw.executescript(LEGACY_SCHEMA)
+    rows = [
+        ("s1", json.dumps({"decision": "PASS", "errors": [], "next_state": "GOAL_DEFINED"})),
+        ("s2", json.dumps({"decision": "BLOCK", "next_state": None, "errors": [
+            {"error_code": "ERR_A"}, {"error_code": "ERR_B"}, {"error_code": "ERR_A"},
+        ]})),
+        ("s3", "not json"),
+    ]
+    raw.executemany(
+        "INSERT INTO submissions (id, project_id, gate_id, gate_version, state_at_submit,"
+        " artifacts_payload, result_payload, decision, created_at)"
+        " VALUES (?, 'p', 'G', '1', 'DRAFT', '{}', ?, 'X', '2026-01-01 00:00:00')",
+        rows,
+    )
+    raw.commit()
+    raw.close()
+
+    migrate(eng)
+    migrate(eng)  # idempotent
+
+    cols = {c["name"] for c in inspect(eng).get_columns("submissions")}
+    assert {"state_after", "error_count", "error_codes"} <= cols
+    with eng.connect() as c:
+        got = c.execute(text("SELECT id, state_after, error_count, error_codes FROM submissions ORDER BY id")).all()
+    assert [tuple(r) for r in got] == [
+        ("s1", "GOAL_DEFINED", 0, None),
+        ("s2", None, 3, "ERR_A,ERR_B"),
+        ("s3", None, 0, None),
+    ]
+
+    # inline rows stay readable next to new blob-backed rows
+    with Session(eng) as s:
+        s.add(Submission(
+            id="s4", project_id="p", gate_id="G", gate_version="1", state_at_submit="DRAFT",
+            artifacts_payload="{}", result_payload=rows[0][1], decision="PASS",
+        ))
+        s.commit()
+        s.expunge_all()
+        assert s.get(Submission, "s1").result_payload == rows[0][1]
+        assert s.get(Submission, "s4").result_payload == rows[0][1]
+        assert s.get(Submission, "s4").result_inline is None
+
+    assert move_inline_payloads_to_blobs(eng) == 3
+    with Session(eng) as s:
+        legacy = s.get(Submission, "s2")
+        assert legacy.result_inline is None and legacy.result_payload == rows[1][1]
+        assert s.get(Submission, "s4").artifacts_hash == legacy.artifacts_hash  # "{}" stored once
+    eng.dispose()
+
+
+def test_list_reads_summary_columns_without_payloads(client, db, test_engine):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    r = client.post(f"/projects/{pid}/evaluate", json={"artifacts": {}}, headers=HEADERS)
+    assert r.status_code == 200
+
+    sub = db.get(Submission, r.json()["submission_id"])
+    assert sub.error_count == len(r.json()["errors"]) > 0
+    assert sub.error_codes.split(",")[0] == r.json()["errors"][0]["code"]
+
+    statements = []
+    listener = lambda conn, cur, stmt, *a: statements.append(stmt)  # noqa: E731
+    event.listen(test_engine, "before_cursor_execute", listener)
+    try:
+        page = client.get(f"/projects/{pid}/submissions", headers=HEADERS)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", listener)
+    assert page.status_code == 200
+    assert page.json()["items"][0]["state_after"] is None
+    assert statements and not any("payload" in s for s in statements)
+
+
+def test_payloads_are_deferred_and_detail_loads_them_in_one_select(client, db, test_engine):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    sid = client.post(f"/projects/{pid}/evaluate", json={"artifacts": {"target_action": "x"}}, headers=HEADERS).json()["submission_id"]
+
+    db.expunge_all()
+    sub = db.query(Submission).filter(Submission.id == sid).one()
+    assert {"artifacts_inline", "result_inline", "artifacts_blob", "result_blob"} <= inspect(sub).unloaded
+    db.expunge_all()
+
+    statements = []
+    listener = lambda conn, cur, stmt, *a: statements.append(stmt)  # noqa: E731
+    event.listen(test_engine, "before_cursor_execute", listener)
+    try:
+        r = client.get(f"/submissions/{sid}", headers=HEADERS)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", listener)
+    assert r.status_code == 200
+    assert r.json()["request"]["artifacts"] == {"target_action": "x"}
+    sub_selects = [s for s in statements if "FROM submissions" in s]
+    assert len(sub_selects) == 1 and "artifacts_payload" in sub_selects[0]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from engine import evaluator
+from engine.statemachine import compile_state_machine, missing_artifacts
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _hdr(owner_id: str) -> dict[str, str]:
+    return {"X-Owner-Id": owner_id}
+
+
+def _pv01_valid() -> dict:
+    corpus = yaml.safe_load((ROOT / "corpus" / "PROBLEM_VALIDATION_01.examples.yaml").read_text(encoding="utf-8"))
+    return next(c for c in corpus["cases"] if c["id"] == "PV01_valid")["input"]
+
+
+def _project(client, owner_id: str) -> str:
+    r = client.post("/projects", json={"title": "T"}, headers=_hdr(owner_id))
+    assert r.status_code == 200
+    return r.json()["id"]
+
+
+def test_state_machine_index_matches_yaml():
+    doc = yaml.safe_load((ROOT / "nds_state_machine.yaml").read_text(encoding="utf-8"))
+    sm = compile_state_machine(doc)
+    assert sm.transitions == evaluator.current_config().state_machine.transitions
+    assert [t.id for t in sm.transitions.values()] == [t["id"] for t in doc["transitions"]]
+    t01 = sm.transition("T01_PROBLEM_VALIDATION")
+    assert (t01.from_state, t01.to_state, t01.gate_id, t01.gate_version) == (
+        "DRAFT", "VALIDATED_PROBLEM", "PROBLEM_VALIDATION_01", "1.1.0"
+    )
+    assert sm.next_transition("DRAFT") is t01
+    assert sm.is_terminal("SCOPE_AND_PATHS_DEFINED") and sm.next_transition("SCOPE_AND_PATHS_DEFINED") is None
+    assert missing_artifacts(t01, {"target_action": "x", "error_scenario": "  ", "economic_impact": {}}) == [
+        "error_scenario", "economic_impact"
+    ]
+
+
+def test_missing_artifacts_block_without_running_the_gate(client, monkeypatch):
+    def _no_engine(**kw):
+        raise AssertionError("gate ran despite missing artifacts")
+
+    monkeypatch.setattr("backend.app.engine_pool.evaluate_gate", _no_engine)
+    pid = _project(client, "tr-a")
+    r = client.post("/transition", headers=_hdr("tr-a"), json={
+        "project_id": pid, "from_state": "DRAFT", "transition_id": "T01_PROBLEM_VALIDATION",
+        "artifacts": {"target_action": "Руководитель фиксирует план"},
+    })
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["decision"] == "BLOCK" and body["to_state"] is None
+    assert body["gate_ref"] == {"gate_id": "PROBLEM_VALIDATION_01", "gate_version": "1.1.0"}
+    assert [(e["artifact_id"], e["error_code"], e["reason_class"]) for e in body["errors"]] == [
+        ("error_scenario", "ERR_MISSING_ARTIFACT", "MISSING_ARTIFACT"),
+        ("economic_impact", "ERR_MISSING_ARTIFACT", "MISSING_ARTIFACT"),
+    ]
+    assert all(e["message"] for e in body["errors"])
+    assert body["project_state"] == "DRAFT"
+
+    # recorded for audit like any other submission
+    detail = client.get(f"/submissions/{body['submission_id']}", headers=_hdr("tr-a"))
+    assert detail.status_code == 200 and detail.json()["result"]["decision"] == "BLOCK"
+
+
+def test_pass_advances_state_in_one_round_trip(client):
+    pid = _project(client, "tr-b")
+    r = client.post("/transition", headers=_hdr("tr-b"), json={
+        "project_id": pid, "from_state": "DRAFT", "transition_id": "T01_PROBLEM_VALIDATION",
+        "artifacts": _pv01_valid(),
+    })
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["decision"], body["to_state"], body["project_state"]) == ("PASS", "VALIDATED_PROBLEM", "VALIDATED_PROBLEM")
+    assert body["errors"] == []
+
+    project = client.get(f"/projects/{pid}", headers=_hdr("tr-b")).json()
+    assert project["current_state"] == "VALIDATED_PROBLEM"
+    assert project["current_gate_id"] == "GOAL_TO_ADMISSION_02"
+
+
+@pytest.mark.parametrize(
+    "from_state, transition_id, status",
+    [
+        ("DRAFT", "T99_UNKNOWN", 422),
+        ("VALIDATED_PROBLEM", "T01_PROBLEM_VALIDATION", 422),  # transition does not start there
+        ("VALIDATED_PROBLEM", "T02_GOAL_TO_ADMISSION", 409),  # project is still in DRAFT
+    ],
+)
+def test_transition_must_leave_the_current_state(client, from_state, transition_id, status):
+    pid = _project(client, "tr-c")
+    r = client.post("/transition", headers=_hdr("tr-c"), json={
+        "project_id": pid, "from_state": from_state, "transition_id": transition_id, "artifacts": {},
+    })
+    assert r.status_code == status
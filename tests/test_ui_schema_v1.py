@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import yaml
+
+from backend.app.engine_bridge import evaluate_gate
+from backend.app.models import Project
+from backend.app.schemas import UiSchemaV1Response
+from backend.app.state import gate_for_state, state_machine
+from backend.app.ui_schemas import CACHE_CONTROL, build_ui_schemas, ui_schema_docs
+
+HEADERS = {"X-Owner-Id": "ui-owner"}
+
+
+def _field_ids(schema: UiSchemaV1Response) -> set[str]:
+    return {f.id for s in schema.form.sections for f in s.fields}
+
+
+def _list_gates(root, artifact_registry) -> set[tuple[str, str]]:
+    """Gates with list artifacts: form_v1 (strings and numbers only) cannot fill them in."""
+    types = {a["id"]: a["type"] for a in artifact_registry["artifacts"]}
+    out = set()
+    for g in yaml.safe_load((root / "gates_registry.yaml").read_text(encoding="utf-8"))["gates"]:
+        spec = yaml.safe_load((root / g["file"]).read_text(encoding="utf-8"))
+        if any(types[a["id"]].startswith("list_") for a in spec["artifacts"]):
+            out.add((g["gate_id"], str(g["version"])))
+    return out
+
+
+def test_documents_for_every_gate_form_v1_can_fill_in(root, artifact_registry):
+    docs = ui_schema_docs()
+    schemas = build_ui_schemas()
+    unsupported = _list_gates(root, artifact_registry)
+    assert unsupported  # gates 03 / 05 today
+    for t in state_machine().transitions.values():
+        key = (t.gate_id, t.gate_version)
+        if key in unsupported:
+            assert key not in docs, key
+            continue
+        assert key in docs, key
+        # the served bytes are the validated model, None values omitted
+        assert UiSchemaV1Response.model_validate_json(docs[key].body) == schemas[key]
+        assert docs[key].etag.startswith('"') and docs[key].etag.endswith('"')
+    assert len({d.etag for d in docs.values()}) == len(docs)
+
+
+def _fill(schema: UiSchemaV1Response, source: dict) -> dict:
+    """What FormRendererV1 submits when each field is typed in from `source` (setByPath per field)."""
+    out: dict = {}
+    for section in schema.form.sections:
+        for f in section.fields:
+            path = f.artifact_path.split(".")[1:]
+            value = source
+            for k in path:
+                value = value[k]
+            assert isinstance(value, float if f.value.type == "number" else str) or (
+                f.value.type == "number" and isinstance(value, int)
+            ), (f.id, value)
+            node = out
+            for k in path[:-1]:
+                node = node.setdefault(k, {})
+            node[path[-1]] = value
+    return out
+
+
+def test_form_round_trips_the_corpus_pass_cases(root):
+    for key, schema in build_ui_schemas().items():
+        corpus = yaml.safe_load((root / "corpus" / f"{key[0]}.examples.yaml").read_text(encoding="utf-8"))
+        cases = [c for c in corpus["cases"] if c["expected"]["decision"] == "PASS"]
+        assert cases, key
+        for case in cases:
+            artifacts = _fill(schema, case["input"])
+            assert artifacts == case["input"], key  # the form covers every artifact, in its shape
+            res = evaluate_gate(gate_id=key[0], gate_version=key[1], state="", artifacts=artifacts, use_cache=False)
+            assert res["decision"] == "PASS", (key, case["id"], res["errors"])
+
+
+def test_field_ids_follow_the_engine_error_binding():
+    schema = build_ui_schemas()[("PROBLEM_VALIDATION_01", "1.1.0")]
+    ids = _field_ids(schema)
+    assert {"target_action", "error_scenario", "economic_impact.value", "economic_impact.unit"} <= ids
+
+    res = evaluate_gate(
+        gate_id="PROBLEM_VALIDATION_01",
+        gate_version="1.1.0",
+        state="DRAFT",
+        artifacts={"target_action": "x", "error_scenario": "y", "economic_impact": {"value": 5, "unit": "Hours"}},
+        use_cache=False,
+    )
+    assert res["errors"]
+    for e in res["errors"]:
+        assert e["ui_field_id"] in ids, e
+
+
+def test_ui_schema_v1_is_served_with_a_strong_etag(client, db):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    doc = ui_schema_docs()[("PROBLEM_VALIDATION_01", "1.1.0")]
+
+    r = client.get(f"/projects/{pid}/ui-schema-v1", headers=HEADERS)
+    assert r.status_code == 200
+    assert r.content == doc.body
+    assert r.headers["ETag"] == doc.etag
+    assert r.headers["Cache-Control"] == CACHE_CONTROL
+    assert r.json()["gate"]["id"] == "PROBLEM_VALIDATION_01"
+
+    again = client.get(f"/projects/{pid}/ui-schema-v1", headers=dict(HEADERS, **{"If-None-Match": doc.etag}))
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == doc.etag
+
+
+def test_etag_changes_with_the_project_gate(client, db):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    first = client.get(f"/projects/{pid}/ui-schema-v1", headers=HEADERS)
+
+    db.get(Project, pid).current_state = "VALIDATED_PROBLEM"
+    db.flush()
+    r = client.get(f"/projects/{pid}/ui-schema-v1", headers=dict(HEADERS, **{"If-None-Match": first.headers["ETag"]}))
+    assert r.status_code == 200
+    gate = gate_for_state("VALIDATED_PROBLEM")
+    assert (r.json()["gate"]["id"], r.json()["gate"]["version"]) == (gate.gate_id, gate.gate_version)
+    assert r.headers["ETag"] != first.headers["ETag"]
+
+
+def test_ui_schema_v1_is_owner_scoped(client):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    assert client.get(f"/projects/{pid}/ui-schema-v1", headers={"X-Owner-Id": "someone-else"}).status_code == 404
+
+
+def test_gate_without_a_document_is_404(client, db):
+    pid = client.post("/projects", json={"title": "t"}, headers=HEADERS).json()["id"]
+    db.get(Project, pid).current_state = "ADMISSION_DEFINED"  # gate 03: list artifacts
+    db.flush()
+    r = client.get(f"/projects/{pid}/ui-schema-v1", headers=HEADERS)
+    assert r.status_code == 404
+
+
+def test_documents_are_rebuilt_for_a_new_config_snapshot(monkeypatch):
+    from backend.app import ui_schemas
+
+    docs = ui_schema_docs()
+    assert ui_schema_docs() is docs  # cached while nothing changed
+
+    class _Snapshot:
+        config_hash = "reloaded"
+
+    monkeypatch.setattr(ui_schemas.config_store(), "get", lambda: _Snapshot())
+    rebuilt = ui_schema_docs()
+    assert rebuilt is not docs and rebuilt == docs
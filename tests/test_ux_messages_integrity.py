@@ -10,3 +10,27 @@ def test_ux_messages_variants_present(ux_messages):
         variants = m.get("variants", {})
         assert "short" in variants and "normal" in variants and "detailed" in variants, f"Missing variants for {m['error_code']}"
 
+
+def test_message_catalog_indexes_every_variant(ux_messages):
+    from engine.messages import MessageCatalog
+
+    catalog = MessageCatalog.from_yaml(ux_messages)
+    assert len(catalog) == len(ux_messages["messages"])
+    for m in ux_messages["messages"]:
+        code = m["error_code"]
+        assert catalog.reason_class(code) == m["reason_class"]
+        for variant, text in m["variants"].items():
+            assert catalog.text(code, variant) == text
+        assert catalog.text(code, "no_such_variant") == m["variants"]["normal"]
+    assert catalog.text("ERR_UNKNOWN") == "" and catalog.reason_class("ERR_UNKNOWN") == ""
+
+def test_message_catalog_is_frozen(ux_messages):
+    import dataclasses
+    import pytest
+    from engine.messages import MessageCatalog
+
+    catalog = MessageCatalog.from_yaml(ux_messages)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        catalog.entries = {}
+    with pytest.raises(TypeError):
+        catalog.entries["ERR_X"] = None
@@ -0,0 +1,149 @@
+"""
+Audit pagination benchmark: latency of GET /projects/{id}/submissions pages
+at increasing depth for one project with many submissions.
+
+Fills a throwaway SQLite file (WAL, same schema and indexes as the app),
+then times the route's keyset query (_submissions_page_query) for the first
+page and for pages starting 10% / 50% / 90% / 100% deep. With the composite
+(project_id, created_at, id) index every page is a range scan, so latency
+should stay flat with depth; --legacy also times the old OR-based predicate.
+
+Usage:
+  python tools/bench_audit_pages.py                   # 1M submissions
+  python tools/bench_audit_pages.py --rows 100000 --legacy
+Exit code: 1 if the deepest page is more than --max-ratio x the first page.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.app.audit.routes import _submissions_page_query  # noqa: E402
+from backend.app.db import create_schema, make_engine  # noqa: E402
+from backend.app.models import Project, Submission  # noqa: E402
+
+DEPTHS = (0.0, 0.1, 0.5, 0.9, 1.0)
+PAGE = 50
+
+
+def fill(session: Session, project_id: str, rows: int, *, batch: int = 20_000) -> None:
+    session.add(Project(id=project_id, owner_id="bench", title="bench", current_state="DRAFT"))
+    # a second project interleaved, so the project filter matters
+    session.add(Project(id="other", owner_id="bench", title="other", current_state="DRAFT"))
+    session.commit()
+
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    result = json.dumps({"decision": "BLOCK", "errors": [], "next_state": None})
+    table = Submission.__table__
+    total = rows + rows // 3  # every 4th row belongs to "other"
+    for start in range(0, total, batch):
+        chunk = []
+        for i in range(start, min(total, start + batch)):
+            # pairs of equal timestamps exercise the id tie-break
+            created = base + timedelta(milliseconds=i // 2)
+            chunk.append({
+                "id": str(uuid.UUID(int=i)), "project_id": "other" if i % 4 == 3 else project_id,
+                "gate_id": "PROBLEM_VALIDATION_01", "gate_version": "1.1.0", "state_at_submit": "DRAFT",
+                "artifacts_payload": "{}", "result_payload": result,
+                "decision": "BLOCK" if i % 3 else "PASS", "created_at": created,
+            })
+        session.execute(insert(table), chunk)
+        session.commit()
+
+
+def _legacy_query(session: Session, project_id: str, *, order: str, cursor: Optional[Tuple[datetime, str]]):
+    """The pre-index OR predicate, for comparison."""
+    q = session.query(Submission).filter(Submission.project_id == project_id)
+    q = q.order_by(Submission.created_at.desc(), Submission.id.desc())
+    if cursor:
+        c_created_at, c_id = cursor
+        q = q.filter(
+            (Submission.created_at < c_created_at)
+            | ((Submission.created_at == c_created_at) & (Submission.id < c_id))
+        )
+    return q
+
+
+def cursor_at(session: Session, project_id: str, depth: float, total: int) -> Optional[Tuple[datetime, str]]:
+    if depth <= 0:
+        return None
+    offset = min(total - 1, int(total * depth)) - 1
+    row = (
+        session.query(Submission.created_at, Submission.id)
+        .filter(Submission.project_id == project_id)
+        .order_by(Submission.created_at.desc(), Submission.id.desc())
+        .offset(max(0, offset)).limit(1).one()
+    )
+    return row[0], row[1]
+
+
+def time_page(build: Callable[..., Any], session: Session, project_id: str,
+              cursor: Optional[Tuple[datetime, str]], *, repeats: int) -> float:
+    """Best-of-`repeats` ms for one page (limit PAGE + 1, as the route; like timeit, noise only adds time)."""
+    samples: List[float] = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        build(session, project_id, order="desc", cursor=cursor).limit(PAGE + 1).all()
+        samples.append((time.perf_counter() - t0) * 1_000)
+        session.expunge_all()
+    return min(samples)
+
+
+def run(rows: int, *, repeats: int = 7, legacy: bool = False, db_dir: Optional[Path] = None) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(dir=db_dir) as tmp:
+        engine = make_engine(f"sqlite:///{Path(tmp) / 'bench.sqlite3'}")
+        create_schema(engine)
+        project_id = "bench-project"
+        with Session(engine) as session:
+            fill(session, project_id, rows)
+            total = session.query(Submission).filter(Submission.project_id == project_id).count()
+            out: Dict[str, Any] = {"project_rows": total, "pages": {}}
+            for depth in DEPTHS:
+                cur = cursor_at(session, project_id, depth, total)
+                entry = {"keyset_ms": time_page(_submissions_page_query, session, project_id, cur, repeats=repeats)}
+                if legacy:
+                    entry["legacy_ms"] = time_page(_legacy_query, session, project_id, cur, repeats=repeats)
+                out["pages"][f"{int(depth * 100)}%"] = entry
+        engine.dispose()
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark audit submission pages by depth.")
+    ap.add_argument("--rows", type=int, default=1_000_000, help="submissions in the benchmarked project")
+    ap.add_argument("--repeats", type=int, default=7)
+    ap.add_argument("--legacy", action="store_true", help="also time the old OR-based cursor predicate")
+    ap.add_argument("--max-ratio", type=float, default=3.0, help="deepest/first page latency allowed")
+    args = ap.parse_args(argv)
+
+    res = run(args.rows, repeats=args.repeats, legacy=args.legacy)
+    print(f"{res['project_rows']} submissions in project")
+    print(f"{'depth':>6} {'keyset_ms':>10}" + (f" {'legacy_ms':>10}" if args.legacy else ""))
+    for depth, r in res["pages"].items():
+        print(f"{depth:>6} {r['keyset_ms']:>10.2f}" + (f" {r['legacy_ms']:>10.2f}" if args.legacy else ""))
+
+    pages = list(res["pages"].values())
+    first = max(pages[0]["keyset_ms"], 0.05)
+    worst = max(p["keyset_ms"] for p in pages)
+    if worst > first * args.max_ratio:
+        print(f"NOT FLAT: worst page {worst:.2f}ms > {args.max_ratio}x first page {first:.2f}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,286 @@
+"""
+Engine benchmark: per-gate latency (p50/p99) and throughput of evaluate_gate
+on synthetic artifacts of scaled sizes, compared against a stored baseline.
+
+Each gate starts from its PASS case in corpus/ and has one dimension scaled:
+- text gates: the main free-text field(s) grow from 10 to 50k words;
+- CONTENT_TO_DECISIONS_03: critical_decisions_map / error_prevention_links
+  grow from 3 to 1k items.
+
+Timings are normalized by a fixed pure-Python calibration loop, but that only
+roughly carries a baseline across machines (and across runs on a shared box):
+the comparison is advisory. Gate on it only with a baseline recorded on the
+same machine, e.g. before and after a change.
+
+Usage:
+  python tools/bench_engine.py                      # compare with tools/bench_baseline.json
+  python tools/bench_engine.py --update-baseline    # record a new baseline
+  python tools/bench_engine.py --quick              # small sizes only
+  python tools/bench_engine.py --strict --baseline before.json   # gate on a same-machine baseline
+  python tools/bench_engine.py --lexicon            # LexiconMatcher str.find vs trie by needle count
+Exit code: 0, or 1 with --strict if any scenario regressed beyond --tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+BASELINE_PATH = ROOT / "tools" / "bench_baseline.json"
+
+WORD_SIZES = (10, 100, 1_000, 10_000, 50_000)
+ITEM_SIZES = (3, 10, 100, 1_000)
+QUICK_WORD_SIZES = (10, 1_000)
+QUICK_ITEM_SIZES = (3, 100)
+
+# gate -> text fields that are scaled (by word count)
+TEXT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "PROBLEM_VALIDATION_01": ("error_scenario",),
+    "GOAL_TO_ADMISSION_02": ("learning_goal", "decision_context"),
+    "ASSESSMENT_TO_ADMISSION_04": ("assessment_design", "failure_consequences"),
+    "UNIVERSALITY_FILTER_05": ("audience_bounds", "branching_or_paths"),
+}
+ITEM_GATE = "CONTENT_TO_DECISIONS_03"
+
+# neutral filler: mostly non-matching words, some short lexicon-like stems
+_FILLER = (
+    "руководитель сотрудник фиксирует план задача проект клиент отчёт срок команда "
+    "процесс решение причина действие система данные контроль разбор этап результат "
+    "если когда при путь блок провер недопуск"
+).split()
+
+
+Scenario = Tuple[str, str, str, Dict[str, Any]]  # (name, gate_id, gate_version, artifacts)
+
+
+def _pass_cases() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    out: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for f in sorted((ROOT / "corpus").glob("*.examples.yaml")):
+        data = yaml.safe_load(f.read_text(encoding="utf-8"))
+        for c in data["cases"]:
+            if (c.get("expected") or {}).get("decision") == "PASS":
+                out[data["gate_id"]] = (str(data["version"]), c["input"])
+                break
+    return out
+
+
+def _text(rnd: random.Random, base: str, words: int) -> str:
+    """`base` padded with filler to exactly `words` words (or truncated)."""
+    toks = base.split()
+    while len(toks) < words:
+        toks.append(rnd.choice(_FILLER))
+    return " ".join(toks[:words])
+
+
+def _items(base: List[Dict[str, Any]], n: int) -> List[Dict[str, Any]]:
+    out = []
+    for i in range(n):
+        it = copy.deepcopy(base[i % len(base)])
+        for k, v in it.items():
+            if isinstance(v, str) and i >= len(base):
+                it[k] = f"{v} ({i})"
+        out.append(it)
+    return out
+
+
+def scenarios(*, quick: bool = False, seed: int = 42) -> Iterator[Scenario]:
+    rnd = random.Random(seed)
+    cases = _pass_cases()
+    for gate_id, fields in TEXT_FIELDS.items():
+        version, base = cases[gate_id]
+        for n in (QUICK_WORD_SIZES if quick else WORD_SIZES):
+            artifacts = copy.deepcopy(base)
+            for f in fields:
+                artifacts[f] = _text(rnd, str(base.get(f, "")), n)
+            yield f"{gate_id}/words={n}", gate_id, version, artifacts
+
+    version, base = cases[ITEM_GATE]
+    for n in (QUICK_ITEM_SIZES if quick else ITEM_SIZES):
+        artifacts = copy.deepcopy(base)
+        artifacts["critical_decisions_map"] = _items(base["critical_decisions_map"], n)
+        artifacts["error_prevention_links"] = _items(base["error_prevention_links"], n)
+        yield f"{ITEM_GATE}/items={n}", ITEM_GATE, version, artifacts
+
+
+def calibrate(rounds: int = 5) -> float:
+    """ns of a fixed pure-Python workload (best of `rounds`): machine speed unit."""
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter_ns()
+        acc: Dict[str, int] = {}
+        for i in range(200_000):
+            k = "k" + str(i % 997)
+            acc[k] = acc.get(k, 0) + len(k.lower())
+        best = min(best, time.perf_counter_ns() - t0)
+    return best
+
+
+def measure(gate_id: str, gate_version: str, artifacts: Dict[str, Any], *,
+            min_time: float = 0.3, rounds: int = 3, min_runs: int = 5, max_runs: int = 2_000) -> Dict[str, float]:
+    """
+    Sample evaluate_gate for ~min_time seconds, in `rounds` rounds.
+    p50 and evals/sec are the best round (like timeit: noise only adds time);
+    p99 is over all samples.
+    """
+    from engine.evaluator import evaluate_gate
+
+    # use_cache=False: measure rule execution, not result-cache hits
+    kwargs = dict(gate_id=gate_id, gate_version=gate_version, state="BENCH", artifacts=artifacts, use_cache=False)
+    evaluate_gate(**kwargs)  # warm-up (compiles gate programs on first call)
+
+    all_samples: List[int] = []
+    p50s: List[float] = []
+    rates: List[float] = []
+    for _ in range(rounds):
+        samples: List[int] = []
+        started = time.perf_counter()
+        while len(samples) < max_runs // rounds and (
+            len(samples) < min_runs or time.perf_counter() - started < min_time / rounds
+        ):
+            t0 = time.perf_counter_ns()
+            evaluate_gate(**kwargs)
+            samples.append(time.perf_counter_ns() - t0)
+        p50s.append(statistics.median(samples))
+        rates.append(len(samples) / (sum(samples) / 1e9))
+        all_samples.extend(samples)
+
+    all_samples.sort()
+    p99_idx = min(len(all_samples) - 1, int(round(0.99 * (len(all_samples) - 1))))
+    return {
+        "runs": len(all_samples),
+        "p50_us": min(p50s) / 1_000,
+        "p99_us": all_samples[p99_idx] / 1_000,
+        "evals_per_sec": max(rates),
+    }
+
+
+def run(*, quick: bool = False, min_time: float = 0.3) -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "calibration_ns": calibrate(),
+        "scenarios": {
+            name: measure(gid, ver, artifacts, min_time=min_time)
+            for name, gid, ver, artifacts in scenarios(quick=quick)
+        },
+    }
+
+
+LEXICON_NEEDLES = (8, 16, 32, 64, 128, 256)
+
+
+def lexicon_scan(*, words: int = 1_000, seed: int = 42) -> List[Tuple[int, float, float]]:
+    """
+    (needles, find_us, trie_us): best-of scan time of one `words`-word text by
+    a LexiconMatcher on each path, needles drawn from the canon lexicons (plus
+    inflected variants). Where the two cross is lexicon.TRIE_MIN_NEEDLES.
+    """
+    from engine.evaluator import current_config
+    from engine.lexicon import LexiconMatcher
+    from engine.text import lower_keep_offsets
+
+    rnd = random.Random(seed)
+    base = sorted({str(n).lower() for items in current_config().lexicons.values() for n in items if n})
+    pool = base + [n + suffix for n in base for suffix in ("ся", "ть", "ние", "ый")]
+    text = _text(rnd, "", words)
+    low = lower_keep_offsets(text)
+    out = []
+    for count in LEXICON_NEEDLES:
+        needles = rnd.sample(pool, min(count, len(pool)))
+        times = []
+        for trie_min in (len(needles) + 1, 1):
+            m = LexiconMatcher({"x": needles}, trie_min_needles=trie_min)
+            best = float("inf")
+            for _ in range(20):
+                t0 = time.perf_counter_ns()
+                m.scan(text, low)
+                best = min(best, time.perf_counter_ns() - t0)
+            times.append(best / 1_000)
+        out.append((len(needles), times[0], times[1]))
+    return out
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], *, tolerance: float) -> Tuple[List[str], List[str]]:
+    """
+    (regressions, warnings) of `current` vs `baseline`, scaled by calibration.
+    p50 and evals/sec must stay within `tolerance`; p99 is too noisy to gate
+    on and only warns beyond 2x that.
+    """
+    scale = current["calibration_ns"] / baseline["calibration_ns"]
+    regressions: List[str] = []
+    warnings: List[str] = []
+    for name, cur in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        p50 = cur["p50_us"] / scale
+        p99 = cur["p99_us"] / scale
+        eps = cur["evals_per_sec"] * scale
+        if p50 > base["p50_us"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {p50:.1f}us > baseline {base['p50_us']:.1f}us")
+        if eps < base["evals_per_sec"] / (1 + tolerance):
+            regressions.append(f"{name}: {eps:.0f} evals/s < baseline {base['evals_per_sec']:.0f} evals/s")
+        if p99 > base["p99_us"] * (1 + 2 * tolerance):
+            warnings.append(f"{name}: p99 {p99:.1f}us > baseline {base['p99_us']:.1f}us")
+    return regressions, warnings
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark evaluate_gate per gate and input size.")
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--update-baseline", action="store_true", help="write results to --baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    ap.add_argument("--quick", action="store_true", help="small sizes only")
+    ap.add_argument("--min-time", type=float, default=0.3, help="seconds of sampling per scenario")
+    ap.add_argument("--strict", action="store_true", help="exit 1 on regressions (same-machine baselines only)")
+    ap.add_argument("--lexicon", action="store_true", help="only compare LexiconMatcher scan paths")
+    args = ap.parse_args(argv)
+
+    if args.lexicon:
+        print(f"{'needles':>8} {'find_us':>10} {'trie_us':>10}")
+        for count, find_us, trie_us in lexicon_scan():
+            print(f"{count:>8} {find_us:>10.1f} {trie_us:>10.1f}")
+        return 0
+
+    current = run(quick=args.quick, min_time=args.min_time)
+
+    print(f"{'scenario':48} {'runs':>6} {'p50_us':>12} {'p99_us':>12} {'evals/s':>10}")
+    for name, r in current["scenarios"].items():
+        print(f"{name:48} {r['runs']:>6} {r['p50_us']:>12.1f} {r['p99_us']:>12.1f} {r['evals_per_sec']:>10.0f}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline written: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline", file=sys.stderr)
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("machine") != current["machine"]:
+        print(f"note: baseline recorded on {baseline.get('machine') or 'another machine'}; "
+              f"differences below are indicative only", file=sys.stderr)
+    regressions, warnings = compare(current, baseline, tolerance=args.tolerance)
+    for w in warnings:
+        print(f"WARN {w}", file=sys.stderr)
+    for r in regressions:
+        print(f"REGRESSION {r}", file=sys.stderr)
+    return 1 if regressions and args.strict else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
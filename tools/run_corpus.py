@@ -0,0 +1,178 @@
+"""
+Parallel regression runner for corpus/*.examples.yaml-format files.
+
+Cases are sharded into chunks and evaluated in a process pool; results stream
+back as chunks finish. A case matches under the same rule as
+tests/test_engine_against_corpus.py: decision must be equal; PASS checks
+next_state (if declared); BLOCK requires every expected (artifact_id,
+error_code) to be present (extra engine errors are allowed).
+
+Usage:
+  python tools/run_corpus.py                       # corpus/ of this repo
+  python tools/run_corpus.py path/to/dir a.examples.yaml --workers 32
+  python tools/run_corpus.py --workers 0           # inline, no pool
+Exit code: 0 if all cases match, 1 on mismatches, 2 on bad input.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# (corpus_file, gate_id, gate_version, [case, ...])
+Chunk = Tuple[str, str, str, List[Dict[str, Any]]]
+
+
+def _normalize_errors(errors: Any) -> List[Tuple[str, str]]:
+    """Same normalization as the corpus test: sorted (artifact_id, error_code)."""
+    return sorted((e.get("artifact_id") or "", e.get("error_code") or "") for e in errors or [])
+
+
+def check_case(case: Dict[str, Any], result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """None if `result` satisfies case["expected"], else a mismatch record."""
+    expected = case.get("expected", {}) or {}
+    decision_expected = expected.get("decision")
+    got = {"decision": result.get("decision"), "next_state": result.get("next_state"),
+           "errors": _normalize_errors(result.get("errors"))}
+
+    if result.get("decision") != decision_expected:
+        return {"reason": "decision mismatch", "expected": decision_expected, "got": got}
+
+    if decision_expected == "PASS":
+        if "next_state" in expected and result.get("next_state") != expected.get("next_state"):
+            return {"reason": "next_state mismatch", "expected": expected.get("next_state"), "got": got}
+        return None
+
+    exp_errors = expected.get("errors", [])
+    if not exp_errors or not isinstance(exp_errors, list):
+        return {"reason": "BLOCK must declare expected.errors", "expected": None, "got": got}
+    got_set = set(got["errors"])
+    missing = [e for e in _normalize_errors(exp_errors) if e not in got_set]
+    if missing:
+        return {"reason": "missing expected errors", "expected": missing, "got": got}
+    return None
+
+
+def run_chunk(chunk: Chunk) -> Tuple[int, List[Dict[str, Any]]]:
+    """Worker entry point: evaluate one chunk, return (case count, mismatches)."""
+    from engine.evaluator import evaluate_many
+
+    corpus_file, gate_id, gate_version, cases = chunk
+    # use_cache=False: every case is evaluated (a cache hit would hide nondeterminism) and nothing is kept
+    results = evaluate_many(
+        ({"gate_id": gate_id, "gate_version": gate_version, "state": "UNKNOWN", "artifacts": c.get("input", {}) or {}}
+         for c in cases),
+        use_cache=False,
+    )
+    mismatches: List[Dict[str, Any]] = []
+    for case, result in zip(cases, results):
+        m = check_case(case, result)
+        if m is not None:
+            mismatches.append({"file": corpus_file, "case_id": case.get("id"), **m})
+    return len(cases), mismatches
+
+
+def _warm_up() -> None:
+    # compile gate programs once per worker, before the first chunk arrives
+    from engine.evaluator import evaluate_gate
+
+    evaluate_gate(gate_id="", gate_version="", state="", artifacts={})
+
+
+def iter_corpus_files(paths: Iterable[Path]) -> Iterator[Path]:
+    for p in paths:
+        if p.is_dir():
+            yield from sorted(p.glob("*.examples.yaml"))
+        else:
+            yield p
+
+
+def iter_chunks(files: Iterable[Path], chunk_size: int) -> Iterator[Chunk]:
+    """Files are parsed lazily, one at a time, and cut into chunks of cases."""
+    for f in files:
+        data = yaml.load(f.read_text(encoding="utf-8"), Loader=_Loader) or {}
+        gate_id, gate_version = str(data.get("gate_id") or ""), str(data.get("version") or "")
+        cases = data.get("cases", []) or []
+        for i in range(0, len(cases), chunk_size):
+            yield f.name, gate_id, gate_version, cases[i: i + chunk_size]
+
+
+def run(
+    paths: Iterable[Path],
+    *,
+    workers: int,
+    chunk_size: int = 256,
+    on_mismatch=None,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Evaluate every case; `on_mismatch` is called as mismatches stream in.
+    workers=0 runs inline. Returns (total cases, mismatches).
+    """
+    chunks = iter_chunks(iter_corpus_files(paths), chunk_size)
+    total, mismatches = 0, []
+
+    def _consume(it: Iterable[Tuple[int, List[Dict[str, Any]]]]) -> None:
+        nonlocal total
+        for n, found in it:
+            total += n
+            for m in found:
+                mismatches.append(m)
+                if on_mismatch is not None:
+                    on_mismatch(m)
+
+    if workers <= 0:
+        _consume(map(run_chunk, chunks))
+    else:
+        # spawn: workers start clean (no inherited threads/locks) on every platform
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(processes=workers, initializer=_warm_up) as pool:
+            _consume(pool.imap_unordered(run_chunk, chunks))
+
+    mismatches.sort(key=lambda m: (m["file"], str(m["case_id"])))
+    return total, mismatches
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Run corpus cases against the engine in parallel.")
+    ap.add_argument("paths", nargs="*", type=Path, default=[ROOT / "corpus"],
+                    help="*.examples.yaml files or directories (default: corpus/)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes; 0 = inline")
+    ap.add_argument("--chunk-size", type=int, default=256, help="cases per task")
+    ap.add_argument("--json", action="store_true", help="print mismatches as JSON lines")
+    args = ap.parse_args(argv)
+
+    for p in args.paths:
+        if not p.exists():
+            print(f"not found: {p}", file=sys.stderr)
+            return 2
+
+    def report(m: Dict[str, Any]) -> None:
+        if args.json:
+            print(json.dumps(m, ensure_ascii=False), flush=True)
+        else:
+            print(f"MISMATCH {m['file']}:{m['case_id']}: {m['reason']}: expected={m['expected']} got={m['got']}",
+                  flush=True)
+
+    t0 = time.perf_counter()
+    total, mismatches = run(args.paths, workers=args.workers, chunk_size=max(1, args.chunk_size), on_mismatch=report)
+    dt = time.perf_counter() - t0
+
+    print(f"{total} cases, {len(mismatches)} mismatches, {dt:.2f}s ({args.workers} workers)", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())